@@ -1,39 +1,31 @@
 from google.adk.agents import Agent
 
-from agents.sub_agents.Automation.agent import Automation_agent
-from agents.sub_agents.Content_Creation_Generation.agent import Content_creation_generation_agent
-from agents.sub_agents.Customer_Service.agent import Customer_service_agent
-from agents.sub_agents.Data_Analysis.agent import Data_analysis_insights_agent
-from agents.sub_agents.inspiration.agent import inspiration_agent
+# Sub-agents are registered lazily: each one is built the first time the root routes to it.
+from agents.sub_agents.registry import build_sub_agents
 
 # Example 1: Simple built-in tool
-from google.adk.tools.google_search_tool import google_search
+# from google.adk.tools.google_search_tool import google_search
 
 # google_search_tool = FunctionTool(func=google_search)
 
 # Example 2: Agent as a tool
-from agents.tools.search import google_search_grounding
+# from agents.tools.search import google_search_grounding
 
 # Example 3: Function tool
-from agents.tools.places import PlacesService
+from agents.tools.places import places_service
+from agents.tools.http_client import prefer_async
 from google.adk.tools import FunctionTool
-places_tool = FunctionTool(func=PlacesService().find_place_from_text)
+places_tool = FunctionTool(
+    func=prefer_async(places_service.find_place_from_text, places_service.find_place_from_text_async)
+)
 from agents.prompt import ROOT_AGENT_INSTR
 
-from agents.sub_agents.inspiration.agent import place_agent, news_agent
 root_agent = Agent(
     model="gemini-2.0-flash-001",
     name="root_agent",
     description="agents",
     instruction=ROOT_AGENT_INSTR,
     tools=[places_tool],
-    sub_agents=[
-        inspiration_agent,
-        Automation_agent,
-      Content_creation_generation_agent,
-      Customer_service_agent,
-      Data_analysis_insights_agent
-
-    ]
+    sub_agents=build_sub_agents()
    
-)
\ No newline at end of file
+)
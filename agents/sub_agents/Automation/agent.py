@@ -2,7 +2,7 @@ from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
 from google.adk.tools import FunctionTool
 from agents.sub_agents.Automation.automation_agent import AutomationAgent
-from agents.sub_agents.Automation.prompt import Automation_Agent_Instruction
+from agents.sub_agents.Automation.prompt import Automation_Agent_Instruction, Automation_Agent_Description
 
 # Instantiate the AutomationAgent
 automation_agent_instance = AutomationAgent()
@@ -12,6 +12,14 @@ automate_business_process_tool = FunctionTool(
     func=automation_agent_instance.automate_business_process
 )
 
+get_job_status_tool = FunctionTool(
+    func=automation_agent_instance.get_job_status
+)
+
+resume_job_tool = FunctionTool(
+    func=automation_agent_instance.resume_job
+)
+
 manage_sdlc_tool = FunctionTool(
     func=automation_agent_instance.manage_software_development_lifecycle
 )
@@ -20,15 +28,27 @@ handle_intricate_task_tool = FunctionTool(
     func=automation_agent_instance.handle_intricate_task
 )
 
+get_task_result_tool = FunctionTool(
+    func=automation_agent_instance.get_task_result
+)
+
+cancel_task_tool = FunctionTool(
+    func=automation_agent_instance.cancel_task
+)
+
 # Define the Automation Agent
 Automation_agent = Agent(
     model="gemini-2.0-flash",
     name="automation_agent",
     instruction=Automation_Agent_Instruction,
-    description="Automates business processes, SDLC stages, and intricate task management.",
+    description=Automation_Agent_Description,
     tools=[
         automate_business_process_tool,
+        get_job_status_tool,
+        resume_job_tool,
         manage_sdlc_tool,
-        handle_intricate_task_tool
+        handle_intricate_task_tool,
+        get_task_result_tool,
+        cancel_task_tool
     ]
 )
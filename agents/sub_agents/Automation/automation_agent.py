@@ -1,50 +1,156 @@
+from typing import Optional
+
+from google.adk.tools import ToolContext
+
+from agents.sub_agents.Automation import processes as _builtin_processes  # noqa: F401 (registers them)
+from agents.sub_agents.Automation.jobs import JobError, job_engine
+from agents.sub_agents.Automation.params import ParamError, normalize_name, param_schemas
+from agents.sub_agents.Automation.sdlc import DEFAULT_PROJECT, PipelineError, sdlc_pipeline
+from agents.sub_agents.Automation.task_queue import QueueFull, task_queue
+from agents.tools.session_state import user_id
+
+
+def _run_intricate_task(token, task_description, context_obj):
+    token.raise_if_cancelled()
+    # ...implement intricate task handling logic...
+    return f"Handled intricate task: {task_description} with context {context_obj}"
+
+
 class AutomationAgent:
     def __init__(self):
         # Initialize any required resources or state
-        pass
+        self.jobs = job_engine
+        self.tasks = task_queue
+        self.sdlc = sdlc_pipeline
 
-    def automate_business_process(self, process_name: str, parameters: str):
+    def automate_business_process(
+        self, process_name: str, parameters: str, tool_context: Optional[ToolContext] = None
+    ):
         """
-        Automate a given business process.
+        Start a business process as a background job on the local job engine.
         :param process_name: Name of the business process
         :param parameters: JSON string of parameters for the process
-        :return: Result of automation
+        :return: The job id to poll with get_job_status, or a dict describing why the job was not started
+        """
+        process = normalize_name(process_name)
+        try:
+            params = param_schemas.decode("process", process, parameters)
+            job = self.jobs.submit(process, params, owner=user_id(tool_context))
+        except ParamError as e:
+            return e.to_dict()
+        except JobError as e:
+            return {"status": "error", "error_message": str(e)}
+        return {
+            "status": "accepted",
+            "job_id": job["job_id"],
+            "process": process,
+            "job_status": job["status"],
+            "steps": list(job["steps"]),
+        }
+
+    def get_job_status(self, job_id: str, tool_context: Optional[ToolContext] = None):
+        """
+        Get the state of a business process job.
+        :param job_id: Job id returned by automate_business_process
+        :return: The job status, per-step progress and, once it succeeded, the step outputs
         """
-        import json
         try:
-            params = json.loads(parameters)
-        except Exception:
-            params = parameters  # fallback if not JSON
-        # ...implement business process automation logic...
-        return f"Automated business process: {process_name} with parameters {params}"
+            return {"status": "success", "job": self.jobs.status(job_id.strip(), user_id(tool_context))}
+        except JobError as e:
+            return {"status": "error", "error_message": str(e)}
 
-    def manage_software_development_lifecycle(self, stage: str, details: str):
+    def resume_job(self, job_id: str, tool_context: Optional[ToolContext] = None):
         """
-        Manage a stage of the software development lifecycle.
-        :param stage: SDLC stage (e.g., 'planning', 'development', 'testing', 'deployment')
+        Resume a failed or interrupted business process job; finished steps are not rerun.
+        :param job_id: Job id returned by automate_business_process
+        :return: The job status after restarting it
+        """
+        try:
+            return {"status": "accepted", "job": self.jobs.resume(job_id.strip(), user_id(tool_context))}
+        except JobError as e:
+            return {"status": "error", "error_message": str(e)}
+
+    def manage_software_development_lifecycle(
+        self,
+        stage: str,
+        details: str,
+        tool_context: Optional[ToolContext] = None,
+        project: str = DEFAULT_PROJECT,
+    ):
+        """
+        Run a stage of a project's software development lifecycle pipeline.
+        Each stage builds on the artifact of the stage before it; earlier stages are brought up to date
+        with the details they last ran with, and stages whose inputs did not change come from the cache.
+        :param stage: SDLC stage ('planning', 'development', 'testing' or 'deployment')
         :param details: JSON string of details relevant to the stage
-        :return: Result of management
+        :param project: Name of the project the pipeline belongs to
+        :return: The stage artifact, a per-stage report and how many stages were skipped thanks to the cache
         """
-        import json
+        stage = normalize_name(stage)
         try:
-            details_obj = json.loads(details)
-        except Exception:
-            details_obj = details
-        # ...implement SDLC management logic...
-        return f"Managed SDLC stage: {stage} with details {details_obj}"
+            details_obj = param_schemas.decode("stage", stage, details)
+            result = self.sdlc.run(project.strip() or DEFAULT_PROJECT, stage, details_obj, tenant=user_id(tool_context))
+        except ParamError as e:
+            return e.to_dict()
+        except PipelineError as e:
+            return {"status": "error", "error_message": str(e)}
+        return {"status": "success", **result}
 
-    def handle_intricate_task(self, task_description: str, context: str):
+    def handle_intricate_task(
+        self,
+        task_description: str,
+        context: str,
+        tool_context: Optional[ToolContext] = None,
+        priority: int = 0,
+    ):
         """
-        Handle an intricate or complex task.
+        Queue an intricate or complex task on the background worker pool.
         :param task_description: Description of the task
         :param context: JSON string of context or additional info
-        :return: Result of task handling
+        :param priority: Order among your own queued tasks, 0 to 9; higher runs first (default 0)
+        :return: The task id to poll with get_task_result, or a dict describing why the task was not queued
         """
-        import json
         try:
-            context_obj = json.loads(context)
-        except Exception:
-            context_obj = context
-        # ...implement intricate task handling logic...
-        return f"Handled intricate task: {task_description} with context {context_obj}"
+            context_obj = param_schemas.decode("task", task_description, context)
+        except ParamError as e:
+            return e.to_dict()
+        tenant = user_id(tool_context)
+        try:
+            task_id = self.tasks.submit(
+                _run_intricate_task, task_description, context_obj, tenant=tenant, priority=priority
+            )
+        except QueueFull as e:
+            return {"status": "error", "error_message": f"{e}; wait for some to finish or cancel them"}
+        state = self.tasks.get(task_id, tenant)
+        return {
+            "status": "queued",
+            "task_id": task_id,
+            "task_status": state["status"],
+            "queue_position": state.get("queue_position", 0),
+            "queue_depth": state.get("queue_depth", 0),
+        }
 
+    def get_task_result(self, task_id: str, tool_context: Optional[ToolContext] = None):
+        """
+        Get the state of a task queued with handle_intricate_task.
+        :param task_id: Task id returned by handle_intricate_task
+        :return: The task status, its queue position while queued, its result or error once finished,
+            and the load of the whole queue (tasks queued and running, wait and run time percentiles)
+        """
+        task = self.tasks.get(task_id.strip(), user_id(tool_context))
+        if task is None:
+            return {"status": "error", "error_message": f"Unknown task {task_id!r}"}
+        stats = self.tasks.stats()
+        queue = {k: v for k, v in stats.items() if k not in ("queued_by_tenant", "running_by_tenant")}
+        return {"status": "success", "task": task, "queue": queue}
+
+    def cancel_task(self, task_id: str, tool_context: Optional[ToolContext] = None):
+        """
+        Cancel a queued or running task; a running task stops at its next cancellation check.
+        :param task_id: Task id returned by handle_intricate_task
+        :return: The task state after cancelling it
+        """
+        task = self.tasks.cancel(task_id.strip(), user_id(tool_context))
+        if task is None:
+            return {"status": "error", "error_message": f"Unknown task {task_id!r}"}
+        return {"status": "success", "task": task}
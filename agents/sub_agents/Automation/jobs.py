@@ -0,0 +1,365 @@
+"""Local job engine that runs business processes as DAGs of Python steps.
+
+A process is a set of named steps registered with `processes.step(...)`. Each step
+is a module-level function `step(params, inputs)` that receives the job parameters
+and the outputs of the steps it requires, and returns a JSON-serializable output.
+Steps whose requirements are met run in parallel on a process pool.
+
+Every job lives in its own directory under JOB_DIR: `job.json` holds the job's
+state and owner, `steps/<step>.json` the output of each finished step, and
+`run.lock` the id of the process running it. Resuming a failed or interrupted job
+(also after a restart) reruns only the steps without output; the lock, created
+atomically, lets only one process resume it. On POSIX a lock left by a process
+that is gone is taken over; elsewhere it has to be removed by hand.
+"""
+
+import concurrent.futures
+import contextlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+JOB_DIR = os.getenv("MYBOT_JOB_DIR") or os.path.join(tempfile.gettempdir(), "mybot-jobs")
+JOB_WORKERS = int(os.getenv("MYBOT_JOB_WORKERS", "0")) or os.cpu_count() or 1
+
+PENDING, RUNNING, SUCCEEDED, FAILED = "pending", "running", "succeeded", "failed"
+
+RUN_LOCK = "run.lock"
+
+
+class JobError(Exception):
+    """Raised for unknown processes or jobs, invalid DAGs and jobs that cannot be resumed."""
+
+
+class Step(NamedTuple):
+    name: str
+    func: Callable[[Dict[str, Any], Dict[str, Any]], Any]
+    requires: tuple = ()
+
+
+class ProcessRegistry:
+    """Business processes by name, each a DAG of steps."""
+
+    def __init__(self):
+        self._processes: Dict[str, Dict[str, Step]] = {}
+        self._checks: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+
+    def register(self, process: str, name: str, func: Callable, requires: Iterable[str] = ()):
+        steps = self._processes.setdefault(process, {})
+        if name in steps:
+            raise JobError(f"Step {name!r} is already registered for process {process!r}")
+        steps[name] = Step(name, func, tuple(requires))
+
+    def step(self, process: str, name: Optional[str] = None, requires: Iterable[str] = ()):
+        """Decorator that registers a module-level function as a step of `process`."""
+
+        def decorator(func):
+            self.register(process, name or func.__name__, func, requires)
+            return func
+
+        return decorator
+
+    def check(self, process: str):
+        """Decorator that registers `check(params)`, run when a job of `process` is
+        submitted; it raises JobError for parameters the steps would fail on."""
+
+        def decorator(func):
+            self._checks.setdefault(process, []).append(func)
+            return func
+
+        return decorator
+
+    def validate(self, process: str, params: Dict[str, Any]):
+        for check in self._checks.get(process, ()):
+            check(params)
+
+    def names(self) -> List[str]:
+        return sorted(self._processes)
+
+    def steps(self, process: str) -> Dict[str, Step]:
+        """Returns the steps of `process` in a valid execution order.
+
+        Raises:
+            JobError: if the process is unknown, or a step requires a missing step or
+                is part of a cycle.
+        """
+        steps = self._processes.get(process)
+        if steps is None:
+            raise JobError(f"Unknown business process {process!r}. Registered processes: {', '.join(self.names()) or 'none'}")
+        ordered: Dict[str, Step] = {}
+        visiting = set()
+
+        def visit(step: Step):
+            if step.name in ordered:
+                return
+            if step.name in visiting:
+                raise JobError(f"Process {process!r} has a cycle through step {step.name!r}")
+            visiting.add(step.name)
+            for dep in step.requires:
+                if dep not in steps:
+                    raise JobError(f"Step {step.name!r} of {process!r} requires unknown step {dep!r}")
+                visit(steps[dep])
+            visiting.discard(step.name)
+            ordered[step.name] = step
+
+        for step in steps.values():
+            visit(step)
+        return ordered
+
+
+processes = ProcessRegistry()
+
+
+def _run_step(func, params, inputs):
+    # Runs in a pool worker; the output must survive the trip back as JSON.
+    output = func(params, inputs)
+    json.dumps(output)
+    return output
+
+
+def _write_json(path: str, data: Any):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, default=str)
+    os.replace(tmp, path)
+
+
+def _holder_alive(lock_path: str) -> bool:
+    try:
+        with open(lock_path, encoding="utf-8") as f:
+            pid = int(f.read())
+    except FileNotFoundError:
+        return False
+    except ValueError:  # the holder has not written its pid yet
+        return True
+    if pid == os.getpid() or os.name != "posix":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobEngine:
+    """Runs process DAGs in the background and checkpoints step outputs to disk."""
+
+    def __init__(self, registry: ProcessRegistry = processes, job_dir: str = JOB_DIR, max_workers: int = JOB_WORKERS):
+        self.registry = registry
+        self.job_dir = job_dir
+        self.max_workers = max_workers
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._jobs: Dict[str, Dict[str, Any]] = {}  # unfinished jobs run by this process; the rest are on disk
+        self._lock = threading.Lock()
+
+    def _executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a process that runs event loops and threads is unsafe.
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def _path(self, job_id: str, *parts: str) -> str:
+        if not job_id or not job_id.isalnum():
+            raise JobError(f"Invalid job id {job_id!r}")
+        return os.path.join(self.job_dir, job_id, *parts)
+
+    def submit(self, process: str, params: Dict[str, Any], owner: str = "") -> Dict[str, Any]:
+        """Starts a job for `process` on behalf of `owner` and returns its initial status without waiting.
+
+        Raises:
+            JobError: if the process is unknown, its DAG is invalid or a check of the
+                process rejects `params`.
+        """
+        steps = self.registry.steps(process)
+        self.registry.validate(process, params)
+        job_id = uuid.uuid4().hex[:16]
+        os.makedirs(self._path(job_id, "steps"))
+        self._claim(job_id)
+        job = {
+            "job_id": job_id,
+            "process": process,
+            "owner": owner,
+            "params": params,
+            "status": PENDING,
+            "created_at": time.time(),
+            "finished_at": None,
+            "steps": {name: {"status": PENDING, "requires": list(step.requires)} for name, step in steps.items()},
+        }
+        self._start(job, steps)
+        return self.status(job_id, owner)
+
+    def resume(self, job_id: str, owner: str = "") -> Dict[str, Any]:
+        """Reruns the unfinished steps of a failed or interrupted job of `owner`.
+
+        Raises:
+            JobError: if the job is unknown to `owner`, still running in any process,
+                or already succeeded.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job["status"] in (PENDING, RUNNING):
+                raise JobError(f"Job {job_id} is still running")
+            self._check_owner(self._load(job_id), owner)
+            self._claim(job_id)
+            try:
+                # Loaded again under the claim: another process may have finished it meanwhile.
+                job = self._load(job_id)
+                if job["status"] == SUCCEEDED:
+                    raise JobError(f"Job {job_id} already succeeded")
+                steps = self.registry.steps(job["process"])
+            except JobError:
+                self._release(job_id)
+                raise
+            for name in steps:
+                state = job["steps"].setdefault(name, {"requires": list(steps[name].requires)})
+                # Only a checkpointed output proves a step finished.
+                if state.get("status") != SUCCEEDED or not os.path.exists(self._path(job_id, "steps", f"{name}.json")):
+                    state.update(status=PENDING, error=None)
+            job.update(status=PENDING, finished_at=None, resumed_at=time.time())
+            # Claimed before the lock is released, so a concurrent resume finds it running.
+            self._jobs[job_id] = job
+        self._start(job, steps)
+        return self.status(job_id, owner)
+
+    def status(self, job_id: str, owner: str = "") -> Dict[str, Any]:
+        """Returns the job's state, with each step's output once the whole job has succeeded.
+
+        Raises:
+            JobError: if the job is unknown to `owner`.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            job = json.loads(json.dumps(job, default=str)) if job is not None else None
+        if job is None:
+            job = self._load(job_id)
+        self._check_owner(job, owner)
+        counts: Dict[str, int] = {}
+        for name, state in job["steps"].items():
+            counts[state["status"]] = counts.get(state["status"], 0) + 1
+            if state["status"] == SUCCEEDED and job["status"] == SUCCEEDED:
+                state["output"] = self._output(job_id, name)
+        job["progress"] = counts
+        return job
+
+    def _load(self, job_id: str) -> Dict[str, Any]:
+        try:
+            with open(self._path(job_id, "job.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise JobError(f"Unknown job {job_id!r}") from None
+
+    @staticmethod
+    def _check_owner(job: Dict[str, Any], owner: str):
+        # Other owners' jobs are reported as unknown, so ids cannot be probed.
+        if job.get("owner", "") != owner:
+            raise JobError(f"Unknown job {job['job_id']!r}")
+
+    def _claim(self, job_id: str):
+        """Takes the job's run lock for this process.
+
+        Raises:
+            JobError: if a live process holds the lock.
+        """
+        path = self._path(job_id, RUN_LOCK)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if _holder_alive(path):
+                    break
+                # Left by a process that died mid-run; take it over.
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(str(os.getpid()))
+            return
+        raise JobError(f"Job {job_id} is still running in another process")
+
+    def _release(self, job_id: str):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._path(job_id, RUN_LOCK))
+
+    def _output(self, job_id: str, step: str) -> Any:
+        with open(self._path(job_id, "steps", f"{step}.json"), encoding="utf-8") as f:
+            return json.load(f)["output"]
+
+    def _save(self, job: Dict[str, Any]):
+        with self._lock:
+            snapshot = json.loads(json.dumps(job, default=str))
+        _write_json(self._path(job["job_id"], "job.json"), snapshot)
+
+    def _start(self, job: Dict[str, Any], steps: Dict[str, Step]):
+        with self._lock:
+            self._jobs[job["job_id"]] = job
+        self._save(job)
+        threading.Thread(
+            target=self._run, args=(job, steps), name=f"job-{job['job_id']}", daemon=True
+        ).start()
+
+    def _set(self, job: Dict[str, Any], step: Optional[str] = None, **fields):
+        with self._lock:
+            (job["steps"][step] if step else job).update(fields)
+        self._save(job)
+
+    def _run(self, job: Dict[str, Any], steps: Dict[str, Step]):
+        job_id = job["job_id"]
+        self._set(job, status=RUNNING)
+        try:
+            pool = self._executor()
+            running: Dict[concurrent.futures.Future, str] = {}
+            failed = False
+            while True:
+                if not failed:
+                    for name, step in steps.items():
+                        state = job["steps"][name]
+                        if state["status"] == PENDING and all(
+                            job["steps"][dep]["status"] == SUCCEEDED for dep in step.requires
+                        ):
+                            inputs = {dep: self._output(job_id, dep) for dep in step.requires}
+                            running[pool.submit(_run_step, step.func, job["params"], inputs)] = name
+                            self._set(job, name, status=RUNNING, started_at=time.time(), error=None)
+                if not running:
+                    break
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        output = future.result()
+                    except Exception as e:
+                        failed = True
+                        error = "".join(traceback.format_exception_only(type(e), e)).strip()
+                        self._set(job, name, status=FAILED, finished_at=time.time(), error=error)
+                    else:
+                        # Checkpoint the output before the step counts as done.
+                        _write_json(self._path(job_id, "steps", f"{name}.json"), {"output": output})
+                        self._set(job, name, status=SUCCEEDED, finished_at=time.time())
+            ok = all(state["status"] == SUCCEEDED for state in job["steps"].values())
+            self._set(job, status=SUCCEEDED if ok else FAILED, finished_at=time.time())
+        except Exception as e:
+            self._set(job, status=FAILED, finished_at=time.time(), error=f"{type(e).__name__}: {e}")
+        # The final state is on disk now; status() reads it from there.
+        with self._lock:
+            if self._jobs.get(job_id) is job:
+                del self._jobs[job_id]
+            self._release(job_id)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+job_engine = JobEngine()
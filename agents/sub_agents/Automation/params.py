@@ -0,0 +1,288 @@
+"""Decoding and validation of the JSON string arguments of the Automation tools.
+
+Each process, SDLC stage or task type can register a schema (a small JSON Schema
+subset: type, properties, required, additionalProperties, items, enum, minItems,
+maxItems, minLength, maxLength, minimum, maximum). Schemas are compiled into
+validator functions the first time they are used, so a call only pays for
+walking its own payload.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:  # orjson is optional; the stdlib parser is the fallback.
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+MAX_PARAMS_BYTES = int(os.getenv("MYBOT_AUTOMATION_MAX_PARAMS_BYTES", str(1024 * 1024)))
+MAX_REPORTED_ERRORS = 20
+
+# Used for names without a schema of their own.
+DEFAULT_SCHEMA_NAME = "*"
+
+# Path of a value inside the payload as a linked list of (parent, key), formatted only on error.
+Path = Optional[Tuple[Any, Any]]
+Validator = Callable[[Any, Path, List[Dict[str, str]]], None]
+
+# JSON Schema type -> Python types; bools are excluded from integer and number.
+_TYPES: Dict[str, Tuple[type, ...]] = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "null": (type(None),),
+}
+_KEYWORDS = frozenset((
+    "type", "properties", "required", "additionalProperties", "items", "enum",
+    "minItems", "maxItems", "minLength", "maxLength", "minimum", "maximum", "description",
+))
+
+
+class ParamError(ValueError):
+    """Raised when tool parameters are too large, not JSON, or don't match their schema."""
+
+    def __init__(self, message: str, errors: Optional[List[Dict[str, str]]] = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"status": "error", "error_message": str(self), "errors": self.errors}
+
+
+def loads(text) -> Any:
+    """Parses JSON with orjson when it is installed, else with the json module."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def format_path(path: Path) -> str:
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    return "$" + "".join(reversed(keys))
+
+
+def _type_name(value: Any) -> str:
+    if isinstance(value, bool):
+        return "boolean"
+    for name, types in _TYPES.items():
+        if isinstance(value, types):
+            return name
+    return type(value).__name__
+
+
+def compile_schema(schema: Dict[str, Any]) -> Validator:
+    """Compiles `schema` into a function `validate(value, path, errors)`.
+
+    Raises:
+        ValueError: if the schema uses an unknown keyword or type.
+    """
+    unknown = set(schema) - _KEYWORDS
+    if unknown:
+        raise ValueError(f"Unsupported schema keywords: {sorted(unknown)}")
+    type_names = schema.get("type", ())
+    if isinstance(type_names, str):
+        type_names = (type_names,)
+    for name in type_names:
+        if name not in _TYPES:
+            raise ValueError(f"Unsupported schema type: {name!r}")
+    py_types = tuple(t for name in type_names for t in _TYPES[name])
+    # bool subclasses int, so it only matches when "boolean" is listed explicitly.
+    allow_bool = not type_names or "boolean" in type_names
+    expected = " or ".join(type_names)
+    properties = {key: compile_schema(sub) for key, sub in schema.get("properties", {}).items()}
+    required = tuple(schema.get("required", ()))
+    closed = schema.get("additionalProperties", True) is False
+    items = compile_schema(schema["items"]) if "items" in schema else None
+    item_types = item_bool = None
+    if items is not None and set(schema["items"]) == {"type"}:
+        item_types, item_bool = items.py_types, items.allow_bool
+    enum = schema.get("enum")
+    min_items, max_items = schema.get("minItems"), schema.get("maxItems")
+    min_length, max_length = schema.get("minLength"), schema.get("maxLength")
+    minimum, maximum = schema.get("minimum"), schema.get("maximum")
+
+    def fail(errors, path, message):
+        errors.append({"path": format_path(path), "message": message})
+
+    def validate(value, path, errors):
+        if len(errors) >= MAX_REPORTED_ERRORS:
+            return
+        if py_types and (not isinstance(value, py_types) or (value is True or value is False) and not allow_bool):
+            fail(errors, path, f"expected {expected}, got {_type_name(value)}")
+            return
+        if enum is not None and value not in enum:
+            fail(errors, path, f"must be one of {enum}")
+            return
+        if isinstance(value, dict):
+            for key in required:
+                if key not in value:
+                    fail(errors, path, f"missing required property {key!r}")
+            if properties or closed:
+                for key, item in value.items():
+                    sub = properties.get(key)
+                    if sub is not None:
+                        sub(item, (path, key), errors)
+                    elif closed:
+                        fail(errors, path, f"unexpected property {key!r}")
+        elif isinstance(value, list):
+            if min_items is not None and len(value) < min_items:
+                fail(errors, path, f"expected at least {min_items} items")
+            if max_items is not None and len(value) > max_items:
+                fail(errors, path, f"expected at most {max_items} items")
+            if item_types is not None:
+                # Type-only item schema: check the whole list in a tight loop first.
+                for i, item in enumerate(value):
+                    if not isinstance(item, item_types) or (item is True or item is False) and not item_bool:
+                        items(item, (path, i), errors)
+            elif items is not None:
+                for i, item in enumerate(value):
+                    items(item, (path, i), errors)
+        elif isinstance(value, str):
+            if min_length is not None and len(value) < min_length:
+                fail(errors, path, f"expected at least {min_length} characters")
+            if max_length is not None and len(value) > max_length:
+                fail(errors, path, f"expected at most {max_length} characters")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            if minimum is not None and value < minimum:
+                fail(errors, path, f"must be >= {minimum}")
+            if maximum is not None and value > maximum:
+                fail(errors, path, f"must be <= {maximum}")
+
+    validate.py_types, validate.allow_bool = py_types, allow_bool
+    return validate
+
+
+def normalize_name(name: str) -> str:
+    """Maps "Code Review" and "code-review" to the schema name "code_review"."""
+    return "_".join(str(name or "").strip().lower().replace("-", " ").split())
+
+
+class ParamSchemas:
+    """Registry of parameter schemas by kind ("process", "stage", "task") and name."""
+
+    def __init__(self, schemas: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None):
+        self._schemas: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._compiled: Dict[Tuple[str, str], Validator] = {}
+        self._lock = threading.Lock()
+        for kind, by_name in (schemas or {}).items():
+            for name, schema in by_name.items():
+                self.register(kind, name, schema)
+
+    def register(self, kind: str, name: str, schema: Dict[str, Any]):
+        """Registers (or replaces) the schema of `name`; "*" is the kind's default."""
+        compile_schema(schema)  # fail fast on a bad schema
+        key = (kind, name if name == DEFAULT_SCHEMA_NAME else normalize_name(name))
+        with self._lock:
+            self._schemas[key] = schema
+            self._compiled.pop(key, None)
+
+    def validator(self, kind: str, name: str) -> Optional[Validator]:
+        key = (kind, normalize_name(name))
+        if key not in self._schemas:
+            key = (kind, DEFAULT_SCHEMA_NAME)
+        validate = self._compiled.get(key)
+        if validate is None and key in self._schemas:
+            with self._lock:
+                validate = self._compiled.get(key)
+                if validate is None:
+                    validate = self._compiled[key] = compile_schema(self._schemas[key])
+        return validate
+
+    def decode(self, kind: str, name: str, text: Any, max_bytes: Optional[int] = None) -> Any:
+        """Parses and validates the parameters of a `kind` called `name`.
+
+        A blank string means no parameters and decodes to `{}`; already-decoded
+        values are only validated.
+
+        Raises:
+            ParamError: if `text` exceeds `max_bytes` (MAX_PARAMS_BYTES by default),
+                is not valid JSON or does not match the schema.
+        """
+        max_bytes = MAX_PARAMS_BYTES if max_bytes is None else max_bytes
+        if isinstance(text, (str, bytes)):
+            # Checking len() first avoids encoding large payloads just to measure them.
+            size = len(text)
+            if isinstance(text, str) and size <= max_bytes < size * 4:
+                size = len(text.encode("utf-8", "surrogatepass"))
+            if size > max_bytes:
+                raise ParamError(
+                    f"{kind} parameters are {size} bytes; the limit is {max_bytes}",
+                    [{"path": "$", "message": "too large"}],
+                )
+            if not text.strip():
+                value = {}
+            else:
+                try:
+                    value = loads(text)
+                except ValueError as e:  # json.JSONDecodeError and orjson.JSONDecodeError
+                    raise ParamError(
+                        f"{kind} parameters are not valid JSON: {e}",
+                        [{"path": "$", "message": str(e)}],
+                    ) from None
+        else:
+            value = text
+        validate = self.validator(kind, name)
+        if validate is not None:
+            errors: List[Dict[str, str]] = []
+            validate(value, None, errors)
+            if errors:
+                raise ParamError(f"Invalid {kind} parameters for {name!r}", errors)
+        return value
+
+
+# Stage schemas follow the stages the SDLC tool documents; anything else is free-form.
+DEFAULT_SCHEMAS: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "process": {
+        DEFAULT_SCHEMA_NAME: {},
+    },
+    "stage": {
+        DEFAULT_SCHEMA_NAME: {"type": "object"},
+        "planning": {
+            "type": "object",
+            "properties": {
+                "requirements": {"type": ["array", "string"]},
+                "milestones": {"type": "array"},
+                "deadline": {"type": "string"},
+            },
+        },
+        "development": {
+            "type": "object",
+            "properties": {
+                "repository": {"type": "string"},
+                "branch": {"type": "string"},
+                "tasks": {"type": "array"},
+            },
+        },
+        "testing": {
+            "type": "object",
+            "properties": {
+                "test_suites": {"type": "array", "items": {"type": "string"}},
+                "coverage_target": {"type": "number", "minimum": 0, "maximum": 100},
+            },
+        },
+        "deployment": {
+            "type": "object",
+            "required": ["environment"],
+            "properties": {
+                "environment": {"type": "string", "minLength": 1},
+                "version": {"type": "string"},
+                "rollback": {"type": "boolean"},
+            },
+        },
+    },
+    "task": {
+        DEFAULT_SCHEMA_NAME: {},
+    },
+}
+
+param_schemas = ParamSchemas(DEFAULT_SCHEMAS)
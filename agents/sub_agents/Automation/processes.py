@@ -0,0 +1,110 @@
+"""Built-in business processes run by the automation job engine.
+
+Steps must be module-level functions so pool workers can import them.
+"""
+
+import csv
+import math
+import os
+from typing import Any, Dict
+
+from agents.sub_agents.Automation.jobs import JobError, processes
+from agents.sub_agents.Automation.params import param_schemas
+from agents.tools.files import DATA_ROOT, confine
+
+# csv_profile: profile a CSV file in the data directory (MYBOT_ANALYSIS_ROOT). "columns" and "row_count" are independent
+# and run in parallel; "numeric_summary" needs the inferred columns.
+CSV_PROFILE = "csv_profile"
+CSV_SAMPLE_ROWS = 1000
+
+param_schemas.register("process", CSV_PROFILE, {
+    "type": "object",
+    "required": ["path"],
+    "properties": {
+        "path": {"type": "string", "minLength": 1},
+        "delimiter": {"type": "string", "minLength": 1, "maxLength": 1},
+    },
+})
+
+
+@processes.check(CSV_PROFILE)
+def _check_path(params: Dict[str, Any]):
+    # Rejected at submit time rather than by every step of the job.
+    path = confine(params["path"])
+    if path is None:
+        raise JobError(f"{params['path']!r} is outside the data directory {DATA_ROOT!r}")
+    if not os.path.isfile(path):
+        raise JobError(f"{params['path']!r} is not a file in the data directory {DATA_ROOT!r}")
+
+
+def _open(params: Dict[str, Any]):
+    path = confine(params["path"])
+    if path is None:
+        raise ValueError(f"{params['path']!r} is outside the data directory {DATA_ROOT!r}")
+    return open(path, newline="", encoding="utf-8")
+
+
+def _reader(params: Dict[str, Any], f):
+    return csv.reader(f, delimiter=params.get("delimiter", ","))
+
+
+def _is_number(value: str) -> bool:
+    try:
+        return math.isfinite(float(value))
+    except ValueError:
+        return False
+
+
+@processes.step(CSV_PROFILE)
+def columns(params: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, str]:
+    """Infers each column's type ("number" or "string") from the first rows."""
+    with _open(params) as f:
+        reader = _reader(params, f)
+        header = next(reader, [])
+        numeric = [True] * len(header)
+        for i, row in enumerate(reader):
+            if i >= CSV_SAMPLE_ROWS:
+                break
+            for j, value in enumerate(row[:len(header)]):
+                if value and not _is_number(value):
+                    numeric[j] = False
+    return {name: "number" if is_num else "string" for name, is_num in zip(header, numeric)}
+
+
+@processes.step(CSV_PROFILE)
+def row_count(params: Dict[str, Any], inputs: Dict[str, Any]) -> int:
+    with _open(params) as f:
+        return max(sum(1 for _ in _reader(params, f)) - 1, 0)
+
+
+@processes.step(CSV_PROFILE, requires=("columns",))
+def numeric_summary(params: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Returns count, min, max and mean of every numeric column."""
+    numeric = [name for name, kind in inputs["columns"].items() if kind == "number"]
+    stats = {name: {"count": 0, "min": None, "max": None, "sum": 0.0} for name in numeric}
+    with _open(params) as f:
+        for row in csv.DictReader(f, delimiter=params.get("delimiter", ",")):
+            for name in numeric:
+                value = row.get(name)
+                if not value or not _is_number(value):
+                    continue
+                x, s = float(value), stats[name]
+                s["count"] += 1
+                s["sum"] += x
+                s["min"] = x if s["min"] is None else min(s["min"], x)
+                s["max"] = x if s["max"] is None else max(s["max"], x)
+    for s in stats.values():
+        s["mean"] = s.pop("sum") / s["count"] if s["count"] else None
+    return stats
+
+
+@processes.step(CSV_PROFILE, requires=("columns", "row_count", "numeric_summary"))
+def report(params: Dict[str, Any], inputs: Dict[str, Any]) -> str:
+    lines = [f"{params['path']}: {inputs['row_count']} rows, {len(inputs['columns'])} columns"]
+    for name, kind in inputs["columns"].items():
+        s = inputs["numeric_summary"].get(name)
+        if s and s["count"]:
+            lines.append(f"- {name} (number): min {s['min']:g}, max {s['max']:g}, mean {s['mean']:g}")
+        else:
+            lines.append(f"- {name} ({kind})")
+    return "\n".join(lines)
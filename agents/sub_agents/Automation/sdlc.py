@@ -0,0 +1,217 @@
+"""Per-project SDLC pipelines whose stage artifacts are cached by content hash.
+
+The stages run in order (planning -> development -> testing -> deployment) and
+each one is built from its own details plus the artifact of the stage before it.
+Running a stage brings every earlier stage up to date first, using the details
+they were last run with. A stage whose details and input artifact are unchanged
+is served from the artifact cache instead of being rebuilt. The cache is keyed
+by content, not by project, so identical work is shared between projects too.
+
+Each project has its own lock: calls for one project are serialized, while
+different projects run concurrently.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from agents.tools.cache import TTLCache
+from agents.tools.memo import canonical_hash
+from agents.tools.session_state import SessionTable
+
+SDLC_CACHE_SIZE = int(os.getenv("MYBOT_SDLC_CACHE_SIZE", "4096"))
+SDLC_CACHE_TTL = float(os.getenv("MYBOT_SDLC_CACHE_TTL", "604800"))
+# SQLite file for the artifacts, shared by every worker that points at it.
+SDLC_CACHE_PATH = os.getenv("MYBOT_SDLC_CACHE_PATH")
+SDLC_MAX_PROJECTS = int(os.getenv("MYBOT_SDLC_MAX_PROJECTS", "10000"))
+
+# Part of every cache key; bump it when a stage builder's output changes.
+ARTIFACTS_VERSION = "1"
+
+DEFAULT_PROJECT = "default"
+
+
+class PipelineError(Exception):
+    """Raised for unknown stages, or a stage whose earlier stages were never run."""
+
+
+class Stage(NamedTuple):
+    name: str
+    build: Callable[[Dict[str, Any], Optional[Dict[str, Any]]], Dict[str, Any]]
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [line.strip() for line in value.splitlines() if line.strip()]
+    return list(value) if isinstance(value, list) else [value]
+
+
+def build_planning(details: Dict[str, Any], _previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "requirements": _as_list(details.get("requirements")),
+        "milestones": _as_list(details.get("milestones")),
+        "deadline": details.get("deadline"),
+    }
+
+
+def build_development(details: Dict[str, Any], plan: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    tasks = _as_list(details.get("tasks")) or [f"Implement: {req}" for req in plan["requirements"]]
+    return {
+        "repository": details.get("repository"),
+        "branch": details.get("branch", "main"),
+        "tasks": tasks,
+        "requirements": plan["requirements"],
+    }
+
+
+def build_testing(details: Dict[str, Any], build: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    suites = _as_list(details.get("test_suites")) or [f"Test: {task}" for task in build["tasks"]]
+    return {
+        "repository": build["repository"],
+        "branch": build["branch"],
+        "test_suites": suites,
+        "coverage_target": details.get("coverage_target", 80),
+        "tasks_covered": len(build["tasks"]),
+    }
+
+
+def build_deployment(details: Dict[str, Any], tests: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "environment": details.get("environment"),
+        "version": details.get("version") or tests["branch"],
+        "rollback": bool(details.get("rollback", True)),
+        "repository": tests["repository"],
+        "gated_by": {"test_suites": len(tests["test_suites"]), "coverage_target": tests["coverage_target"]},
+    }
+
+
+DEFAULT_STAGES = (
+    Stage("planning", build_planning),
+    Stage("development", build_development),
+    Stage("testing", build_testing),
+    Stage("deployment", build_deployment),
+)
+
+
+class _Project:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages: Dict[str, Dict[str, Any]] = {}  # stage -> details, input/artifact hashes, run info
+
+
+class SDLCPipeline:
+    """Runs SDLC stages per project and caches their artifacts by content hash."""
+
+    def __init__(
+        self,
+        stages=DEFAULT_STAGES,
+        cache: Optional[TTLCache] = None,
+        max_projects: int = SDLC_MAX_PROJECTS,
+    ):
+        self.stages = tuple(stages)
+        self._index = {stage.name: i for i, stage in enumerate(self.stages)}
+        self.cache = cache if cache is not None else TTLCache(
+            maxsize=SDLC_CACHE_SIZE, ttl=SDLC_CACHE_TTL, path=SDLC_CACHE_PATH, table="sdlc_artifacts"
+        )
+        # Projects are only records of the details each stage last ran with.
+        self._projects: SessionTable[_Project] = SessionTable(_Project, max_sessions=max_projects, idle_timeout=None)
+        self._counters = {"stages_run": 0, "stages_skipped": 0}
+        self._lock = threading.Lock()
+
+    def stage_names(self) -> List[str]:
+        return [stage.name for stage in self.stages]
+
+    def run(self, project: str, stage: str, details: Dict[str, Any], tenant: str = "") -> Dict[str, Any]:
+        """Runs `stage` of `project` with `details`, bringing earlier stages up to date first.
+
+        Raises:
+            PipelineError: if the stage is unknown or an earlier stage has never run
+                for this project.
+        """
+        index = self._index.get(stage)
+        if index is None:
+            raise PipelineError(f"Unknown SDLC stage {stage!r}. Stages: {', '.join(self.stage_names())}")
+        state = self._projects.get(f"{tenant}/{project}")
+        with state.lock:
+            missing = [s.name for s in self.stages[:index] if s.name not in state.stages]
+            if missing:
+                raise PipelineError(
+                    f"Stage {stage!r} of project {project!r} needs the {missing[-1]!r} artifact; "
+                    f"run {', '.join(missing)} first"
+                )
+            report, artifact, artifact_hash = [], None, None
+            for current in self.stages[: index + 1]:
+                stage_details = details if current.name == stage else state.stages[current.name]["details"]
+                artifact, artifact_hash, cached = self._build(current, stage_details, artifact, artifact_hash)
+                previous = state.stages.get(current.name, {})
+                changed = previous.get("artifact_hash") != artifact_hash
+                state.stages[current.name] = {
+                    "details": stage_details,
+                    "input_hash": report[-1]["artifact_hash"] if report else None,
+                    "artifact_hash": artifact_hash,
+                    "updated_at": time.time() if changed else previous.get("updated_at", time.time()),
+                }
+                report.append({"stage": current.name, "cached": cached, "artifact_hash": artifact_hash})
+            # Later stages were built from the artifact this call may have replaced.
+            stale = [
+                s.name for s in self.stages[index + 1:]
+                if s.name in state.stages and state.stages[s.name]["input_hash"] != self._input_of(state, s.name)
+            ]
+        skipped = sum(1 for entry in report if entry["cached"])
+        with self._lock:
+            self._counters["stages_skipped"] += skipped
+            self._counters["stages_run"] += len(report) - skipped
+        return {
+            "project": project,
+            "stage": stage,
+            "artifact": artifact,
+            "artifact_hash": artifact_hash,
+            "pipeline": report,
+            "stages_run": len(report) - skipped,
+            "stages_skipped": skipped,
+            "stale_stages": stale,
+        }
+
+    def _input_of(self, state: _Project, stage: str) -> Optional[str]:
+        index = self._index[stage]
+        return state.stages[self.stages[index - 1].name]["artifact_hash"] if index else None
+
+    def _build(self, stage: Stage, details, previous, previous_hash):
+        key = f"sdlc:{ARTIFACTS_VERSION}:" + canonical_hash([stage.name, details, previous_hash])
+        entry = self.cache.get(key)
+        if entry is not None:
+            return entry["artifact"], entry["hash"], True
+        artifact = {"stage": stage.name, **stage.build(details, previous)}
+        artifact_hash = canonical_hash(artifact)
+        self.cache.set(key, {"artifact": artifact, "hash": artifact_hash})
+        return artifact, artifact_hash, False
+
+    def status(self, project: str, tenant: str = "") -> Dict[str, Any]:
+        """Returns which stages of `project` have run and the hash of their artifacts."""
+        key = f"{tenant}/{project}"
+        if key not in self._projects:
+            return {"project": project, "stages": {}}
+        state = self._projects.get(key)
+        with state.lock:
+            return {
+                "project": project,
+                "stages": {
+                    s.name: {
+                        "artifact_hash": state.stages[s.name]["artifact_hash"],
+                        "updated_at": state.stages[s.name]["updated_at"],
+                        "stale": state.stages[s.name]["input_hash"] != self._input_of(state, s.name),
+                    }
+                    for s in self.stages if s.name in state.stages
+                },
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        return {**counters, "projects": self._projects.stats(), "cache": self.cache.stats()}
+
+
+sdlc_pipeline = SDLCPipeline()
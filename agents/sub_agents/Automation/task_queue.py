@@ -0,0 +1,327 @@
+"""In-process priority queue and bounded worker pool for long-running tool work.
+
+Tasks are queued per tenant (the ADK user). Workers serve the tenants that are
+below their concurrency cap round-robin, least recently served first, so one
+tenant's burst cannot starve the others. A task's priority only orders it among
+its own tenant's queued tasks.
+
+Python threads cannot be killed, so cancellation and timeouts are cooperative:
+a task function receives a `CancelToken` it should check, and a task that runs
+past its deadline is reported as timed out right away while its worker slot is
+only released once the function returns.
+"""
+
+import heapq
+import itertools
+import os
+import statistics
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+TASK_WORKERS = int(os.getenv("MYBOT_TASK_WORKERS", "4"))
+TASK_TENANT_CONCURRENCY = int(os.getenv("MYBOT_TASK_TENANT_CONCURRENCY", "2"))
+TASK_TENANT_QUEUE_LIMIT = int(os.getenv("MYBOT_TASK_TENANT_QUEUE_LIMIT", "100"))
+TASK_TIMEOUT = float(os.getenv("MYBOT_TASK_TIMEOUT", "300"))
+# Finished tasks kept for polling (LRU).
+TASK_RESULTS_SIZE = int(os.getenv("MYBOT_TASK_RESULTS_SIZE", "10000"))
+# Priorities are clamped to this range.
+MIN_PRIORITY, MAX_PRIORITY = 0, 9
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+CANCELLED, TIMED_OUT = "cancelled", "timed_out"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED, TIMED_OUT)
+
+# Samples kept for the wait/run time percentiles.
+METRICS_WINDOW = 1000
+
+
+class QueueFull(Exception):
+    """Raised when a tenant already has the maximum number of queued tasks."""
+
+
+class CancelToken:
+    """Tells a running task that it was cancelled or ran out of time."""
+
+    def __init__(self, deadline: Optional[float] = None):
+        self.deadline = deadline
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set() or (self.deadline is not None and time.monotonic() >= self.deadline)
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise TaskCancelled()
+
+
+class TaskCancelled(Exception):
+    """Raised by `CancelToken.raise_if_cancelled` inside a cancelled or timed-out task."""
+
+
+class _Task:
+    __slots__ = ("id", "seq", "tenant", "priority", "func", "args", "kwargs", "timeout", "token",
+                 "status", "submitted_at", "started_at", "finished_at", "result", "error")
+
+    def __init__(self, seq, tenant, priority, func, args, kwargs, timeout):
+        self.id = uuid.uuid4().hex[:16]
+        self.seq, self.tenant, self.priority, self.timeout = seq, tenant, priority, timeout
+        self.func, self.args, self.kwargs = func, args, kwargs
+        self.token = CancelToken()
+        self.status = QUEUED
+        self.submitted_at = time.time()
+        self.started_at = self.finished_at = None
+        self.result = self.error = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        now = time.time()
+        started = self.started_at or (None if self.status == QUEUED else self.finished_at)
+        return {
+            "task_id": self.id,
+            "tenant": self.tenant,
+            "priority": self.priority,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "wait_ms": round(((started or now) - self.submitted_at) * 1000, 1),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+def _percentiles(samples) -> Dict[str, Optional[float]]:
+    if not samples:
+        return {"avg": None, "p50": None, "p95": None, "max": None}
+    ordered = sorted(samples)
+    return {
+        "avg": round(statistics.fmean(ordered), 1),
+        "p50": round(ordered[len(ordered) // 2], 1),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+class TaskQueue:
+    """Priority task queue with a fixed pool of worker threads and per-tenant caps."""
+
+    def __init__(
+        self,
+        workers: int = TASK_WORKERS,
+        tenant_concurrency: int = TASK_TENANT_CONCURRENCY,
+        tenant_queue_limit: int = TASK_TENANT_QUEUE_LIMIT,
+        default_timeout: Optional[float] = TASK_TIMEOUT,
+        results_size: int = TASK_RESULTS_SIZE,
+    ):
+        self.workers = workers
+        self.tenant_concurrency = tenant_concurrency
+        self.tenant_queue_limit = tenant_queue_limit
+        self.default_timeout = default_timeout
+        self.results_size = results_size
+        self._queues: Dict[str, List[tuple]] = {}  # tenant -> heap of (-priority, seq, task)
+        self._depth: Dict[str, int] = {}  # tenant -> queued tasks not cancelled yet
+        self._rotation: "OrderedDict[str, None]" = OrderedDict()  # tenants, least recently served first
+        self._running: Dict[str, int] = {}  # tenant -> running tasks
+        self._tasks: "OrderedDict[str, _Task]" = OrderedDict()
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._waits: Deque[float] = deque(maxlen=METRICS_WINDOW)
+        self._runs: Deque[float] = deque(maxlen=METRICS_WINDOW)
+        self._counts = {status: 0 for status in FINISHED}
+        self._submitted = self._rejected = 0
+
+    def _start_workers(self):
+        # Called with the lock held; workers start on first use.
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"task-worker-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args,
+        tenant: str = "default",
+        priority: int = 0,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> str:
+        """Queues `func(token, *args, **kwargs)` and returns the task id.
+
+        Among `tenant`'s queued tasks, higher `priority` (clamped to MIN_PRIORITY..
+        MAX_PRIORITY) runs first. `timeout` (seconds of run time, default
+        `default_timeout`) marks the task timed out and cancels its token.
+
+        Raises:
+            QueueFull: if `tenant` already has `tenant_queue_limit` queued tasks.
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        priority = min(max(int(priority), MIN_PRIORITY), MAX_PRIORITY)
+        with self._cond:
+            depth = self._depth.get(tenant, 0)
+            if depth >= self.tenant_queue_limit:
+                self._rejected += 1
+                raise QueueFull(f"Tenant {tenant!r} already has {depth} queued tasks")
+            task = _Task(next(self._seq), tenant, priority, func, args, kwargs, timeout)
+            heapq.heappush(self._queues.setdefault(tenant, []), (-priority, task.seq, task))
+            self._depth[tenant] = depth + 1
+            self._rotation.setdefault(tenant, None)
+            self._remember(task)
+            self._submitted += 1
+            self._start_workers()
+            self._cond.notify()
+        return task.id
+
+    def _remember(self, task: _Task):
+        self._tasks[task.id] = task
+        # Drop the oldest finished tasks once over the limit; live ones are never dropped.
+        excess = len(self._tasks) - self.results_size
+        if excess > 0:
+            for task_id in [t.id for t in itertools.islice(self._tasks.values(), excess * 2) if t.status in FINISHED][:excess]:
+                del self._tasks[task_id]
+
+    def _next(self) -> Optional[_Task]:
+        """Pops the task to run next; called with the lock held."""
+        for tenant in self._rotation:
+            if self._running.get(tenant, 0) >= self.tenant_concurrency:
+                continue
+            queue = self._queues.get(tenant)
+            while queue and queue[0][2].status != QUEUED:  # drop cancelled tasks
+                heapq.heappop(queue)
+            if queue:
+                break
+        else:
+            return None
+        task = heapq.heappop(queue)[2]
+        self._dequeued(tenant)
+        self._rotation.move_to_end(tenant)
+        if not queue:
+            del self._queues[tenant]
+            if not self._running.get(tenant):
+                del self._rotation[tenant]
+        return task
+
+    def _dequeued(self, tenant: str):
+        self._depth[tenant] -= 1
+        if not self._depth[tenant]:
+            del self._depth[tenant]
+
+    def _work(self):
+        while True:
+            with self._cond:
+                task = self._next()
+                while task is None:
+                    self._cond.wait()
+                    task = self._next()
+                self._running[task.tenant] = self._running.get(task.tenant, 0) + 1
+                task.status = RUNNING
+                task.started_at = time.time()
+                if task.timeout is not None:
+                    task.token.deadline = time.monotonic() + task.timeout
+                self._waits.append((task.started_at - task.submitted_at) * 1000)
+            timer = None
+            if task.timeout is not None:
+                timer = threading.Timer(task.timeout, self._time_out, (task,))
+                timer.daemon = True
+                timer.start()
+            try:
+                result, error = task.func(task.token, *task.args, **task.kwargs), None
+            except TaskCancelled:
+                result, error = None, None
+            except Exception as e:
+                result, error = None, "".join(traceback.format_exception_only(type(e), e)).strip()
+            finally:
+                if timer is not None:
+                    timer.cancel()
+            with self._cond:
+                if task.status == RUNNING:
+                    if task.token.cancelled:
+                        # The deadline passed before the timer fired.
+                        task.status, task.error = TIMED_OUT, f"Timed out after {task.timeout:g}s"
+                    else:
+                        task.status = FAILED if error is not None else SUCCEEDED
+                        task.result, task.error = result, error
+                    task.finished_at = time.time()
+                    self._counts[task.status] += 1
+                self._runs.append((time.time() - task.started_at) * 1000)
+                self._running[task.tenant] -= 1
+                if not self._running[task.tenant]:
+                    del self._running[task.tenant]
+                    if task.tenant not in self._queues:
+                        self._rotation.pop(task.tenant, None)
+                self._cond.notify_all()
+
+    def _time_out(self, task: _Task):
+        with self._cond:
+            if task.status == RUNNING:
+                task.status = TIMED_OUT
+                task.error = f"Timed out after {task.timeout:g}s"
+                task.finished_at = time.time()
+                self._counts[TIMED_OUT] += 1
+        task.token.cancel()
+
+    def cancel(self, task_id: str, tenant: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Cancels a queued or running task; returns its state, or None if unknown."""
+        with self._cond:
+            task = self._tasks.get(task_id)
+            if task is None or (tenant is not None and task.tenant != tenant):
+                return None
+            if task.status in (QUEUED, RUNNING):
+                if task.status == QUEUED:
+                    self._dequeued(task.tenant)  # its heap entry is skipped when reached
+                    if task.tenant not in self._depth:
+                        # Only cancelled entries are left: forget the tenant's queue.
+                        del self._queues[task.tenant]
+                        if not self._running.get(task.tenant):
+                            del self._rotation[task.tenant]
+                task.status = CANCELLED
+                task.finished_at = time.time()
+                self._counts[CANCELLED] += 1
+                task.token.cancel()
+            return task.to_dict()
+
+    def get(self, task_id: str, tenant: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Returns the task's state (with its result once finished), or None if unknown."""
+        with self._cond:
+            task = self._tasks.get(task_id)
+            if task is None or (tenant is not None and task.tenant != tenant):
+                return None
+            state = task.to_dict()
+            if task.status == QUEUED:
+                # Tasks of the same tenant that run first; other tenants interleave with them.
+                state["queue_position"] = sum(
+                    1 for entry in self._queues.get(task.tenant, ())
+                    if entry[2].status == QUEUED and entry[:2] < (-task.priority, task.seq)
+                )
+                state["queue_depth"] = self._depth.get(task.tenant, 0)
+            return state
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns queue depth, running tasks, outcome counts and wait/run time percentiles (ms).
+
+        `queued_by_tenant` and `running_by_tenant` name the tenants: not for users to see.
+        """
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "queued": sum(self._depth.values()),
+                "running": sum(self._running.values()),
+                "queued_by_tenant": dict(self._depth),
+                "running_by_tenant": dict(self._running),
+                "submitted": self._submitted,
+                "rejected": self._rejected,
+                **self._counts,
+                "wait_ms": _percentiles(self._waits),
+                "run_ms": _percentiles(self._runs),
+            }
+
+
+task_queue = TaskQueue()
@@ -1,12 +1,27 @@
-from typing import Optional
-import re
-import requests
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+from google.adk.tools import ToolContext
+
+from agents.sub_agents.Content_Creation_Generation.python_improver import python_improver
+from agents.sub_agents.Content_Creation_Generation.templates import code_templates
+from agents.tools.http_client import get_async_http_client, get_http_client, is_textual, parse_content_type
+from agents.tools.links import find_urls, is_url, link_probe
+from agents.tools.log_store import LogStore
+from agents.tools.memo import tool_memo
+
+
+def _log_hit(agent: "ContentCreationGenerationAgent", result: dict):
+    # Memoized results are still logged, as if they had been generated again.
+    agent.content_log.append(result)
+
 
 class ContentCreationGenerationAgent:
     def __init__(self):
         # Initialize resources, logs, or configurations as needed
-        self.content_log = []
+        self.content_log = LogStore("content_log")
 
+    @tool_memo.memoize(on_hit=_log_hit)
     def generate_marketing_material(self, campaign_info: dict) -> dict:
         """
         Generate high-impact, multi-channel marketing materials using advanced orchestration.
@@ -33,6 +48,7 @@ class ContentCreationGenerationAgent:
         self.content_log.append(content)
         return content
 
+    @tool_memo.memoize(on_hit=_log_hit)
     def generate_report(self, report_type: str = "", data: Optional[dict] = None) -> dict:
         """
         Generate comprehensive, executive-level reports with actionable insights.
@@ -63,6 +79,7 @@ class ContentCreationGenerationAgent:
         self.content_log.append(report)
         return report
 
+    @tool_memo.memoize(on_hit=_log_hit)
     def generate_code(self, requirements: str) -> dict:
         """
         Generate production-ready, legendary code with best practices and documentation.
@@ -83,27 +100,60 @@ class ContentCreationGenerationAgent:
         self.content_log.append(code)
         return code
 
-    @staticmethod
-    def _is_url(text: str) -> bool:
-        url_regex = re.compile(
-            r'^(https?://)?'  # http:// or https://
-            r'([a-zA-Z0-9.-]+(\.[a-zA-Z]{2,}))'  # domain
-            r'(:\d+)?'  # optional port
-            r'(/[^\s]*)?$'  # path
-        )
-        return bool(url_regex.match(text.strip()))
+    @classmethod
+    def _fetch_url(cls, url: str, max_chars: int = 1000) -> Tuple[str, Optional[dict]]:
+        """Streams up to `max_chars` characters of a URL (1k chars by default, for summaries).
 
-    @staticmethod
-    def _fetch_url_content(url: str) -> str:
+        Returns the text (or an error message) and a report of bytes read vs. skipped.
+        """
+        url, error = cls._fetch_target(url)
+        if error is not None:
+            return error, None
         try:
-            if not url.startswith("http"):
-                url = "http://" + url
-            resp = requests.get(url, timeout=5)
-            resp.raise_for_status()
-            return resp.text[:1000]  # limit to 1k chars for summary
+            fetched = get_http_client().fetch_text(url, max_chars=max_chars, timeout=5)
         except Exception as e:
-            return f"Could not fetch URL: {e}"
+            return f"Could not fetch URL: {e}", None
+        return cls._fetched(fetched)
+
+    @classmethod
+    async def _fetch_url_async(cls, url: str, max_chars: int = 1000) -> Tuple[str, Optional[dict]]:
+        """Async variant of `_fetch_url` that streams the URL without blocking the event loop."""
+        url, error = cls._fetch_target(url)
+        if error is not None:
+            return error, None
+        try:
+            fetched = await get_async_http_client().fetch_text(url, max_chars=max_chars, timeout=5)
+        except Exception as e:
+            return f"Could not fetch URL: {e}", None
+        return cls._fetched(fetched)
+
+    @staticmethod
+    def _fetch_target(url: str) -> Tuple[str, Optional[str]]:
+        if not url.startswith("http"):
+            url = "http://" + url
+        # Reuse a recent analyze_link probe: skip known-binary links and redirect hops.
+        meta = link_probe.peek(url)
+        if meta is not None:
+            if not is_textual(parse_content_type(meta["content_type"])[0]):
+                return url, f"Could not fetch URL: unsupported content type {meta['content_type']!r}"
+            url = meta["final_url"]
+        return url, None
+
+    @staticmethod
+    def _fetched(fetched) -> Tuple[str, dict]:
+        if fetched.binary:
+            return f"Could not fetch URL: unsupported content type {fetched.content_type!r}", fetched.summary()
+        return fetched.text, fetched.summary()
+
+    @classmethod
+    def _fetch_url_content(cls, url: str) -> str:
+        return cls._fetch_url(url)[0]
 
+    # Linked code can change, and "partial" results depend on the per-request work limit.
+    @tool_memo.memoize(
+        bypass=lambda args: is_url(args["code"]),
+        store_if=lambda result: result.get("status") != "partial",
+    )
     def improve_code(self, code: str, language: str = "python") -> dict:
         """Attempts to improve the provided code for various programming languages.
 
@@ -112,28 +162,44 @@ class ContentCreationGenerationAgent:
             language (str): The programming language of the code.
 
         Returns:
-            dict: status and improved code or error message.
+            dict: status ("success", "warning" if errors remain, or "partial" if the
+                per-request work limit left blocks unchecked), improved code or error
+                message, and for Python the per-stage "pipeline" report.
         """
         if not isinstance(code, str) or not code.strip():
             return {
                 "status": "error",
                 "error_message": "No code provided to improve.",
             }
-        lang = (language or "python").strip().lower()
         # If code is a URL, fetch code from the link
-        if self._is_url(code):
-            code = self._fetch_url_content(code)
+        fetch = None
+        if is_url(code):
+            code, fetch = self._fetch_url(code)
+        return self._improve(code, language, fetch)
+
+    async def improve_code_async(self, code: str, language: str = "python") -> dict:
+        """Async variant of `improve_code` that fetches linked code without blocking the event loop."""
+        if isinstance(code, str) and is_url(code):
+            code, fetch = await self._fetch_url_async(code)
+            return self._improve(code, language, fetch)
+        return self.improve_code(code, language)
+
+    @staticmethod
+    def _improve(code: str, language: str, fetch: Optional[dict]) -> dict:
+        lang = (language or "python").strip().lower()
         improved = code.strip()
+        pipeline = None
         if lang == "python":
-            # Add missing colons for def/class, fix indentation, etc.
-            improved = re.sub(r'^(def .+\))\s*$', r'\1:', improved, flags=re.MULTILINE)
-            improved = re.sub(r'^(class .+)\s*$', r'\1:', improved, flags=re.MULTILINE)
-            try:
-                compile(improved, "<string>", "exec")
-                status = "success"
-            except Exception as e:
-                improved = f"# Attempted fix, but error remains: {e}\n" + improved
+            # Add missing colons for def/class, block by block; unchanged blocks come from cache.
+            report = python_improver.improve(improved)
+            improved, pipeline = report["code"], report["pipeline"]
+            if report["error"] is not None:
+                improved = f"# Attempted fix, but error remains: {report['error']}\n" + improved
                 status = "warning"
+            elif pipeline["unchecked"]:
+                status = "partial"
+            else:
+                status = "success"
             improved = "# Improved Python code\n" + improved
         else:
             comment = "//" if lang in [
@@ -141,11 +207,17 @@ class ContentCreationGenerationAgent:
             ] else "#"
             improved = f"{comment} Improved {language.title()} code\n" + improved
             status = "success"
-        return {
+        result = {
             "status": status,
             "improved_code": improved,
         }
+        if pipeline is not None:
+            result["pipeline"] = pipeline
+        if fetch is not None:
+            result["fetch"] = fetch
+        return result
 
+    @tool_memo.memoize(bypass=lambda args: is_url(args["description"]))
     def generate_code_from_text(self, description: str, language: str = "python") -> dict:
         """Generates code for a UI or any code based on a text description and target language.
 
@@ -162,422 +234,70 @@ class ContentCreationGenerationAgent:
                 "generated_code": "",
                 "error_message": "No description provided."
             }
-        lang = (language or "python").strip().lower()
-        if self._is_url(description):
-            fetched = self._fetch_url_content(description)
+        fetch = None
+        if is_url(description):
+            fetched, fetch = self._fetch_url(description, max_chars=200)
             description = f"UI for content from {description}:\n{fetched[:200]}"
-        code = ""
-        desc_lower = description.lower()
+        return self._generate(description, language, fetch)
 
-        # --- Enhanced problem solving for complex UI/code generation ---
-        if lang == "python":
-            if any(x in desc_lower for x in ["tkinter", "ui", "window", "dashboard", "form", "table", "canvas", "tabs", "notebook"]):
-                # Advanced Tkinter UI generation
-                if "dashboard" in desc_lower:
-                    code = (
-                        "import tkinter as tk\n"
-                        "from tkinter import ttk\n"
-                        "root = tk.Tk()\n"
-                        "root.title('Dashboard')\n"
-                        "notebook = ttk.Notebook(root)\n"
-                        "tab1 = tk.Frame(notebook)\n"
-                        "tab2 = tk.Frame(notebook)\n"
-                        "notebook.add(tab1, text='Overview')\n"
-                        "notebook.add(tab2, text='Details')\n"
-                        "notebook.pack(expand=1, fill='both')\n"
-                        "tk.Label(tab1, text='Welcome to the Dashboard!').pack(pady=10)\n"
-                        "tree = ttk.Treeview(tab2, columns=('A', 'B', 'C'), show='headings')\n"
-                        "for col in ('A', 'B', 'C'):\n"
-                        "    tree.heading(col, text=col)\n"
-                        "tree.insert('', 'end', values=(1, 2, 3))\n"
-                        "tree.pack(fill='both', expand=True)\n"
-                        "root.mainloop()\n"
-                    )
-                elif "form" in desc_lower and "fields" in desc_lower:
-                    code = (
-                        "import tkinter as tk\n"
-                        "root = tk.Tk()\n"
-                        "root.title('Complex Form UI')\n"
-                        "fields = ['Name', 'Email', 'Age']\n"
-                        "entries = {}\n"
-                        "for idx, field in enumerate(fields):\n"
-                        "    label = tk.Label(root, text=field)\n"
-                        "    label.grid(row=idx, column=0, padx=5, pady=5)\n"
-                        "    entry = tk.Entry(root)\n"
-                        "    entry.grid(row=idx, column=1, padx=5, pady=5)\n"
-                        "    entries[field] = entry\n"
-                        "def submit():\n"
-                        "    print({f: e.get() for f, e in entries.items()})\n"
-                        "tk.Button(root, text='Submit', command=submit).grid(row=len(fields), column=0, columnspan=2)\n"
-                        "root.mainloop()\n"
-                    )
-                elif "table" in desc_lower:
-                    code = (
-                        "import tkinter as tk\n"
-                        "from tkinter import ttk\n"
-                        "root = tk.Tk()\n"
-                        "root.title('Table UI')\n"
-                        "tree = ttk.Treeview(root, columns=('A', 'B', 'C'), show='headings')\n"
-                        "for col in ('A', 'B', 'C'):\n"
-                        "    tree.heading(col, text=col)\n"
-                        "tree.insert('', 'end', values=(1, 2, 3))\n"
-                        "tree.insert('', 'end', values=(4, 5, 6))\n"
-                        "tree.pack(fill='both', expand=True)\n"
-                        "root.mainloop()\n"
-                    )
-                elif "tabs" in desc_lower or "notebook" in desc_lower:
-                    code = (
-                        "import tkinter as tk\n"
-                        "from tkinter import ttk\n"
-                        "root = tk.Tk()\n"
-                        "root.title('Tabbed UI')\n"
-                        "notebook = ttk.Notebook(root)\n"
-                        "tab1 = tk.Frame(notebook)\n"
-                        "tab2 = tk.Frame(notebook)\n"
-                        "notebook.add(tab1, text='Tab 1')\n"
-                        "notebook.add(tab2, text='Tab 2')\n"
-                        "notebook.pack(expand=1, fill='both')\n"
-                        "tk.Label(tab1, text='Content for Tab 1').pack(padx=10, pady=10)\n"
-                        "tk.Label(tab2, text='Content for Tab 2').pack(padx=10, pady=10)\n"
-                        "root.mainloop()\n"
-                    )
-                elif "canvas" in desc_lower:
-                    code = (
-                        "import tkinter as tk\n"
-                        "root = tk.Tk()\n"
-                        "root.title('Canvas Drawing')\n"
-                        "canvas = tk.Canvas(root, width=400, height=300, bg='white')\n"
-                        "canvas.pack()\n"
-                        "canvas.create_rectangle(50, 50, 150, 150, fill='blue')\n"
-                        "canvas.create_oval(200, 100, 300, 200, fill='red')\n"
-                        "root.mainloop()\n"
-                    )
-                else:
-                    widgets = []
-                    if "button" in desc_lower:
-                        widgets.append("button = tk.Button(root, text='Click Me')\nbutton.pack(pady=10)")
-                    if "entry" in desc_lower or "input" in desc_lower:
-                        widgets.append("entry = tk.Entry(root)\nentry.pack(pady=10)")
-                    code = (
-                        "import tkinter as tk\n"
-                        "root = tk.Tk()\n"
-                        "root.title('Generated UI')\n"
-                        "label = tk.Label(root, text='This is a generated UI')\n"
-                        "label.pack(padx=20, pady=20)\n"
-                        + ("\n".join(widgets) if widgets else "") +
-                        "\nroot.mainloop()\n"
-                    )
-            elif "for loop" in desc_lower:
-                code = "for i in range(10):\n    print(i)"
-            elif "class" in desc_lower:
-                code = (
-                    "class MyClass:\n"
-                    "    def __init__(self):\n"
-                    "        pass\n"
-                )
-            elif "sort" in desc_lower and "list" in desc_lower:
-                code = (
-                    "def sort_list(lst):\n"
-                    "    return sorted(lst)\n"
-                    "# Example usage:\n"
-                    "print(sort_list([3, 1, 2]))"
-                )
-            elif "search" in desc_lower and "binary" in desc_lower:
-                code = (
-                    "def binary_search(arr, target):\n"
-                    "    left, right = 0, len(arr) - 1\n"
-                    "    while left <= right:\n"
-                    "        mid = (left + right) // 2\n"
-                    "        if arr[mid] == target:\n"
-                    "            return mid\n"
-                    "        elif arr[mid] < target:\n"
-                    "            left = mid + 1\n"
-                    "        else:\n"
-                    "            right = mid - 1\n"
-                    "    return -1\n"
-                    "# Example usage:\n"
-                    "print(binary_search([1,2,3,4,5], 3))"
-                )
-            else:
-                code = "# " + description
-        elif lang == "swift":
-            if "ui" in desc_lower or "swiftui" in desc_lower or "form" in desc_lower or "table" in desc_lower:
-                if "form" in desc_lower:
-                    code = (
-                        "import SwiftUI\n\n"
-                        "struct ContentView: View {\n"
-                        "    @State private var name = \"\"\n"
-                        "    @State private var email = \"\"\n"
-                        "    var body: some View {\n"
-                        "        Form {\n"
-                        "            TextField(\"Name\", text: $name)\n"
-                        "            TextField(\"Email\", text: $email)\n"
-                        "            Button(\"Submit\") {\n"
-                        "                print(\"Name: \\(name), Email: \\(email)\")\n"
-                        "            }\n"
-                        "        }\n"
-                        "    }\n"
-                        "}\n"
-                    )
-                elif "table" in desc_lower:
-                    code = (
-                        "import SwiftUI\n\n"
-                        "struct Row: Identifiable {\n"
-                        "    let id = UUID()\n"
-                        "    let value: String\n"
-                        "}\n"
-                        "struct ContentView: View {\n"
-                        "    let rows = [Row(value: \"A\"), Row(value: \"B\")]\n"
-                        "    var body: some View {\n"
-                        "        List(rows) { row in\n"
-                        "            Text(row.value)\n"
-                        "        }\n"
-                        "    }\n"
-                        "}\n"
-                    )
-                else:
-                    code = (
-                        "import SwiftUI\n\n"
-                        "struct ContentView: View {\n"
-                        "    var body: some View {\n"
-                        "        VStack {\n"
-                        "            Text(\"This is a generated UI\")\n"
-                        "        }\n"
-                        "    }\n"
-                        "}\n"
-                    )
-            elif "for loop" in desc_lower:
-                code = "for i in 0..<10 {\n    print(i)\n}"
-            elif "sort" in desc_lower and "array" in desc_lower:
-                code = (
-                    "let arr = [3, 1, 2]\n"
-                    "let sortedArr = arr.sorted()\n"
-                    "print(sortedArr)"
-                )
-            else:
-                code = "// " + description
-        elif lang == "javascript":
-            if "ui" in desc_lower or "form" in desc_lower or "table" in desc_lower:
-                if "form" in desc_lower:
-                    code = (
-                        "<!DOCTYPE html>\n<html><body>\n"
-                        "<form>\n"
-                        "  Name: <input type='text' name='name'><br>\n"
-                        "  Email: <input type='email' name='email'><br>\n"
-                        "  <input type='submit' value='Submit'>\n"
-                        "</form>\n"
-                        "</body></html>\n"
-                    )
-                elif "table" in desc_lower:
-                    code = (
-                        "<!DOCTYPE html>\n<html><body>\n"
-                        "<table border='1'>\n"
-                        "  <tr><th>A</th><th>B</th></tr>\n"
-                        "  <tr><td>1</td><td>2</td></tr>\n"
-                        "  <tr><td>3</td><td>4</td></tr>\n"
-                        "</table>\n"
-                        "</body></html>\n"
-                    )
-                else:
-                    code = (
-                        "<!DOCTYPE html>\n<html><body>\n"
-                        "<h1>This is a generated UI</h1>\n"
-                        "</body></html>\n"
-                    )
-            elif "for loop" in desc_lower:
-                code = "for(let i = 0; i < 10; i++) {\n    console.log(i);\n}"
-            elif "sort" in desc_lower and "array" in desc_lower:
-                code = (
-                    "let arr = [3, 1, 2];\n"
-                    "arr.sort();\n"
-                    "console.log(arr);"
-                )
-            else:
-                code = "// " + description
-        elif lang == "reactnative":
-            if "ui" in desc_lower or "form" in desc_lower or "table" in desc_lower:
-                if "form" in desc_lower:
-                    code = (
-                        "import React, { useState } from 'react';\n"
-                        "import { View, Text, TextInput, Button } from 'react-native';\n\n"
-                        "export default function GeneratedForm() {\n"
-                        "  const [name, setName] = useState('');\n"
-                        "  const [email, setEmail] = useState('');\n"
-                        "  return (\n"
-                        "    <View style={{ padding: 20 }}>\n"
-                        "      <Text>Name:</Text>\n"
-                        "      <TextInput value={name} onChangeText={setName} style={{ borderWidth: 1, marginBottom: 10 }} />\n"
-                        "      <Text>Email:</Text>\n"
-                        "      <TextInput value={email} onChangeText={setEmail} style={{ borderWidth: 1, marginBottom: 10 }} />\n"
-                        "      <Button title='Submit' onPress={() => console.log(name, email)} />\n"
-                        "    </View>\n"
-                        "  );\n"
-                        "}\n"
-                    )
-                elif "table" in desc_lower:
-                    code = (
-                        "import React from 'react';\n"
-                        "import { View, Text } from 'react-native';\n\n"
-                        "export default function Table() {\n"
-                        "  const data = [\n"
-                        "    { a: 1, b: 2 },\n"
-                        "    { a: 3, b: 4 }\n"
-                        "  ];\n"
-                        "  return (\n"
-                        "    <View>\n"
-                        "      {data.map((row, idx) => (\n"
-                        "        <View key={idx} style={{ flexDirection: 'row' }}>\n"
-                        "          <Text>{row.a}</Text>\n"
-                        "          <Text>{row.b}</Text>\n"
-                        "        </View>\n"
-                        "      ))}\n"
-                        "    </View>\n"
-                        "  );\n"
-                        "}\n"
-                    )
-                else:
-                    code = (
-                        "import React from 'react';\n"
-                        "import { View, Text } from 'react-native';\n\n"
-                        "export default function GeneratedUI() {\n"
-                        "  return (\n"
-                        "    <View style={{ flex: 1, justifyContent: 'center', alignItems: 'center' }}>\n"
-                        "      <Text>This is a generated UI</Text>\n"
-                        "    </View>\n"
-                        "  );\n"
-                        "}\n"
-                    )
-            elif "for loop" in desc_lower:
-                code = (
-                    "// React Native for loop example\n"
-                    "{[...Array(10).keys()].map(i => (\n"
-                    "  <Text key={i}>{i}</Text>\n"
-                    "))}"
-                )
-            else:
-                code = "// " + description
-        elif lang == "flutter":
-            if "ui" in desc_lower or "form" in desc_lower or "table" in desc_lower:
-                if "form" in desc_lower:
-                    code = (
-                        "import 'package:flutter/material.dart';\n\n"
-                        "class GeneratedForm extends StatefulWidget {\n"
-                        "  @override\n"
-                        "  _GeneratedFormState createState() => _GeneratedFormState();\n"
-                        "}\n\n"
-                        "class _GeneratedFormState extends State<GeneratedForm> {\n"
-                        "  final _formKey = GlobalKey<FormState>();\n"
-                        "  String name = '', email = '';\n"
-                        "  @override\n"
-                        "  Widget build(BuildContext context) {\n"
-                        "    return Scaffold(\n"
-                        "      appBar: AppBar(title: Text('Generated Form')),\n"
-                        "      body: Padding(\n"
-                        "        padding: const EdgeInsets.all(16.0),\n"
-                        "        child: Form(\n"
-                        "          key: _formKey,\n"
-                        "          child: Column(\n"
-                        "            children: [\n"
-                        "              TextFormField(\n"
-                        "                decoration: InputDecoration(labelText: 'Name'),\n"
-                        "                onChanged: (val) => setState(() => name = val),\n"
-                        "              ),\n"
-                        "              TextFormField(\n"
-                        "                decoration: InputDecoration(labelText: 'Email'),\n"
-                        "                onChanged: (val) => setState(() => email = val),\n"
-                        "              ),\n"
-                        "              ElevatedButton(\n"
-                        "                onPressed: () {\n"
-                        "                  print('Name: \$name, Email: \$email');\n"
-                        "                },\n"
-                        "                child: Text('Submit'),\n"
-                        "              ),\n"
-                        "            ],\n"
-                        "          ),\n"
-                        "        ),\n"
-                        "      ),\n"
-                        "    );\n"
-                        "  }\n"
-                        "}\n"
-                    )
-                elif "table" in desc_lower:
-                    code = (
-                        "import 'package:flutter/material.dart';\n\n"
-                        "class TableWidget extends StatelessWidget {\n"
-                        "  @override\n"
-                        "  Widget build(BuildContext context) {\n"
-                        "    return Scaffold(\n"
-                        "      appBar: AppBar(title: Text('Table')),\n"
-                        "      body: DataTable(\n"
-                        "        columns: [\n"
-                        "          DataColumn(label: Text('A')),\n"
-                        "          DataColumn(label: Text('B')),\n"
-                        "        ],\n"
-                        "        rows: [\n"
-                        "          DataRow(cells: [DataCell(Text('1')), DataCell(Text('2'))]),\n"
-                        "          DataRow(cells: [DataCell(Text('3')), DataCell(Text('4'))]),\n"
-                        "        ],\n"
-                        "      ),\n"
-                        "    );\n"
-                        "  }\n"
-                        "}\n"
-                    )
-                else:
-                    code = (
-                        "import 'package:flutter/material.dart';\n\n"
-                        "class GeneratedUI extends StatelessWidget {\n"
-                        "  @override\n"
-                        "  Widget build(BuildContext context) {\n"
-                        "    return Scaffold(\n"
-                        "      appBar: AppBar(title: Text('Generated UI')),\n"
-                        "      body: Center(child: Text('This is a generated UI')),\n"
-                        "    );\n"
-                        "  }\n"
-                        "}\n"
-                    )
-            elif "for loop" in desc_lower:
-                code = (
-                    "for (int i = 0; i < 10; i++) {\n"
-                    "  print(i);\n"
-                    "}"
-                )
-            else:
-                code = "// " + description
-        else:
-            if "for loop" in desc_lower:
-                if lang in ["java", "c++", "c#", "kotlin", "go"]:
-                    code = "for (int i = 0; i < 10; i++) {\n    // code\n}"
-                else:
-                    code = "// for loop"
-            elif "sort" in desc_lower:
-                code = "// sort code"
-            else:
-                comment = "//" if lang in [
-                    "javascript", "typescript", "java", "c++", "c#", "go", "kotlin"
-                ] else "#"
-                code = f"{comment} {description}"
-        return {
+    async def generate_code_from_text_async(self, description: str, language: str = "python") -> dict:
+        """Async variant of `generate_code_from_text` that fetches a linked description asynchronously."""
+        if isinstance(description, str) and is_url(description):
+            fetched, fetch = await self._fetch_url_async(description, max_chars=200)
+            return self._generate(f"UI for content from {description}:\n{fetched[:200]}", language, fetch)
+        return self.generate_code_from_text(description, language)
+
+    @staticmethod
+    def _generate(description: str, language: str, fetch: Optional[dict]) -> dict:
+        lang = (language or "python").strip().lower()
+        code = code_templates.render(description, lang)
+        result = {
             "status": "success",
             "generated_code": code,
         }
+        if fetch is not None:
+            result["fetch"] = fetch
+        return result
 
     def analyze_link(self, link: str) -> dict:
         # ...existing code...
-        import requests
-        from urllib.parse import urlparse
         if not isinstance(link, str) or not link.strip():
             return {"status": "error", "error_message": "No link provided."}
+        url = self._link_url(link)
+        try:
+            content_type = link_probe.probe(url)["content_type"]
+        except Exception:
+            content_type = ""
+        return self._describe_link(url, content_type)
+
+    async def analyze_link_async(self, link: str) -> dict:
+        """Async variant of `analyze_link` that probes the link without blocking the event loop."""
+        if not isinstance(link, str) or not link.strip():
+            return {"status": "error", "error_message": "No link provided."}
+        url = self._link_url(link)
+        try:
+            content_type = (await link_probe.probe_async(url))["content_type"]
+        except Exception:
+            content_type = ""
+        return self._describe_link(url, content_type)
+
+    @staticmethod
+    def _link_url(link: str) -> str:
         url = link.strip()
+        if not is_url(url):
+            # e.g. "what is https://example.com/x about?": analyze the link in the text.
+            embedded = find_urls(url, limit=1)
+            if embedded:
+                url = embedded[0]
         if not url.startswith("http"):
             url = "http://" + url
+        return url
+
+    @staticmethod
+    def _describe_link(url: str, content_type: str) -> dict:
         parsed = urlparse(url)
         domain = parsed.netloc.lower()
         path = parsed.path.lower()
-        try:
-            resp = requests.head(url, allow_redirects=True, timeout=5)
-            content_type = resp.headers.get("Content-Type", "")
-        except Exception:
-            content_type = ""
         # Simple heuristics
         if "github.com" in domain:
             desc = "GitHub repository or file."
@@ -610,8 +330,16 @@ class ContentCreationGenerationAgent:
             "description": desc
         }
 
-    def google_search_link(self, link: str) -> dict:
-        # ...existing code...
+    async def google_search_link(self, link: str, tool_context: ToolContext) -> dict:
+        """Searches the link on Google through the google_search_grounding agent tool.
+
+        Args:
+            link (str): The URL to search for.
+            tool_context (ToolContext): The ADK tool context the search agent runs in.
+
+        Returns:
+            dict: status and the search agent's response or error message.
+        """
         try:
             from agents.tools.search import google_search_grounding  # Adjust import path as needed
         except ImportError:
@@ -624,7 +352,9 @@ class ContentCreationGenerationAgent:
             return {"status": "error", "error_message": "No link provided."}
         query = link.strip()
         try:
-            result = google_search_grounding.run(query)
+            result = await google_search_grounding.run_async(
+                args={"request": query}, tool_context=tool_context
+            )
             return {
                 "status": "success",
                 "response": result
@@ -634,4 +364,3 @@ class ContentCreationGenerationAgent:
                 "status": "error",
                 "error_message": f"Search agent failed: {e}"
             }
-
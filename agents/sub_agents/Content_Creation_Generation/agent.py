@@ -2,7 +2,8 @@ from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
 from google.adk.tools import FunctionTool
 from agents.sub_agents.Content_Creation_Generation.Content_Creation_Generation import ContentCreationGenerationAgent
-from agents.sub_agents.Content_Creation_Generation.prompt import Content_Creation_Generation
+from agents.sub_agents.Content_Creation_Generation.prompt import Content_Creation_Generation, Content_Creation_Generation_Description
+from agents.tools.http_client import prefer_async
 
 # Instantiate the ContentCreationGenerationAgent
 content_creation_agent_instance = ContentCreationGenerationAgent()
@@ -21,15 +22,24 @@ generate_code_tool = FunctionTool(
 )
 
 improve_code_tool = FunctionTool(
-    func=content_creation_agent_instance.improve_code
+    func=prefer_async(
+        content_creation_agent_instance.improve_code,
+        content_creation_agent_instance.improve_code_async,
+    )
 )
 
 generate_code_from_text_tool = FunctionTool(
-    func=content_creation_agent_instance.generate_code_from_text
+    func=prefer_async(
+        content_creation_agent_instance.generate_code_from_text,
+        content_creation_agent_instance.generate_code_from_text_async,
+    )
 )
 
 analyze_link_tool = FunctionTool(
-    func=content_creation_agent_instance.analyze_link
+    func=prefer_async(
+        content_creation_agent_instance.analyze_link,
+        content_creation_agent_instance.analyze_link_async,
+    )
 )
 
 google_search_link_tool = FunctionTool(
@@ -41,7 +51,7 @@ Content_creation_generation_agent = Agent(
     model="gemini-2.0-flash",
     name="content_creation_generation_agent",
     instruction=Content_Creation_Generation,
-    description="Generates marketing materials, reports, code, and improves or generates code from text using advanced orchestration.",
+    description=Content_Creation_Generation_Description,
     tools=[
         generate_marketing_material_tool,
         generate_report_tool,
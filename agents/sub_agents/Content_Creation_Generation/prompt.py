@@ -1,6 +1,8 @@
 """Prompt for the Content_Creation_Generation agent."""
 
 
+Content_Creation_Generation_Description = "Generates marketing materials, reports, code, and improves or generates code from text using advanced orchestration."
+
 Content_Creation_Generation = """
 You are a Content Creation & Generation Agent. 
 - When a user provides a link (URL), always analyze the link using your tools and provide a detailed description of the link's type and content.
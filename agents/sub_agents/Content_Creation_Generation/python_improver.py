@@ -0,0 +1,288 @@
+"""Incremental fix-and-validate pipeline behind `improve_code` for Python sources.
+
+The source is split into top-level blocks (a function, a class, an if/else chain,
+a run of decorators with the definition they decorate, ...). Each block is fixed
+and compiled on its own and the result is cached under the block's content hash,
+so resubmitting a file with a few edits only re-processes the edited blocks.
+
+A clean file is reported clean from the blocks alone. When a block has an error,
+or a statement whose validity depends on the rest of the module (`from __future__`,
+a module-level `global`), the whole output is compiled once more so the reported
+error is exactly the one `compile()` raises for the file.
+"""
+
+import ast
+import hashlib
+import io
+import os
+import re
+import time
+import tokenize
+from typing import Any, Dict, List, Optional, Tuple
+
+from agents.tools.cache import TTLCache
+
+IMPROVE_CACHE_SIZE = int(os.getenv("MYBOT_IMPROVE_CACHE_SIZE", "20000"))
+IMPROVE_CACHE_TTL = float(os.getenv("MYBOT_IMPROVE_CACHE_TTL", "86400"))
+# Work limits per request; blocks past either one are returned unchanged and unchecked.
+IMPROVE_MAX_BLOCKS = int(os.getenv("MYBOT_IMPROVE_MAX_BLOCKS", "2000"))
+IMPROVE_MAX_CHARS = int(os.getenv("MYBOT_IMPROVE_MAX_CHARS", "2000000"))
+
+# Bump when the fixes or checks change, so cached results are not reused.
+FIXES_VERSION = "3"
+MAX_REPORTED_ERRORS = 20
+
+_DEF_MISSING_COLON = re.compile(r'^(def .+\))\s*$', flags=re.MULTILINE)
+_CLASS_MISSING_COLON = re.compile(r'^(class .+)\s*$', flags=re.MULTILINE)
+
+# Statements that continue the compound statement before them.
+_CONTINUATIONS = frozenset(("else", "elif", "except", "finally"))
+# Candidate statement starts merged while looking for the end of an open chunk.
+MAX_MERGED_STATEMENTS = 256
+_FIRST_WORD = re.compile(r"\w*")
+_ON_LINE = re.compile(r"\bon line (\d+)")
+
+
+def _is_complete(chunk: str) -> bool:
+    """Returns False if `chunk` ends inside a bracket, a multi-line string or a `\\` continuation."""
+    if chunk.rstrip().endswith("\\"):
+        return False
+    if not any(c in chunk for c in "'\"#"):
+        # Without strings or comments, bracket counts are exact.
+        return all(chunk.count(o) == chunk.count(c) for o, c in ("()", "[]", "{}"))
+    try:
+        for _ in tokenize.generate_tokens(io.StringIO(chunk).readline):
+            pass
+    except tokenize.TokenError as e:
+        return "EOF" not in str(e) and "unterminated triple-quoted" not in str(e)
+    except SyntaxError:
+        pass  # e.g. inconsistent dedent: a real error in this statement, not a cut in the middle
+    return True
+
+
+def split_blocks(source: str, cache: Optional[TTLCache] = None) -> List[Tuple[int, str]]:
+    """Splits `source` into top-level blocks, returned as (first line number, text).
+
+    A top-level statement starts on a line that begins with neither whitespace nor
+    a comment, unless the text before it is still open (a bracket, a multi-line
+    string, a `\\` continuation). `else`/`elif`/`except`/`finally` stay with the
+    statement they continue and decorators with what they decorate; comments and
+    blank lines stay with the block before them. `cache` remembers which chunks were
+    complete, so resubmitted sources are split without tokenizing them again.
+    """
+    lines = source.split("\n")
+    starts = [i for i, line in enumerate(lines) if line[:1] not in ("", " ", "\t", "\f", "#")]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    starts.append(len(lines))
+
+    bounds: List[int] = []
+    decorated = False
+    i = 0
+    while i < len(starts) - 1:
+        j = i + 1
+        while j < len(starts) - 1:
+            chunk = "\n".join(lines[starts[i]:starts[j]])
+            key = "split:" + hashlib.sha256(chunk.encode("utf-8", "surrogatepass")).hexdigest()
+            complete = cache.get(key) if cache is not None else None
+            if complete is None:
+                complete = _is_complete(chunk)
+                if cache is not None:
+                    cache.set(key, complete)
+            if complete:
+                break
+            if j - i >= MAX_MERGED_STATEMENTS:
+                j = len(starts) - 1  # e.g. an unterminated string: the rest is one block
+                break
+            j += 1
+        first = lines[starts[i]].lstrip()
+        keyword = _FIRST_WORD.match(first).group()
+        if not bounds or not (decorated or keyword in _CONTINUATIONS):
+            bounds.append(starts[i])
+        decorated = first.startswith("@")
+        i = j
+    bounds.append(len(lines))
+    return [(start + 1, "\n".join(lines[start:end])) for start, end in zip(bounds, bounds[1:])]
+
+
+def fix_block(block: str) -> str:
+    """Adds the colon missing after `def ...)` and `class ...` lines."""
+    block = _DEF_MISSING_COLON.sub(r'\1:', block)
+    return _CLASS_MISSING_COLON.sub(r'\1:', block)
+
+
+def _module_scoped(tree: ast.AST) -> bool:
+    """True if `tree` has a `from __future__` import or a `global` statement at module scope.
+
+    Whether those compile depends on what comes before them in the file, which a
+    block compiled on its own cannot see.
+    """
+    pending = list(ast.iter_child_nodes(tree))
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ast.Global) or (isinstance(node, ast.ImportFrom) and node.module == "__future__"):
+            return True
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            pending.extend(ast.iter_child_nodes(node))
+    return False
+
+
+def _at_end(block: str, line: int, offset: Optional[int]) -> bool:
+    """True if only blank lines and comments follow position (`line`, `offset`) of `block`."""
+    lines = block.split("\n")[line - 1:]
+    if lines:
+        lines[0] = lines[0][max((offset or 1) - 1, 0):]
+    return all(not text.strip() or text.lstrip().startswith("#") for text in lines)
+
+
+def check_block(block: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """Compiles `block`; returns its error (None if it compiles) and whether it is module scoped.
+
+    The error has `stage` ("parse" or "compile"), `message`, its `line` in the
+    block and `at_end`: set when the parser ran out of input, which in the whole
+    file happens at the next block's first statement instead. Module scoped blocks
+    are those `_module_scoped` describes.
+    """
+    stage = "parse"
+    try:
+        tree = ast.parse(block, "<string>")
+        stage = "compile"
+        compile(tree, "<string>", "exec")
+    except SyntaxError as e:
+        at_end = stage == "parse" and e.lineno is not None and _at_end(block, e.lineno, e.offset)
+        return {"stage": stage, "message": e.msg, "line": e.lineno, "at_end": at_end}, False
+    except Exception as e:
+        return {"stage": stage, "message": str(e), "line": None, "at_end": False}, False
+    return None, _module_scoped(tree)
+
+
+def _in_output(error: Dict[str, Any], first_line: int, next_line: Optional[int]) -> Dict[str, Any]:
+    """Moves a block's error, including line numbers quoted in its message, to output lines."""
+    line = error["line"]
+    if line is not None:
+        line = next_line if error["at_end"] and next_line is not None else first_line + line - 1
+    message = _ON_LINE.sub(lambda m: f"on line {first_line + int(m.group(1)) - 1}", error["message"])
+    return {"stage": error["stage"], "message": message, "line": line}
+
+
+class PythonImprover:
+    """Fixes and validates Python sources block by block, with per-block caching."""
+
+    def __init__(
+        self,
+        cache: Optional[TTLCache] = None,
+        max_blocks: int = IMPROVE_MAX_BLOCKS,
+        max_chars: int = IMPROVE_MAX_CHARS,
+    ):
+        self.cache = cache if cache is not None else TTLCache(
+            maxsize=IMPROVE_CACHE_SIZE, ttl=IMPROVE_CACHE_TTL
+        )
+        self.max_blocks = max_blocks
+        self.max_chars = max_chars
+
+    @staticmethod
+    def _key(block: str) -> str:
+        return f"py{FIXES_VERSION}:" + hashlib.sha256(block.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def improve(self, source: str) -> Dict[str, Any]:
+        """Returns the fixed source, the first remaining error and a per-stage report.
+
+        The result has `code`, `error` (what `compile()` on the whole code raises,
+        in its format, or None), `errors` (up to MAX_REPORTED_ERRORS, that error first,
+        then those found in other blocks) and `pipeline` (block counts and per-stage
+        timings in milliseconds). Line numbers refer to the returned code. Past the
+        work limits, the error comes from the checked blocks only.
+        """
+        started = time.perf_counter()
+        blocks = split_blocks(source, self.cache)
+        split_ms = (time.perf_counter() - started) * 1000
+
+        fix_ms = compile_ms = 0.0
+        cached = processed = unchecked = 0
+        budget_blocks, budget_chars = self.max_blocks, self.max_chars
+        output: List[str] = []
+        found: List[Tuple[int, Dict[str, Any]]] = []  # (index of the block in blocks, error)
+        module_scoped = False
+        for index, (_, block) in enumerate(blocks):
+            key = self._key(block)
+            result = self.cache.get(key)
+            if result is not None:
+                cached += 1
+            elif budget_blocks > 0 and len(block) <= budget_chars:
+                budget_blocks -= 1
+                budget_chars -= len(block)
+                t0 = time.perf_counter()
+                fixed = fix_block(block)
+                t1 = time.perf_counter()
+                error, scoped = check_block(fixed)
+                result = {"fixed": fixed, "error": error, "module_scoped": scoped}
+                t2 = time.perf_counter()
+                fix_ms += (t1 - t0) * 1000
+                compile_ms += (t2 - t1) * 1000
+                self.cache.set(key, result)
+                processed += 1
+            else:
+                unchecked += 1
+                output.append(block)
+                continue
+            output.append(result["fixed"])
+            module_scoped = module_scoped or result["module_scoped"]
+            if result["error"] is not None:
+                found.append((len(output) - 1, result["error"]))
+
+        # First output line of each block, plus one past the end.
+        starts = [1]
+        for text in output:
+            starts.append(starts[-1] + text.count("\n") + 1)
+        errors = [
+            _in_output(error, starts[i], starts[i + 1] if i + 1 < len(output) else None)
+            for i, error in found
+        ]
+        code = "\n".join(output)
+
+        first: Optional[Dict[str, Any]] = None  # the error compile() on the whole output raises
+        if (found or module_scoped) and not unchecked:
+            t0 = time.perf_counter()
+            key = f"file{FIXES_VERSION}:" + hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+            checked = self.cache.get(key)
+            if checked is None:
+                error, _ = check_block(code)
+                checked = {"error": None if error is None else {k: error[k] for k in ("stage", "message", "line")}}
+                self.cache.set(key, checked)
+            compile_ms += (time.perf_counter() - t0) * 1000
+            first = checked["error"]
+            if first is not None:
+                errors = [first] + [e for e in errors if e != first]
+        elif errors:
+            # Like compile(), parse errors anywhere come before compile errors ("'return' outside function").
+            first = next((e for e in errors if e["stage"] == "parse"), errors[0])
+        errors = errors[:MAX_REPORTED_ERRORS]
+
+        first_error = None
+        if first is not None:
+            first_error = first["message"] if first["line"] is None else (
+                f"{first['message']} (<string>, line {first['line']})"
+            )
+        return {
+            "code": code,
+            "error": first_error,
+            "errors": errors,
+            "pipeline": {
+                "blocks": len(blocks),
+                "cached": cached,
+                "processed": processed,
+                "unchecked": unchecked,
+                "timings_ms": {
+                    "split": round(split_ms, 3),
+                    "fix": round(fix_ms, 3),
+                    "compile": round(compile_ms, 3),
+                    "total": round((time.perf_counter() - started) * 1000, 3),
+                },
+            },
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {"cache": self.cache.stats()}
+
+
+python_improver = PythonImprover()
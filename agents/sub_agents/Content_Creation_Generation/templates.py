@@ -0,0 +1,676 @@
+"""Declarative code templates for `generate_code_from_text`.
+
+Each template names the languages it serves, the keywords that trigger it and a
+priority. A description selects the highest-priority template whose keyword
+groups all match; every language also has a keyword-less default. Templates
+registered for "*" serve languages without a default of their own.
+
+Placeholders in `code`: `{description}`, `{comment}` (the language's line comment
+prefix) and `{addons}` (the snippets of the template's `addons` whose keywords
+occur in the description, one per line).
+"""
+
+import threading
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from agents.tools.keyword_matcher import KeywordMatcher
+
+ANY_LANGUAGE = "*"
+
+# Languages whose line comments start with "//"; everything else gets "#".
+SLASH_COMMENT_LANGUAGES = ("javascript", "typescript", "java", "c++", "c#", "go", "kotlin")
+
+
+class CodeTemplate(NamedTuple):
+    name: str
+    languages: Tuple[str, ...]
+    # Every group must match; a group matches when any of its keywords occurs.
+    keywords: Tuple[Tuple[str, ...], ...]
+    code: str
+    priority: int = 0
+    # (keywords, snippet) pairs rendered into `{addons}` when any keyword occurs.
+    addons: Tuple[Tuple[Tuple[str, ...], str], ...] = ()
+
+
+def line_comment(language: str) -> str:
+    return "//" if language in SLASH_COMMENT_LANGUAGES else "#"
+
+
+class TemplateRegistry:
+    """Templates indexed by language and trigger keyword.
+
+    A lookup scans the lower-cased description once with a `KeywordMatcher` over
+    every registered keyword, then only checks the templates indexed under the
+    keywords it found. Each template is indexed under its most selective keyword
+    group only, so a common keyword shared by many templates does not make every
+    lookup that contains it walk all of them. Ties in priority go to
+    language-specific templates over "*" ones, then to the template registered
+    first.
+    """
+
+    def __init__(self, templates: Iterable[CodeTemplate] = ()):
+        self._templates: List[CodeTemplate] = []
+        self._groups: List[Tuple[FrozenSet[str], ...]] = []  # lower-cased keyword groups
+        # language -> keyword -> template indexes; rebuilt lazily after registrations
+        self._index: Optional[Dict[str, Dict[str, List[int]]]] = None
+        self._defaults: Dict[str, List[int]] = defaultdict(list)
+        self._matcher: Optional[KeywordMatcher] = None
+        self._lock = threading.Lock()
+        self.extend(templates)
+
+    def register(self, template: CodeTemplate):
+        self.extend((template,))
+
+    def extend(self, templates: Iterable[CodeTemplate]):
+        with self._lock:
+            for template in templates:
+                if not template.keywords:
+                    for language in template.languages:
+                        self._defaults[language].append(len(self._templates))
+                self._templates.append(template)
+                self._groups.append(tuple(frozenset(kw.lower() for kw in group) for group in template.keywords))
+            self._index = self._matcher = None
+
+    def _build(self) -> Tuple[Dict[str, Dict[str, List[int]]], KeywordMatcher]:
+        index, matcher = self._index, self._matcher
+        if index is not None and matcher is not None:
+            return index, matcher
+        with self._lock:
+            if self._index is None or self._matcher is None:
+                frequency: Dict[str, int] = defaultdict(int)
+                for groups in self._groups:
+                    for group in groups:
+                        for keyword in group:
+                            frequency[keyword] += 1
+                index: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+                for i, groups in enumerate(self._groups):
+                    if not groups:
+                        continue
+                    anchor = min(groups, key=lambda group: sum(frequency[kw] for kw in group))
+                    for language in self._templates[i].languages:
+                        for keyword in anchor:
+                            index[language][keyword].append(i)
+                keywords = set(frequency)
+                keywords.update(kw.lower() for t in self._templates for kws, _ in t.addons for kw in kws)
+                self._index, self._matcher = index, KeywordMatcher(keywords)
+            return self._index, self._matcher
+
+    def match(self, description: str, language: str) -> Optional[CodeTemplate]:
+        """Returns the template `description` selects for `language`, if any."""
+        index, matcher = self._build()
+        return self._match(index, matcher.find(description.lower()), language)
+
+    def _match(self, index, found: Set[str], language: str) -> Optional[CodeTemplate]:
+        languages = [language]
+        if not self._defaults.get(language):
+            languages.append(ANY_LANGUAGE)
+        best, best_rank = None, None
+        for specificity, lang in enumerate(languages):
+            by_keyword = index.get(lang, {})
+            candidates = {i for keyword in found for i in by_keyword.get(keyword, ())}
+            candidates.update(self._defaults.get(lang, ()))
+            for i in candidates:
+                rank = (-self._templates[i].priority, specificity, i)
+                if best_rank is not None and rank >= best_rank:
+                    continue
+                if all(not group.isdisjoint(found) for group in self._groups[i]):
+                    best, best_rank = self._templates[i], rank
+        return best
+
+    def render(self, description: str, language: str) -> str:
+        """Returns the code of the template `description` selects for `language`.
+
+        Returns an empty string when no template (not even a default) applies.
+        """
+        index, matcher = self._build()
+        found = matcher.find(description.lower())
+        template = self._match(index, found, language)
+        if template is None:
+            return ""
+        code = template.code
+        if "{addons}" in code:
+            addons = [snippet for keywords, snippet in template.addons
+                      if any(kw.lower() in found for kw in keywords)]
+            code = code.replace("{addons}", "\n".join(addons))
+        if "{comment}" in code:
+            code = code.replace("{comment}", line_comment(language))
+        return code.replace("{description}", description)
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+
+CODE_TEMPLATES: Tuple[CodeTemplate, ...] = (
+    # Python: Tkinter UIs, then plain snippets.
+    CodeTemplate(
+        name="python/tkinter/dashboard",
+        languages=("python",),
+        keywords=(("dashboard",),),
+        priority=100,
+        code=(
+            "import tkinter as tk\n"
+            "from tkinter import ttk\n"
+            "root = tk.Tk()\n"
+            "root.title('Dashboard')\n"
+            "notebook = ttk.Notebook(root)\n"
+            "tab1 = tk.Frame(notebook)\n"
+            "tab2 = tk.Frame(notebook)\n"
+            "notebook.add(tab1, text='Overview')\n"
+            "notebook.add(tab2, text='Details')\n"
+            "notebook.pack(expand=1, fill='both')\n"
+            "tk.Label(tab1, text='Welcome to the Dashboard!').pack(pady=10)\n"
+            "tree = ttk.Treeview(tab2, columns=('A', 'B', 'C'), show='headings')\n"
+            "for col in ('A', 'B', 'C'):\n"
+            "    tree.heading(col, text=col)\n"
+            "tree.insert('', 'end', values=(1, 2, 3))\n"
+            "tree.pack(fill='both', expand=True)\n"
+            "root.mainloop()\n"
+        ),
+    ),
+    CodeTemplate(
+        name="python/tkinter/form",
+        languages=("python",),
+        keywords=(("form",), ("fields",)),
+        priority=95,
+        code=(
+            "import tkinter as tk\n"
+            "root = tk.Tk()\n"
+            "root.title('Complex Form UI')\n"
+            "fields = ['Name', 'Email', 'Age']\n"
+            "entries = {}\n"
+            "for idx, field in enumerate(fields):\n"
+            "    label = tk.Label(root, text=field)\n"
+            "    label.grid(row=idx, column=0, padx=5, pady=5)\n"
+            "    entry = tk.Entry(root)\n"
+            "    entry.grid(row=idx, column=1, padx=5, pady=5)\n"
+            "    entries[field] = entry\n"
+            "def submit():\n"
+            "    print({f: e.get() for f, e in entries.items()})\n"
+            "tk.Button(root, text='Submit', command=submit).grid(row=len(fields), column=0, columnspan=2)\n"
+            "root.mainloop()\n"
+        ),
+    ),
+    CodeTemplate(
+        name="python/tkinter/table",
+        languages=("python",),
+        keywords=(("table",),),
+        priority=90,
+        code=(
+            "import tkinter as tk\n"
+            "from tkinter import ttk\n"
+            "root = tk.Tk()\n"
+            "root.title('Table UI')\n"
+            "tree = ttk.Treeview(root, columns=('A', 'B', 'C'), show='headings')\n"
+            "for col in ('A', 'B', 'C'):\n"
+            "    tree.heading(col, text=col)\n"
+            "tree.insert('', 'end', values=(1, 2, 3))\n"
+            "tree.insert('', 'end', values=(4, 5, 6))\n"
+            "tree.pack(fill='both', expand=True)\n"
+            "root.mainloop()\n"
+        ),
+    ),
+    CodeTemplate(
+        name="python/tkinter/tabs",
+        languages=("python",),
+        keywords=(("tabs", "notebook"),),
+        priority=85,
+        code=(
+            "import tkinter as tk\n"
+            "from tkinter import ttk\n"
+            "root = tk.Tk()\n"
+            "root.title('Tabbed UI')\n"
+            "notebook = ttk.Notebook(root)\n"
+            "tab1 = tk.Frame(notebook)\n"
+            "tab2 = tk.Frame(notebook)\n"
+            "notebook.add(tab1, text='Tab 1')\n"
+            "notebook.add(tab2, text='Tab 2')\n"
+            "notebook.pack(expand=1, fill='both')\n"
+            "tk.Label(tab1, text='Content for Tab 1').pack(padx=10, pady=10)\n"
+            "tk.Label(tab2, text='Content for Tab 2').pack(padx=10, pady=10)\n"
+            "root.mainloop()\n"
+        ),
+    ),
+    CodeTemplate(
+        name="python/tkinter/canvas",
+        languages=("python",),
+        keywords=(("canvas",),),
+        priority=80,
+        code=(
+            "import tkinter as tk\n"
+            "root = tk.Tk()\n"
+            "root.title('Canvas Drawing')\n"
+            "canvas = tk.Canvas(root, width=400, height=300, bg='white')\n"
+            "canvas.pack()\n"
+            "canvas.create_rectangle(50, 50, 150, 150, fill='blue')\n"
+            "canvas.create_oval(200, 100, 300, 200, fill='red')\n"
+            "root.mainloop()\n"
+        ),
+    ),
+    CodeTemplate(
+        name="python/tkinter/generic",
+        languages=("python",),
+        keywords=(("tkinter", "ui", "window", "dashboard", "form", "table", "canvas", "tabs", "notebook"),),
+        priority=70,
+        code=(
+            "import tkinter as tk\n"
+            "root = tk.Tk()\n"
+            "root.title('Generated UI')\n"
+            "label = tk.Label(root, text='This is a generated UI')\n"
+            "label.pack(padx=20, pady=20)\n"
+            "{addons}"
+            "\nroot.mainloop()\n"
+        ),
+        addons=(
+            (("button",), "button = tk.Button(root, text='Click Me')\nbutton.pack(pady=10)"),
+            (("entry", "input"), "entry = tk.Entry(root)\nentry.pack(pady=10)"),
+        ),
+    ),
+    CodeTemplate(
+        name="python/for_loop",
+        languages=("python",),
+        keywords=(("for loop",),),
+        priority=60,
+        code="for i in range(10):\n    print(i)",
+    ),
+    CodeTemplate(
+        name="python/class",
+        languages=("python",),
+        keywords=(("class",),),
+        priority=50,
+        code=(
+            "class MyClass:\n"
+            "    def __init__(self):\n"
+            "        pass\n"
+        ),
+    ),
+    CodeTemplate(
+        name="python/sort_list",
+        languages=("python",),
+        keywords=(("sort",), ("list",)),
+        priority=40,
+        code=(
+            "def sort_list(lst):\n"
+            "    return sorted(lst)\n"
+            "# Example usage:\n"
+            "print(sort_list([3, 1, 2]))"
+        ),
+    ),
+    CodeTemplate(
+        name="python/binary_search",
+        languages=("python",),
+        keywords=(("search",), ("binary",)),
+        priority=30,
+        code=(
+            "def binary_search(arr, target):\n"
+            "    left, right = 0, len(arr) - 1\n"
+            "    while left <= right:\n"
+            "        mid = (left + right) // 2\n"
+            "        if arr[mid] == target:\n"
+            "            return mid\n"
+            "        elif arr[mid] < target:\n"
+            "            left = mid + 1\n"
+            "        else:\n"
+            "            right = mid - 1\n"
+            "    return -1\n"
+            "# Example usage:\n"
+            "print(binary_search([1,2,3,4,5], 3))"
+        ),
+    ),
+    CodeTemplate(name="python/default", languages=("python",), keywords=(), priority=0, code="# {description}"),
+
+    # Swift (SwiftUI).
+    CodeTemplate(
+        name="swift/swiftui/form",
+        languages=("swift",),
+        keywords=(("form",),),
+        priority=95,
+        code=(
+            "import SwiftUI\n\n"
+            "struct ContentView: View {\n"
+            "    @State private var name = \"\"\n"
+            "    @State private var email = \"\"\n"
+            "    var body: some View {\n"
+            "        Form {\n"
+            "            TextField(\"Name\", text: $name)\n"
+            "            TextField(\"Email\", text: $email)\n"
+            "            Button(\"Submit\") {\n"
+            "                print(\"Name: \\(name), Email: \\(email)\")\n"
+            "            }\n"
+            "        }\n"
+            "    }\n"
+            "}\n"
+        ),
+    ),
+    CodeTemplate(
+        name="swift/swiftui/table",
+        languages=("swift",),
+        keywords=(("table",),),
+        priority=90,
+        code=(
+            "import SwiftUI\n\n"
+            "struct Row: Identifiable {\n"
+            "    let id = UUID()\n"
+            "    let value: String\n"
+            "}\n"
+            "struct ContentView: View {\n"
+            "    let rows = [Row(value: \"A\"), Row(value: \"B\")]\n"
+            "    var body: some View {\n"
+            "        List(rows) { row in\n"
+            "            Text(row.value)\n"
+            "        }\n"
+            "    }\n"
+            "}\n"
+        ),
+    ),
+    CodeTemplate(
+        name="swift/swiftui/generic",
+        languages=("swift",),
+        keywords=(("ui", "swiftui", "form", "table"),),
+        priority=70,
+        code=(
+            "import SwiftUI\n\n"
+            "struct ContentView: View {\n"
+            "    var body: some View {\n"
+            "        VStack {\n"
+            "            Text(\"This is a generated UI\")\n"
+            "        }\n"
+            "    }\n"
+            "}\n"
+        ),
+    ),
+    CodeTemplate(
+        name="swift/for_loop",
+        languages=("swift",),
+        keywords=(("for loop",),),
+        priority=60,
+        code="for i in 0..<10 {\n    print(i)\n}",
+    ),
+    CodeTemplate(
+        name="swift/sort_array",
+        languages=("swift",),
+        keywords=(("sort",), ("array",)),
+        priority=40,
+        code=(
+            "let arr = [3, 1, 2]\n"
+            "let sortedArr = arr.sorted()\n"
+            "print(sortedArr)"
+        ),
+    ),
+    CodeTemplate(name="swift/default", languages=("swift",), keywords=(), priority=0, code="// {description}"),
+
+    # JavaScript (plain HTML pages for UIs).
+    CodeTemplate(
+        name="javascript/html/form",
+        languages=("javascript",),
+        keywords=(("form",),),
+        priority=95,
+        code=(
+            "<!DOCTYPE html>\n<html><body>\n"
+            "<form>\n"
+            "  Name: <input type='text' name='name'><br>\n"
+            "  Email: <input type='email' name='email'><br>\n"
+            "  <input type='submit' value='Submit'>\n"
+            "</form>\n"
+            "</body></html>\n"
+        ),
+    ),
+    CodeTemplate(
+        name="javascript/html/table",
+        languages=("javascript",),
+        keywords=(("table",),),
+        priority=90,
+        code=(
+            "<!DOCTYPE html>\n<html><body>\n"
+            "<table border='1'>\n"
+            "  <tr><th>A</th><th>B</th></tr>\n"
+            "  <tr><td>1</td><td>2</td></tr>\n"
+            "  <tr><td>3</td><td>4</td></tr>\n"
+            "</table>\n"
+            "</body></html>\n"
+        ),
+    ),
+    CodeTemplate(
+        name="javascript/html/generic",
+        languages=("javascript",),
+        keywords=(("ui", "form", "table"),),
+        priority=70,
+        code=(
+            "<!DOCTYPE html>\n<html><body>\n"
+            "<h1>This is a generated UI</h1>\n"
+            "</body></html>\n"
+        ),
+    ),
+    CodeTemplate(
+        name="javascript/for_loop",
+        languages=("javascript",),
+        keywords=(("for loop",),),
+        priority=60,
+        code="for(let i = 0; i < 10; i++) {\n    console.log(i);\n}",
+    ),
+    CodeTemplate(
+        name="javascript/sort_array",
+        languages=("javascript",),
+        keywords=(("sort",), ("array",)),
+        priority=40,
+        code=(
+            "let arr = [3, 1, 2];\n"
+            "arr.sort();\n"
+            "console.log(arr);"
+        ),
+    ),
+    CodeTemplate(name="javascript/default", languages=("javascript",), keywords=(), priority=0, code="// {description}"),
+
+    # React Native.
+    CodeTemplate(
+        name="reactnative/form",
+        languages=("reactnative",),
+        keywords=(("form",),),
+        priority=95,
+        code=(
+            "import React, { useState } from 'react';\n"
+            "import { View, Text, TextInput, Button } from 'react-native';\n\n"
+            "export default function GeneratedForm() {\n"
+            "  const [name, setName] = useState('');\n"
+            "  const [email, setEmail] = useState('');\n"
+            "  return (\n"
+            "    <View style={{ padding: 20 }}>\n"
+            "      <Text>Name:</Text>\n"
+            "      <TextInput value={name} onChangeText={setName} style={{ borderWidth: 1, marginBottom: 10 }} />\n"
+            "      <Text>Email:</Text>\n"
+            "      <TextInput value={email} onChangeText={setEmail} style={{ borderWidth: 1, marginBottom: 10 }} />\n"
+            "      <Button title='Submit' onPress={() => console.log(name, email)} />\n"
+            "    </View>\n"
+            "  );\n"
+            "}\n"
+        ),
+    ),
+    CodeTemplate(
+        name="reactnative/table",
+        languages=("reactnative",),
+        keywords=(("table",),),
+        priority=90,
+        code=(
+            "import React from 'react';\n"
+            "import { View, Text } from 'react-native';\n\n"
+            "export default function Table() {\n"
+            "  const data = [\n"
+            "    { a: 1, b: 2 },\n"
+            "    { a: 3, b: 4 }\n"
+            "  ];\n"
+            "  return (\n"
+            "    <View>\n"
+            "      {data.map((row, idx) => (\n"
+            "        <View key={idx} style={{ flexDirection: 'row' }}>\n"
+            "          <Text>{row.a}</Text>\n"
+            "          <Text>{row.b}</Text>\n"
+            "        </View>\n"
+            "      ))}\n"
+            "    </View>\n"
+            "  );\n"
+            "}\n"
+        ),
+    ),
+    CodeTemplate(
+        name="reactnative/generic",
+        languages=("reactnative",),
+        keywords=(("ui", "form", "table"),),
+        priority=70,
+        code=(
+            "import React from 'react';\n"
+            "import { View, Text } from 'react-native';\n\n"
+            "export default function GeneratedUI() {\n"
+            "  return (\n"
+            "    <View style={{ flex: 1, justifyContent: 'center', alignItems: 'center' }}>\n"
+            "      <Text>This is a generated UI</Text>\n"
+            "    </View>\n"
+            "  );\n"
+            "}\n"
+        ),
+    ),
+    CodeTemplate(
+        name="reactnative/for_loop",
+        languages=("reactnative",),
+        keywords=(("for loop",),),
+        priority=60,
+        code=(
+            "// React Native for loop example\n"
+            "{[...Array(10).keys()].map(i => (\n"
+            "  <Text key={i}>{i}</Text>\n"
+            "))}"
+        ),
+    ),
+    CodeTemplate(name="reactnative/default", languages=("reactnative",), keywords=(), priority=0, code="// {description}"),
+
+    # Flutter.
+    CodeTemplate(
+        name="flutter/form",
+        languages=("flutter",),
+        keywords=(("form",),),
+        priority=95,
+        code=(
+            "import 'package:flutter/material.dart';\n\n"
+            "class GeneratedForm extends StatefulWidget {\n"
+            "  @override\n"
+            "  _GeneratedFormState createState() => _GeneratedFormState();\n"
+            "}\n\n"
+            "class _GeneratedFormState extends State<GeneratedForm> {\n"
+            "  final _formKey = GlobalKey<FormState>();\n"
+            "  String name = '', email = '';\n"
+            "  @override\n"
+            "  Widget build(BuildContext context) {\n"
+            "    return Scaffold(\n"
+            "      appBar: AppBar(title: Text('Generated Form')),\n"
+            "      body: Padding(\n"
+            "        padding: const EdgeInsets.all(16.0),\n"
+            "        child: Form(\n"
+            "          key: _formKey,\n"
+            "          child: Column(\n"
+            "            children: [\n"
+            "              TextFormField(\n"
+            "                decoration: InputDecoration(labelText: 'Name'),\n"
+            "                onChanged: (val) => setState(() => name = val),\n"
+            "              ),\n"
+            "              TextFormField(\n"
+            "                decoration: InputDecoration(labelText: 'Email'),\n"
+            "                onChanged: (val) => setState(() => email = val),\n"
+            "              ),\n"
+            "              ElevatedButton(\n"
+            "                onPressed: () {\n"
+            "                  print('Name: \$name, Email: \$email');\n"
+            "                },\n"
+            "                child: Text('Submit'),\n"
+            "              ),\n"
+            "            ],\n"
+            "          ),\n"
+            "        ),\n"
+            "      ),\n"
+            "    );\n"
+            "  }\n"
+            "}\n"
+        ),
+    ),
+    CodeTemplate(
+        name="flutter/table",
+        languages=("flutter",),
+        keywords=(("table",),),
+        priority=90,
+        code=(
+            "import 'package:flutter/material.dart';\n\n"
+            "class TableWidget extends StatelessWidget {\n"
+            "  @override\n"
+            "  Widget build(BuildContext context) {\n"
+            "    return Scaffold(\n"
+            "      appBar: AppBar(title: Text('Table')),\n"
+            "      body: DataTable(\n"
+            "        columns: [\n"
+            "          DataColumn(label: Text('A')),\n"
+            "          DataColumn(label: Text('B')),\n"
+            "        ],\n"
+            "        rows: [\n"
+            "          DataRow(cells: [DataCell(Text('1')), DataCell(Text('2'))]),\n"
+            "          DataRow(cells: [DataCell(Text('3')), DataCell(Text('4'))]),\n"
+            "        ],\n"
+            "      ),\n"
+            "    );\n"
+            "  }\n"
+            "}\n"
+        ),
+    ),
+    CodeTemplate(
+        name="flutter/generic",
+        languages=("flutter",),
+        keywords=(("ui", "form", "table"),),
+        priority=70,
+        code=(
+            "import 'package:flutter/material.dart';\n\n"
+            "class GeneratedUI extends StatelessWidget {\n"
+            "  @override\n"
+            "  Widget build(BuildContext context) {\n"
+            "    return Scaffold(\n"
+            "      appBar: AppBar(title: Text('Generated UI')),\n"
+            "      body: Center(child: Text('This is a generated UI')),\n"
+            "    );\n"
+            "  }\n"
+            "}\n"
+        ),
+    ),
+    CodeTemplate(
+        name="flutter/for_loop",
+        languages=("flutter",),
+        keywords=(("for loop",),),
+        priority=60,
+        code=(
+            "for (int i = 0; i < 10; i++) {\n"
+            "  print(i);\n"
+            "}"
+        ),
+    ),
+    CodeTemplate(name="flutter/default", languages=("flutter",), keywords=(), priority=0, code="// {description}"),
+
+    # Every other language.
+    CodeTemplate(
+        name="c_family/for_loop",
+        languages=("java", "c++", "c#", "kotlin", "go"),
+        keywords=(("for loop",),),
+        priority=60,
+        code="for (int i = 0; i < 10; i++) {\n    // code\n}",
+    ),
+    CodeTemplate(
+        name="any/for_loop",
+        languages=("*",),
+        keywords=(("for loop",),),
+        priority=60,
+        code="// for loop",
+    ),
+    CodeTemplate(
+        name="any/sort",
+        languages=("*",),
+        keywords=(("sort",),),
+        priority=40,
+        code="// sort code",
+    ),
+    CodeTemplate(name="any/default", languages=("*",), keywords=(), priority=0, code="{comment} {description}"),
+)
+
+code_templates = TemplateRegistry(CODE_TEMPLATES)
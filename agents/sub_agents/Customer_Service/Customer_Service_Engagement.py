@@ -1,26 +1,68 @@
+import time
+
+from agents.sub_agents.Customer_Service.answer_cache import answer_cache
+from agents.sub_agents.Customer_Service.knowledge_base import KnowledgeBaseError, knowledge_base
+from agents.tools.log_store import LogStore
+
+
 class CustomerServiceEngagementAgent:
     def __init__(self):
         # Initialize resources, logs, or configurations as needed
-        self.interaction_log = []
+        self.interaction_log = LogStore("interaction_log")
         self.active_sessions = {}
+        self.knowledge_base = knowledge_base
+        # Shared by every session and user: knowledge-base answers do not depend on who asks.
+        self.answers = answer_cache
+
+    def _search(self, text):
+        try:
+            return self.knowledge_base.search(text)
+        except KnowledgeBaseError as e:
+            return {"passages": [], "answered": False, "kb_version": None, "timing_ms": 0.0, "error_message": str(e)}
 
     def handle_inquiry(self, customer_id, inquiry):
         """
-        Professionally handle complex customer inquiries using multi-agent collaboration.
+        Professionally handle complex customer inquiries, answering from the knowledge base when it can.
+        An inquiry the knowledge base answers is resolved with the best matching passage; otherwise it is
+        escalated to a human agent with the closest passages attached. Resolved answers are cached for
+        every customer until the knowledge base changes, and a repeated or near-duplicate inquiry is
+        answered from the cache.
         :param customer_id: Unique identifier for the customer
         :param inquiry: The customer's inquiry or question
-        :return: Structured response
+        :return: Structured response with the matched passages and whether it came from the cache
         """
         if not customer_id or not inquiry:
             raise ValueError("Both customer_id and inquiry are required")
-        # Simulate advanced inquiry handling and escalation
+        start = time.perf_counter()
+        cached = self.answers.lookup("handle_inquiry", inquiry)
+        if cached is not None:
+            answer, cache = cached
+            response = {"customer_id": customer_id, "inquiry": inquiry, **answer, "cache": cache}
+            self.interaction_log.append(response)
+            return response
+        kb = self._search(inquiry)
+        if kb["answered"]:
+            path, status = ["virtual_assistant", "knowledge_base"], "resolved"
+            answer = kb["passages"][0]["text"]
+        else:
+            path, status = ["virtual_assistant", "knowledge_base", "human_agent"], "escalated"
+            answer = f"No knowledge-base article answers inquiry '{inquiry}' for customer {customer_id}; escalated to a human agent."
         response = {
             "customer_id": customer_id,
             "inquiry": inquiry,
-            "resolution_path": ["virtual_assistant", "knowledge_base", "human_agent"],
-            "response": f"Inquiry '{inquiry}' for customer {customer_id} resolved using multi-agent collaboration.",
-            "status": "resolved"
+            "resolution_path": path,
+            "response": answer,
+            "passages": kb["passages"],
+            "kb_version": kb["kb_version"],
+            "timing_ms": kb["timing_ms"],
+            "status": status
         }
+        if "error_message" in kb:
+            response["error_message"] = kb["error_message"]
+        if status == "resolved":
+            answer = {k: v for k, v in response.items() if k not in ("customer_id", "inquiry")}
+            self.answers.store("handle_inquiry", inquiry, answer, (time.perf_counter() - start) * 1000)
+        response["cache"] = {"hit": False}
         self.interaction_log.append(response)
         return response
 
@@ -64,24 +106,44 @@ class CustomerServiceEngagementAgent:
         self.interaction_log.append(engagement)
         return engagement
 
-    def engage_customer(self, *args, **kwargs):
+    def engage_customer(self, customer_id, engagement_type):
         """
         Engage with a customer.
+        :param customer_id: Unique identifier for the customer
+        :param engagement_type: Type of proactive engagement
+        :return: Structured engagement result
         """
-        # Logic to engage with a customer
-        pass
+        return self.proactive_engagement(customer_id, engagement_type)
 
-    def resolve_ticket(self, *args, **kwargs):
+    def resolve_ticket(self, customer_id, inquiry):
         """
         Resolve a customer ticket.
+        :param customer_id: Unique identifier for the customer
+        :param inquiry: The customer's inquiry or question
+        :return: Structured response
         """
-        # Logic to resolve a customer ticket
-        pass
+        return self.handle_inquiry(customer_id, inquiry)
 
-    def provide_info(self, *args, **kwargs):
+    def provide_info(self, customer_id, topic):
         """
-        Provide information to a customer.
+        Provide information to a customer from the knowledge base.
+        :param customer_id: Unique identifier for the customer
+        :param topic: What the customer wants to know about
+        :return: Structured response with the best answer and the matched passages
         """
-        # Logic to provide information to a customer
-        pass
-
+        if not customer_id or not topic:
+            raise ValueError("Both customer_id and topic are required")
+        kb = self._search(topic)
+        info = {
+            "customer_id": customer_id,
+            "topic": topic,
+            "answer": kb["passages"][0]["text"] if kb["answered"] else None,
+            "passages": kb["passages"],
+            "kb_version": kb["kb_version"],
+            "timing_ms": kb["timing_ms"],
+            "status": "answered" if kb["answered"] else "no_match"
+        }
+        if "error_message" in kb:
+            info["error_message"] = kb["error_message"]
+        self.interaction_log.append(info)
+        return info
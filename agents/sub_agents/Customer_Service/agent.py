@@ -1,23 +1,50 @@
 from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
-from google.adk.tools import FunctionTool
+from google.adk.tools import FunctionTool, ToolContext
 from agents.sub_agents.Customer_Service.Customer_Service_Engagement import CustomerServiceEngagementAgent
-from agents.sub_agents.Customer_Service.prompt import Customer_Service_Engagement
+from agents.sub_agents.Customer_Service.prompt import Customer_Service_Engagement, Customer_Service_Engagement_Description
 
-# Instantiate the CustomerServiceEngagementAgent
-customer_service_agent_instance = CustomerServiceEngagementAgent()
+from agents.tools.session_state import SessionTable
+
+# One CustomerServiceEngagementAgent per ADK session, so active sessions and logs stay per user
+customer_service_sessions = SessionTable(CustomerServiceEngagementAgent)
+
+# Session-scoped tool functions; they keep the tool names of the agent methods they call
+def engage_customer(customer_id: str, engagement_type: str, tool_context: ToolContext):
+    """
+    Engage with a customer.
+    :param customer_id: Unique identifier for the customer
+    :param engagement_type: Type of proactive engagement (e.g., 'follow-up')
+    """
+    return customer_service_sessions.for_context(tool_context).engage_customer(customer_id, engagement_type)
+
+def resolve_ticket(customer_id: str, inquiry: str, tool_context: ToolContext):
+    """
+    Resolve a customer ticket.
+    :param customer_id: Unique identifier for the customer
+    :param inquiry: The customer's inquiry or question
+    """
+    return customer_service_sessions.for_context(tool_context).resolve_ticket(customer_id, inquiry)
+
+def provide_info(customer_id: str, topic: str, tool_context: ToolContext):
+    """
+    Provide information to a customer.
+    :param customer_id: Unique identifier for the customer
+    :param topic: What the customer wants to know about
+    """
+    return customer_service_sessions.for_context(tool_context).provide_info(customer_id, topic)
 
 # Define tools using FunctionTool (not AgentTool)
 engage_customer_tool = FunctionTool(
-    func=customer_service_agent_instance.engage_customer
+    func=engage_customer
 )
 
 resolve_ticket_tool = FunctionTool(
-    func=customer_service_agent_instance.resolve_ticket
+    func=resolve_ticket
 )
 
 provide_info_tool = FunctionTool(
-    func=customer_service_agent_instance.provide_info
+    func=provide_info
 )
 
 # Define the Customer Service Agent
@@ -25,7 +52,7 @@ Customer_service_agent = Agent(
     model="gemini-2.0-flash",
     name="customer_service_agent",
     instruction=Customer_Service_Engagement,
-    description="Handles customer engagement, ticket resolution, and provides information.",
+    description=Customer_Service_Engagement_Description,
     tools=[
         engage_customer_tool,
         resolve_ticket_tool,
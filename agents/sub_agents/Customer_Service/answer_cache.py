@@ -0,0 +1,248 @@
+"""Answer cache for repeated and near-duplicate customer inquiries.
+
+An inquiry is reduced to the set of its normalized words and word pairs (the
+knowledge base's tokenizer: case, punctuation, stopwords and plurals folded), so
+"How do I reset my password?" and "how can i reset my password" are the same
+key. Other rephrasings are matched by Jaccard similarity of those sets: MinHash
+signatures split into LSH bands find candidates without comparing against every
+cached inquiry, and the best candidate at or above `threshold` is a hit.
+
+Entries are scoped per tool and per version of what they were derived from (the
+knowledge base): they are all dropped when that version changes. Answers that do
+not depend on who asked are shared by every user; those that do are stored and
+looked up with a `tenant`, and only reused for it. Entries expire after `ttl`
+seconds and are evicted least recently used beyond `maxsize`.
+"""
+
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, NamedTuple, Optional, Set, Tuple
+
+try:  # NumPy computes the MinHash signatures.
+    import numpy as np
+except ImportError:
+    np = None
+
+from agents.sub_agents.Customer_Service.knowledge_base import knowledge_base, tokenize
+from agents.tools.cache import normalize_query
+
+ANSWER_CACHE_SIZE = int(os.getenv("MYBOT_ANSWER_CACHE_SIZE", "10000"))
+ANSWER_CACHE_TTL = float(os.getenv("MYBOT_ANSWER_CACHE_TTL", "3600"))
+# Jaccard similarity of two inquiries' word sets at which one's answer is reused for the other.
+ANSWER_CACHE_THRESHOLD = float(os.getenv("MYBOT_ANSWER_CACHE_THRESHOLD", "0.7"))
+
+NUM_PERM = 64
+BANDS = 16  # of NUM_PERM // BANDS rows: candidates are likely from a similarity of about 0.5
+_PRIME = (1 << 31) - 1
+
+
+def shingles(text: str) -> FrozenSet[str]:
+    """Normalized words and adjacent word pairs of `text`."""
+    words = tokenize(text)
+    if not words:  # e.g. only stopwords: fall back to the normalized text
+        normalized = normalize_query(text)
+        return frozenset([normalized] if normalized else [])
+    return frozenset(words + [f"{a} {b}" for a, b in zip(words, words[1:])])
+
+
+class MinHasher:
+    """Signatures whose agreement estimates the Jaccard similarity of shingle sets."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+
+    def signature(self, items: FrozenSet[str]) -> "np.ndarray":
+        # (a * x + b) mod p with a, b, x below p = 2**31 - 1 stays below 2**63 in uint64.
+        x = np.fromiter((zlib.crc32(item.encode()) % _PRIME for item in items), dtype=np.uint64, count=len(items))
+        return ((self.a[:, None] * x[None, :] + self.b[:, None]) % np.uint64(_PRIME)).min(axis=1)
+
+
+class _Entry(NamedTuple):
+    scope: Tuple[str, Optional[str]]
+    text: str
+    shingles: FrozenSet[str]
+    bands: Tuple[bytes, ...]
+    value: Any
+    compute_ms: float
+    created: float
+    expires_at: Optional[float]
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class AnswerCache:
+    """Thread-safe near-duplicate cache of answers, keyed by inquiry text."""
+
+    def __init__(
+        self,
+        maxsize: int = ANSWER_CACHE_SIZE,
+        ttl: Optional[float] = ANSWER_CACHE_TTL,
+        threshold: float = ANSWER_CACHE_THRESHOLD,
+        version: Optional[Callable[[], Any]] = None,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self._version_of = version
+        self._version = None  # read on first use, not at import
+        self._hasher = MinHasher() if np is not None else None
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._exact: Dict[Tuple[Tuple[str, Optional[str]], FrozenSet[str]], int] = {}
+        self._buckets: Dict[Tuple[Tuple[str, Optional[str]], int, bytes], Set[int]] = {}
+        self._next_id = 0
+        self._lock = threading.RLock()
+        self._counts = {
+            "lookups": 0, "hits": 0, "exact_hits": 0, "near_hits": 0, "misses": 0,
+            "stores": 0, "evictions": 0, "expirations": 0, "invalidations": 0,
+        }
+        self._compute_ms_saved = 0.0
+        self._lookup_ms = 0.0
+
+    def _bands(self, items: FrozenSet[str]) -> Tuple[bytes, ...]:
+        if self._hasher is None or not items:
+            return ()
+        signature = self._hasher.signature(items)
+        return tuple(band.tobytes() for band in np.split(signature, BANDS))
+
+    def _check_version(self):
+        if self._version_of is None:
+            return
+        version = self._version_of()
+        if version != self._version:
+            self._version = version
+            if self._entries:
+                self._counts["invalidations"] += 1
+            self._clear()
+
+    def _clear(self):
+        self._entries.clear()
+        self._exact.clear()
+        self._buckets.clear()
+
+    def _drop(self, entry_id: int):
+        entry = self._entries.pop(entry_id)
+        self._exact.pop((entry.scope, entry.shingles), None)
+        for i, band in enumerate(entry.bands):
+            bucket = self._buckets.get((entry.scope, i, band))
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[(entry.scope, i, band)]
+
+    def _live(self, entry_id: int, now: float) -> Optional[_Entry]:
+        entry = self._entries.get(entry_id)
+        if entry is not None and entry.expires_at is not None and entry.expires_at <= now:
+            self._drop(entry_id)
+            self._counts["expirations"] += 1
+            return None
+        return entry
+
+    def lookup(self, tool: str, text: str, tenant: Optional[str] = None) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """Returns the cached answer for `text` or a near-duplicate of it, with how it matched.
+
+        Without `tenant`, only answers stored without one (shared by every user) are found.
+        """
+        start = time.perf_counter()
+        scope = (tool, tenant)
+        items = shingles(text)
+        with self._lock:
+            self._check_version()
+            self._counts["lookups"] += 1
+            now = time.time()
+            best, similarity, match = None, 0.0, "exact"
+            entry_id = self._exact.get((scope, items))
+            if entry_id is not None and self._live(entry_id, now) is not None:
+                best, similarity = entry_id, 1.0
+            else:
+                match = "near"
+                candidates = set()
+                for i, band in enumerate(self._bands(items)):
+                    candidates |= self._buckets.get((scope, i, band), set())
+                for candidate in candidates:
+                    entry = self._live(candidate, now)
+                    if entry is None:
+                        continue
+                    score = jaccard(items, entry.shingles)
+                    if score >= self.threshold and score > similarity:
+                        best, similarity = candidate, score
+            elapsed = (time.perf_counter() - start) * 1000
+            self._lookup_ms += elapsed
+            if best is None:
+                self._counts["misses"] += 1
+                return None
+            entry = self._entries[best]
+            self._entries.move_to_end(best)
+            saved = max(entry.compute_ms - elapsed, 0.0)
+            self._counts["hits"] += 1
+            self._counts[f"{match}_hits"] += 1
+            self._compute_ms_saved += saved
+            return entry.value, {
+                "hit": True,
+                "match": match,
+                "similarity": round(similarity, 4),
+                "matched_inquiry": entry.text,
+                "age_seconds": round(now - entry.created, 1),
+                "compute_ms_saved": round(saved, 2),
+            }
+
+    def store(self, tool: str, text: str, value: Any, compute_ms: float = 0.0, tenant: Optional[str] = None):
+        """Caches `value` as the answer to `text`.
+
+        `compute_ms` is the time computing it took, which a hit reports as saved. Pass
+        `tenant` only for answers that depend on the user; others are shared.
+        """
+        scope = (tool, tenant)
+        items = shingles(text)
+        bands = self._bands(items)
+        with self._lock:
+            self._check_version()
+            previous = self._exact.get((scope, items))
+            if previous is not None and previous in self._entries:
+                self._drop(previous)
+            entry_id, self._next_id = self._next_id, self._next_id + 1
+            now = time.time()
+            expires_at = now + self.ttl if self.ttl is not None else None
+            self._entries[entry_id] = _Entry(scope, text, items, bands, value, compute_ms, now, expires_at)
+            self._exact[(scope, items)] = entry_id
+            for i, band in enumerate(bands):
+                self._buckets.setdefault((scope, i, band), set()).add(entry_id)
+            self._counts["stores"] += 1
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+                self._counts["evictions"] += 1
+
+    def invalidate(self, tenant: Optional[str] = None):
+        """Drops every entry, or only those stored for `tenant`."""
+        with self._lock:
+            if tenant is None:
+                self._clear()
+            else:
+                for entry_id in [i for i, e in self._entries.items() if e.scope[1] == tenant]:
+                    self._drop(entry_id)
+            self._counts["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters, the hit rate and the compute time the hits skipped."""
+        with self._lock:
+            lookups = self._counts["lookups"]
+            return {
+                **self._counts,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self._counts["hits"] / lookups if lookups else 0.0,
+                "compute_ms_saved": round(self._compute_ms_saved, 2),
+                "avg_lookup_ms": round(self._lookup_ms / lookups, 4) if lookups else 0.0,
+                "version": self._version,
+            }
+
+
+answer_cache = AnswerCache(version=knowledge_base.current_version)
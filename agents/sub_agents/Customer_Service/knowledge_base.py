@@ -0,0 +1,572 @@
+"""Local FAQ / knowledge-base search over Markdown and JSON documents.
+
+Documents under `KB_DIR` are split into passages (Markdown sections, JSON FAQ
+entries) and indexed in an inverted index ranked with BM25. Postings are
+append-only NumPy-compatible arrays, so a query touches only the postings of its
+own terms and answers in milliseconds even over 100k passages.
+
+The index follows the directory: each file is fingerprinted (mtime, size) and,
+at most every `KB_REFRESH_SECONDS`, only changed, added or removed files are
+re-read. Passages of a changed file are tombstoned and the postings compacted
+once a quarter of them are dead. `version` counts those changes, so answers
+derived from the knowledge base can be invalidated when it moves.
+
+Setting `KB_VECTOR_PATH` adds a vector index: passage embeddings live in a
+memory-mapped float32 file keyed by a hash of the passage text, so a restart or
+refresh embeds only new text. When BM25 finds no confident match, the vector
+ranking is fused with BM25's by reciprocal rank. The default embedder hashes words and their character trigrams, which
+tolerates typos and inflections; pass `embed=` for a learned model.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from array import array
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+try:  # NumPy scores the postings.
+    import numpy as np
+except ImportError:
+    np = None
+
+KB_DIR = os.getenv("MYBOT_KB_DIR")
+KB_VECTOR_PATH = os.getenv("MYBOT_KB_VECTOR_PATH")
+KB_REFRESH_SECONDS = float(os.getenv("MYBOT_KB_REFRESH_SECONDS", "2"))
+KB_TOP_K = int(os.getenv("MYBOT_KB_TOP_K", "3"))
+# Match confidence (see `KnowledgeBase.search`) that counts as an answer.
+KB_MIN_CONFIDENCE = float(os.getenv("MYBOT_KB_MIN_CONFIDENCE", "0.55"))
+# Cosine similarity that counts as an answer without a confident word match. The default
+# hashed embedder reaches 0.8 on unrelated questions; calibrate again for a learned `embed`.
+KB_MIN_SIMILARITY = float(os.getenv("MYBOT_KB_MIN_SIMILARITY", "0.85"))
+# Query words a passage must contain to answer it: one shared word is a topic, not an answer.
+KB_MIN_MATCHED_TERMS = int(os.getenv("MYBOT_KB_MIN_MATCHED_TERMS", "2"))
+# Share of the highest possible idf that a query word missing from the index weighs in the
+# confidence. Words with digits (order numbers, codes) are details and weigh nothing.
+UNKNOWN_TERM_WEIGHT = 0.5
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+EMBEDDING_DIM = 256
+# Word occurrences embedded per block, bounding the temporary arrays.
+EMBED_BLOCK = 1 << 18
+# Candidates taken from each ranking before fusing them.
+FUSION_CANDIDATES = 50
+RRF_K = 60
+MAX_PASSAGE_CHARS = 1200
+# Dead passages, as a share of all, that trigger rebuilding the postings.
+COMPACT_RATIO = 0.25
+
+EXTENSIONS = (".md", ".markdown", ".json", ".jsonl")
+
+_TOKEN = re.compile(r"\w+")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how i if in is it me my of on or our so that the this "
+    "to was we what when where which who why will with you your hi hello please thank thanks".split()
+)
+# Words already mapped to their index term (or "" for stopwords).
+_TERMS: Dict[str, str] = {}
+MAX_CACHED_TERMS = 1 << 20
+# JSON fields holding an entry's title and text, in order of preference.
+_TITLE_FIELDS = ("question", "title", "q", "name")
+_TEXT_FIELDS = ("answer", "text", "body", "content", "a")
+
+
+class KnowledgeBaseError(Exception):
+    """Raised when the knowledge base cannot be searched."""
+
+
+class Passage(NamedTuple):
+    source: str  # file path relative to the knowledge-base directory
+    title: str
+    text: str
+
+
+def _term(word: str) -> str:
+    if word in _STOPWORDS:
+        return ""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Case-folded words without stopwords, with plurals folded ("countries" -> "country")."""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKC", text)
+    terms = _TERMS
+    if len(terms) > MAX_CACHED_TERMS:
+        terms.clear()
+    tokens = []
+    for word in _TOKEN.findall(text.casefold()):
+        term = terms.get(word)
+        if term is None:
+            term = terms[word] = _term(word)
+        if term:
+            tokens.append(term)
+    return tokens
+
+
+def markdown_passages(source: str, text: str) -> Iterator[Passage]:
+    """One passage per section; its title is the path of headings above it."""
+    headings: List[str] = []
+    body: List[str] = []
+
+    def flush():
+        content = "\n".join(body).strip()
+        if content:
+            yield Passage(source, " > ".join(headings) or os.path.splitext(os.path.basename(source))[0], content)
+
+    in_fence = False
+    for line in text.splitlines():
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        match = None if in_fence else _HEADING.match(line)
+        if match:
+            yield from flush()
+            body = []
+            level = len(match.group(1))
+            headings = headings[: level - 1] + [match.group(2)]
+        else:
+            body.append(line)
+    yield from flush()
+
+
+def _entry_passage(source: str, entry: Any) -> Optional[Passage]:
+    if isinstance(entry, str):
+        return Passage(source, "", entry) if entry.strip() else None
+    if not isinstance(entry, dict):
+        return None
+    title = next((str(entry[f]) for f in _TITLE_FIELDS if entry.get(f)), "")
+    text = next((str(entry[f]) for f in _TEXT_FIELDS if entry.get(f)), "")
+    return Passage(source, title, text) if title or text else None
+
+
+def json_passages(source: str, text: str, lines: bool = False) -> Iterator[Passage]:
+    """One passage per FAQ entry: a list of entries, {"faqs"/"entries"/...: [...]}, one object, or JSONL."""
+    if lines:
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        data = json.loads(text)
+        if isinstance(data, dict):
+            lists = [v for v in data.values() if isinstance(v, list)]
+            entries = lists[0] if len(lists) == 1 and _entry_passage(source, data) is None else [data]
+        else:
+            entries = data if isinstance(data, list) else [data]
+    for entry in entries:
+        passage = _entry_passage(source, entry)
+        if passage is not None:
+            yield passage
+
+
+def read_passages(root: str, source: str) -> List[Passage]:
+    with open(os.path.join(root, source), encoding="utf-8") as f:
+        text = f.read()
+    ext = os.path.splitext(source)[1].lower()
+    if ext in (".md", ".markdown"):
+        return list(markdown_passages(source, text))
+    return list(json_passages(source, text, lines=ext == ".jsonl"))
+
+
+def _word_features(words: List[str], dim: int) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Hashed features of each word and its character trigrams, as CSR arrays (offsets, features, signs)."""
+    offsets, features, signs = [0], [], []
+    for word in words:
+        padded = f"<{word}>"
+        for gram in [word] + [padded[i:i + 3] for i in range(len(padded) - 2)]:
+            h = zlib.crc32(gram.encode())
+            features.append(h % dim)
+            signs.append(-1.0 if h >> 31 else 1.0)
+        offsets.append(len(features))
+    return np.array(offsets, dtype=np.int64), np.array(features, dtype=np.int64), np.array(signs)
+
+
+def hashed_embedding(texts: List[str], dim: int = EMBEDDING_DIM) -> "np.ndarray":
+    """L2-normalized sum of the hashed features of the words of each text."""
+    vocabulary: Dict[str, int] = {}
+    words, docs = array("i"), array("i")
+    for row, text in enumerate(texts):
+        ids = [vocabulary.setdefault(word, len(vocabulary)) for word in tokenize(text)]
+        words.extend(ids)
+        docs.extend([row] * len(ids))
+    offsets, features, signs = _word_features(list(vocabulary), dim)
+    words, docs = np.frombuffer(words, dtype=np.int32), np.frombuffer(docs, dtype=np.int32)
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    # Expand every word occurrence into its features and add them up with one bincount per block.
+    for start in range(0, len(words), EMBED_BLOCK):
+        block_words, block_docs = words[start:start + EMBED_BLOCK], docs[start:start + EMBED_BLOCK]
+        counts = offsets[block_words + 1] - offsets[block_words]
+        ends = np.cumsum(counts)
+        positions = np.repeat(offsets[block_words] - (ends - counts), counts) + np.arange(ends[-1])
+        first, last = int(block_docs[0]), int(block_docs[-1])
+        cells = (np.repeat(block_docs, counts) - first) * dim + features[positions]
+        sums = np.bincount(cells, weights=signs[positions], minlength=(last - first + 1) * dim)
+        out[first:last + 1] += sums.reshape(-1, dim)
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    return out / np.where(norms > 0, norms, 1.0)
+
+
+class VectorStore:
+    """Embeddings in a memory-mapped float32 file, one row per distinct passage text.
+
+    A sidecar file `<path>.keys` lists the text hash of every row, so embeddings
+    survive restarts and are computed once per text.
+    """
+
+    def __init__(self, path: str, embed: Callable[[List[str]], "np.ndarray"] = hashed_embedding, dim: int = EMBEDDING_DIM):
+        self.path, self.embed, self.dim = path, embed, dim
+        self._keys_path = path + ".keys"
+        self.rows: Dict[str, int] = {}
+        if os.path.exists(self._keys_path) and os.path.exists(path):
+            with open(self._keys_path, encoding="ascii") as f:
+                for row, key in enumerate(f.read().split()):
+                    self.rows[key] = row
+        if not os.path.exists(path) or len(self.rows) > os.path.getsize(path) // (4 * dim):
+            # Missing or inconsistent files (e.g. a different dimension): start over.
+            self.rows = {}
+            open(path, "wb").close()
+            open(self._keys_path, "w").close()
+        self._mmap = None
+        self._open()
+
+    def _open(self):
+        capacity = os.path.getsize(self.path) // (4 * self.dim)
+        if capacity:
+            self._mmap = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def add(self, texts: List[str]) -> "np.ndarray":
+        """Returns the row of each text's embedding, embedding only texts not stored yet."""
+        keys = [hashlib.sha1(text.encode()).hexdigest() for text in texts]
+        missing = list(dict.fromkeys(key for key in keys if key not in self.rows))
+        if missing:
+            by_key = dict(zip(keys, texts))
+            vectors = np.asarray(self.embed([by_key[key] for key in missing]), dtype=np.float32)
+            start, end = len(self.rows), len(self.rows) + len(missing)
+            capacity = 0 if self._mmap is None else self._mmap.shape[0]
+            if end > capacity:
+                # Grow geometrically, so appends are amortized.
+                if self._mmap is not None:
+                    self._mmap.flush()
+                    self._mmap = None
+                with open(self.path, "r+b") as f:
+                    f.truncate(max(end, 2 * capacity, 1024) * 4 * self.dim)
+                self._open()
+            self._mmap[start:end] = vectors
+            self._mmap.flush()
+            with open(self._keys_path, "a", encoding="ascii") as f:
+                f.write("".join(key + "\n" for key in missing))
+            for offset, key in enumerate(missing):
+                self.rows[key] = start + offset
+        return np.array([self.rows[key] for key in keys], dtype=np.int64)
+
+    def similarities(self, text: str) -> "np.ndarray":
+        """Cosine similarity of `text` to every stored row."""
+        if self._mmap is None or not self.rows:
+            return np.zeros(0, dtype=np.float32)
+        query = np.asarray(self.embed([text]), dtype=np.float32)[0]
+        return self._mmap[: len(self.rows)] @ query
+
+
+class _File(NamedTuple):
+    mtime_ns: int
+    size: int
+    slots: List[int]
+
+
+class KnowledgeBase:
+    """BM25 (optionally hybrid) search over the passages of a document directory."""
+
+    def __init__(
+        self,
+        root: Optional[str] = KB_DIR,
+        vector_path: Optional[str] = KB_VECTOR_PATH,
+        refresh_seconds: float = KB_REFRESH_SECONDS,
+        embed: Optional[Callable[[List[str]], "np.ndarray"]] = None,
+    ):
+        self.root = root
+        self.vector_path = vector_path
+        self.refresh_seconds = refresh_seconds
+        self._embed = embed
+        self.version = 0
+        self._lock = threading.RLock()
+        self._checked = None  # monotonic time of the last directory scan
+        self._reset()
+        self._vectors: Optional[VectorStore] = None
+        self._stats = {"refreshes": 0, "files_read": 0, "compactions": 0, "searches": 0}
+
+    def _reset(self):
+        self._files: Dict[str, _File] = {}
+        self._passages: List[Optional[Passage]] = []  # slot -> passage, None once deleted
+        self._lengths = array("f")
+        self._alive = array("b")
+        self._vector_rows = array("q")
+        self._postings: Dict[str, Tuple[array, array]] = {}  # term -> (slots, term frequencies)
+        self._df: Counter = Counter()  # live passages per term
+        self._live = 0
+        self._total_length = 0.0
+
+    # -- indexing -------------------------------------------------------------
+
+    def _add(self, passages: List[Passage]) -> List[int]:
+        slots = []
+        rows = self._vectors.add([f"{p.title}\n{p.text}" for p in passages]) if self._vectors and passages else ()
+        for i, passage in enumerate(passages):
+            slot = len(self._passages)
+            # Titles count twice: they say what the passage answers.
+            terms = Counter(tokenize(passage.title) * 2 + tokenize(passage.text))
+            for term, tf in terms.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array("i"), array("f"))
+                postings[0].append(slot)
+                postings[1].append(tf)
+            self._df.update(terms.keys())
+            length = float(sum(terms.values()))
+            self._passages.append(passage)
+            self._lengths.append(length)
+            self._alive.append(1)
+            self._vector_rows.append(int(rows[i]) if len(rows) else -1)
+            self._live += 1
+            self._total_length += length
+            slots.append(slot)
+        return slots
+
+    def _remove(self, slots: List[int]):
+        for slot in slots:
+            passage = self._passages[slot]
+            self._df.subtract(set(tokenize(passage.title) + tokenize(passage.text)))
+            self._passages[slot] = None
+            self._alive[slot] = 0
+            self._live -= 1
+            self._total_length -= self._lengths[slot]
+        dead = len(self._passages) - self._live
+        if dead > COMPACT_RATIO * len(self._passages):
+            self._compact()
+
+    def _compact(self):
+        files = [(source, f, [self._passages[slot] for slot in f.slots]) for source, f in self._files.items()]
+        self._reset()
+        for source, f, passages in files:
+            self._files[source] = _File(f.mtime_ns, f.size, self._add(passages))
+        self._stats["compactions"] += 1
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        found = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for name in filenames:
+                if name.lower().endswith(EXTENSIONS) and not name.startswith("."):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    found[os.path.relpath(path, self.root)] = (st.st_mtime_ns, st.st_size)
+        return found
+
+    def refresh(self, force: bool = False) -> Dict[str, Any]:
+        """Re-reads the files that changed since the last scan; returns what changed.
+
+        Skipped when the last scan is younger than `refresh_seconds`, unless `force`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._checked is not None and now - self._checked < self.refresh_seconds:
+                return {"checked": False}
+            self._checked = now
+            if not self.root or not os.path.isdir(self.root):
+                return {"checked": True, "changed": 0}
+            if self.vector_path and self._vectors is None and np is not None:
+                self._vectors = VectorStore(self.vector_path, **({"embed": self._embed} if self._embed else {}))
+            found = self._scan()
+            changed, errors = [], {}
+            for source in [s for s in self._files if s not in found]:
+                self._remove(self._files.pop(source).slots)
+                changed.append(source)
+            for source, (mtime_ns, size) in found.items():
+                known = self._files.get(source)
+                if known is not None and (known.mtime_ns, known.size) == (mtime_ns, size):
+                    continue
+                try:
+                    passages = read_passages(self.root, source)
+                except (OSError, UnicodeDecodeError, ValueError) as e:
+                    errors[source] = f"{type(e).__name__}: {e}"
+                    passages = []
+                if known is not None:
+                    self._remove(self._files.pop(source).slots)
+                self._files[source] = _File(mtime_ns, size, self._add(passages))
+                self._stats["files_read"] += 1
+                changed.append(source)
+            if changed:
+                self.version += 1
+            self._stats["refreshes"] += 1
+            return {"checked": True, "changed": len(changed), "errors": errors, "version": self.version}
+
+    def current_version(self) -> int:
+        """Picks up changed files (at most every `refresh_seconds`) and returns the version."""
+        self.refresh()
+        return self.version
+
+    # -- search ---------------------------------------------------------------
+
+    def _bm25(self, terms: List[str]) -> Tuple["np.ndarray", float]:
+        """BM25 score of every slot, and the score that means a full match.
+
+        A term occurring once in a passage of average length scores its idf, so a full
+        match scores the sum of the indexed terms' idfs. Terms missing from the index
+        add UNKNOWN_TERM_WEIGHT of the highest idf to it: the passages cannot contain
+        what the query also asks about.
+        """
+        n = len(self._passages)
+        scores = np.zeros(n, dtype=np.float32)
+        lengths = np.frombuffer(self._lengths, dtype=np.float32, count=n)
+        avgdl = self._total_length / self._live if self._live else 1.0
+        full = 0.0
+        for term in set(terms):
+            postings = self._postings.get(term)
+            df = self._df.get(term, 0)
+            idf = float(np.log1p((self._live - df + 0.5) / (df + 0.5)))
+            if postings is None or df <= 0:
+                if not any(c.isdigit() for c in term):
+                    full += UNKNOWN_TERM_WEIGHT * idf
+                continue
+            full += idf
+            slots = np.frombuffer(postings[0], dtype=np.int32)
+            tf = np.frombuffer(postings[1], dtype=np.float32)
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[slots] / avgdl)
+            scores[slots] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores, full
+
+    def _matched(self, terms: List[str], slots: List[int]) -> Dict[int, int]:
+        """Number of distinct query terms each of `slots` contains."""
+        candidates = np.array(slots, dtype=np.int32)
+        counts = np.zeros(len(candidates), dtype=np.int64)
+        for term in set(terms):
+            postings = self._postings.get(term)
+            if postings is None or not len(postings[0]):
+                continue
+            # Slots are appended in increasing order, so postings are sorted.
+            posted = np.frombuffer(postings[0], dtype=np.int32)
+            at = np.minimum(np.searchsorted(posted, candidates), len(posted) - 1)
+            counts += posted[at] == candidates
+        return dict(zip(slots, counts.tolist()))
+
+    def search(self, query: str, k: int = KB_TOP_K) -> Dict[str, Any]:
+        """Returns the `k` best passages for `query`, each with its score and confidence.
+
+        A passage's confidence is its BM25 score as a share of a full match (see
+        `_bm25`), capped at 1; `matched_terms` counts the query words it contains.
+        The query is `answered` when the best passage reaches KB_MIN_CONFIDENCE on at
+        least KB_MIN_MATCHED_TERMS words, or its vector similarity reaches
+        KB_MIN_SIMILARITY.
+
+        Raises:
+            KnowledgeBaseError: if NumPy is not installed.
+        """
+        if np is None:
+            raise KnowledgeBaseError("Knowledge-base search needs NumPy; install it with `pip install numpy`")
+        start = time.perf_counter()
+        refresh = self.refresh()
+        with self._lock:
+            self._stats["searches"] += 1
+            terms = tokenize(query)
+            n = len(self._passages)
+            if not n or not terms:
+                return self._result(query, [], start, refresh)
+            scores, full = self._bm25(terms)
+            alive = np.frombuffer(self._alive, dtype=np.int8, count=n).astype(bool) if self._live < n else None
+            if alive is not None:
+                scores[~alive] = 0
+            ranked, similarity = _top(scores, k), None
+            answers = bool(ranked) and _answers(
+                _confidence(scores[ranked[0]], full), self._matched(terms, ranked[:1])[ranked[0]], None
+            )
+            if self._vectors is not None and not answers:
+                # Only when the words alone find no answer: the vectors add recall, BM25 keeps precision.
+                rows = np.frombuffer(self._vector_rows, dtype=np.int64, count=n)
+                similarity = self._vectors.similarities(query)[rows]
+                if alive is not None:
+                    similarity[~alive] = 0
+                ranked = self._fuse(scores, similarity, k)
+            matched = self._matched(terms, ranked)
+            hits = []
+            for slot in ranked:
+                if scores[slot] <= 0 and (similarity is None or similarity[slot] <= 0):
+                    continue
+                passage = self._passages[slot]
+                hit = {
+                    "id": f"{passage.source}#{slot}",
+                    "source": passage.source,
+                    "title": passage.title,
+                    "text": passage.text[:MAX_PASSAGE_CHARS],
+                    "score": round(float(scores[slot]), 4),
+                    "confidence": round(_confidence(scores[slot], full), 4),
+                    "matched_terms": int(matched[slot]),
+                }
+                if similarity is not None:
+                    hit["similarity"] = round(float(similarity[slot]), 4)
+                hits.append(hit)
+            return self._result(query, hits, start, refresh)
+
+    def _fuse(self, scores: "np.ndarray", similarity: "np.ndarray", k: int) -> List[int]:
+        fused: Dict[int, float] = {}
+        for ranking_scores in (scores, similarity):
+            ranking = [slot for slot in _top(ranking_scores, FUSION_CANDIDATES) if ranking_scores[slot] > 0]
+            for rank, slot in enumerate(ranking):
+                fused[slot] = fused.get(slot, 0.0) + 1.0 / (RRF_K + rank + 1)
+        return sorted(fused, key=fused.get, reverse=True)[:k]
+
+    def _result(self, query: str, hits: List[Dict[str, Any]], start: float, refresh: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "query": query,
+            "passages": hits,
+            "answered": bool(hits) and _answers(hits[0]["confidence"], hits[0]["matched_terms"], hits[0].get("similarity")),
+            "kb_version": self.version,
+            "timing_ms": round((time.perf_counter() - start) * 1000, 2),
+            "refresh": refresh,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "root": self.root,
+                "version": self.version,
+                "files": len(self._files),
+                "passages": self._live,
+                "dead_passages": len(self._passages) - self._live,
+                "terms": len(self._postings),
+                "vectors": None if self._vectors is None else len(self._vectors.rows),
+            }
+
+
+def _confidence(score: float, full: float) -> float:
+    return min(float(score) / full, 1.0) if full > 0 else float(score)
+
+
+def _answers(confidence: float, matched: int, similarity: Optional[float]) -> bool:
+    """Whether a passage answers the query: a confident match on enough of its words, or
+    (with vectors) a similar enough meaning."""
+    if similarity is not None and similarity >= KB_MIN_SIMILARITY:
+        return True
+    return confidence >= KB_MIN_CONFIDENCE and matched >= KB_MIN_MATCHED_TERMS
+
+
+def _top(scores: "np.ndarray", k: int) -> List[int]:
+    """Indexes of the `k` highest scores, best first."""
+    if len(scores) > k:
+        candidates = np.argpartition(scores, -k)[-k:]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")].tolist()
+
+
+knowledge_base = KnowledgeBase()
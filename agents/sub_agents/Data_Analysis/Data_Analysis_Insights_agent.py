@@ -1,38 +1,88 @@
+import time
+
+from agents.sub_agents.Data_Analysis.analytics import analytics_engine
+from agents.sub_agents.Data_Analysis.approx import Unsupported, approximate_query
+from agents.sub_agents.Data_Analysis.findings import FORMATS, findings_presenter
+from agents.sub_agents.Data_Analysis.sql import QueryError, SQLEngine
+from agents.tools.log_store import SESSION_LOG_CAPACITY, LogStore
+
+
 class DataAnalysisInsightsAgent:
     def __init__(self):
         # Initialize resources, logs, or configurations as needed
-        self.analysis_log = []
-        self.insights = []
+        # One agent per session, so its logs are kept short
+        self.analysis_log = LogStore("analysis_log", capacity=SESSION_LOG_CAPACITY)
+        self.insights = LogStore("insights", capacity=SESSION_LOG_CAPACITY)
+        self.engine = analytics_engine
+        # Sources analyzed in this session: path -> format, aggregate and scan metrics
+        self.datasets = {}
+        self.sql = SQLEngine()
+        self.presenter = findings_presenter
+
+    def close(self):
+        """
+        Release the session's DuckDB connection; it is reopened if the agent is used again.
+        """
+        self.sql.close()
 
     def analyze_data(self, data_sources):
         """
-        Autonomously analyze data from various sources with validation and simulated analytics.
-        :param data_sources: List of data sources (e.g., file paths, database URIs)
-        :return: Structured analysis summary
+        Analyze local CSV, JSONL and Parquet files: per-column statistics, trends and correlations.
+        Files are read in chunks, so memory stays bounded, and several sources are analyzed in parallel.
+        Files unchanged since an earlier analysis are not read again, and for CSV/JSONL files that were
+        only appended to, just the new rows are read.
+        :param data_sources: List of data sources (local file paths or file:// URIs)
+        :return: Structured analysis summary with the rows (total and scanned now) and time taken per source
         """
         if not data_sources or not isinstance(data_sources, list):
             raise ValueError("data_sources must be a non-empty list")
-        # Simulate advanced analytics
+        start = time.perf_counter()
+        results = []
+        for scan in self.engine.analyze([str(source) for source in data_sources]):
+            aggregate = scan.pop("aggregate", None)
+            scan.pop("header", None)
+            if aggregate is not None:
+                fp = scan.pop("fingerprint")
+                scan["sha256"] = fp.sha256
+                scan["table"] = self.sql.register(scan["path"], scan["format"])
+                self.datasets[scan["path"]] = {**scan, "aggregate": aggregate, "analysis_id": fp.sha256}
+                scan.update(aggregate.summary())
+            results.append(scan)
+        succeeded = sum(1 for scan in results if scan["status"] == "success")
+        rows = sum(scan.get("rows", 0) for scan in results)
         summary = {
             "sources_analyzed": data_sources,
-            "status": "completed",
-            "analysis": f"Performed statistical and trend analysis on {len(data_sources)} sources.",
-            "message": "Data analysis completed successfully."
+            "status": "completed" if succeeded == len(results) else "partial" if succeeded else "failed",
+            "analysis": f"Performed statistical and trend analysis on {succeeded} of {len(results)} sources ({rows} rows).",
+            "rows": rows,
+            "rows_scanned": sum(scan.get("rows_scanned", 0) for scan in results),
+            "seconds": round(time.perf_counter() - start, 4),
+            "results": results,
+            "message": "Data analysis completed successfully." if succeeded == len(results)
+            else "Some data sources could not be analyzed; see each result's error_message.",
         }
         self.analysis_log.append(summary)
         return summary
 
-    def derive_insights(self, query, use_bigquery=False):
+    def derive_insights(self, query, use_bigquery=False, limit=None, approximate=False):
         """
-        Derive meaningful insights using tools like BigQuery, with input validation.
-        :param query: Query or analysis request
+        Derive insights by running a read-only SQL query over the sources registered by analyze_data.
+        Each analyzed file is a table named after it (e.g. sales.csv -> sales); filters and column
+        selections are pushed down into the file scan and rows are streamed up to the limit.
+        With approximate=True, aggregate queries over one table are answered from the sketches and row
+        sample analyze_data kept, without reading the file, and each estimate comes with a 95% interval.
+        Queries the sketches cannot answer run exactly, and say why in 'approximation'.
+        :param query: SQL query (SELECT, WITH, DESCRIBE, SUMMARIZE or EXPLAIN)
         :param use_bigquery: Whether to use BigQuery for analysis
-        :return: Structured insights result
+        :param limit: Maximum number of rows to return
+        :param approximate: Whether to answer from the sketches instead of the files
+        :return: Structured insights result with the rows, whether they were truncated, timings, the mode
+            ('exact' or 'approximate') and error_bounds (None for exact answers)
         """
         if not query or not isinstance(query, str):
             raise ValueError("A valid query string is required")
-        # Simulate insight derivation
         if use_bigquery:
+            # Simulate insight derivation
             result = {
                 "method": "BigQuery",
                 "query": query,
@@ -40,31 +90,69 @@ class DataAnalysisInsightsAgent:
                 "status": "success"
             }
         else:
-            result = {
-                "method": "internal",
-                "query": query,
-                "insight": f"Internal analysis result for '{query}'.",
-                "status": "success"
-            }
+            rows, method, note = None, "duckdb", None
+            try:
+                if approximate:
+                    tables = {entry["table"]: entry["aggregate"] for entry in self.datasets.values()}
+                    try:
+                        rows, method = approximate_query(query, tables, limit), "sketches"
+                    except Unsupported as e:
+                        note = f"Answered exactly: {e}"
+                if rows is None:
+                    rows = {**self.sql.query(query, limit), "error_bounds": None}
+            except QueryError as e:
+                result = {
+                    "method": method,
+                    "query": query,
+                    "status": "error",
+                    "error_message": str(e),
+                }
+                try:
+                    result["tables"] = self.sql.tables()
+                except QueryError:
+                    pass
+            else:
+                more = " (more rows matched; raise the limit or aggregate)" if rows["truncated"] else ""
+                estimated = " (estimated; see error_bounds)" if method == "sketches" else ""
+                result = {
+                    "method": method,
+                    "mode": "approximate" if method == "sketches" else "exact",
+                    "query": query,
+                    **rows,
+                    "insight": f"Query returned {rows['row_count']} rows in {rows['timing_ms']['total']} ms{estimated}{more}.",
+                    "status": "success"
+                }
+                if note:
+                    result["approximation"] = note
         self.insights.append(result)
         return result
 
     def present_findings(self, audience, format="summary"):
         """
         Collaboratively present findings to an audience with structured output.
+        Findings are built from the aggregates analyze_data stored, without rescanning the sources,
+        and are reused across audiences; the 'visual' format adds chart images (PNG paths).
         :param audience: Target audience for the findings
-        :param format: Presentation format (e.g., 'summary', 'detailed', 'visual')
+        :param format: Presentation format ('summary', 'detailed' or 'visual'; others fall back to 'summary')
         :return: Structured presentation output
         """
         if not audience:
             raise ValueError("Audience must be specified")
-        content = self.insights[-1] if self.insights else "No insights available"
+        if format not in FORMATS:
+            format = "summary"
+        latest = self.insights[-1] if self.insights else None
+        if self.datasets:
+            content, cache = self.presenter.present(self.datasets, format)
+        else:
+            content, cache = latest or "No insights available", None
         findings = {
             "audience": audience,
             "format": format,
             "content": content,
+            "latest_insight": latest,
             "presentation": f"Findings presented to {audience} in {format} format.",
             "status": "delivered"
         }
+        if cache is not None:
+            findings["cache"] = cache
         return findings
-
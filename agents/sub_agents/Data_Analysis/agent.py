@@ -1,26 +1,37 @@
 from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
-from google.adk.tools import FunctionTool
+from google.adk.tools import FunctionTool, ToolContext
 from agents.sub_agents.Data_Analysis.Data_Analysis_Insights_agent import DataAnalysisInsightsAgent
-from agents.sub_agents.Data_Analysis.prompt import Data_Analysis_Insights_agent
+from agents.sub_agents.Data_Analysis.prompt import Data_Analysis_Insights_agent, Data_Analysis_Insights_Description
+from agents.tools.session_state import SessionTable
 
-# Instantiate the DataAnalysisInsightsAgent
-data_analysis_agent_instance = DataAnalysisInsightsAgent()
+# One DataAnalysisInsightsAgent per ADK session, so findings never leak between users;
+# evicted and idle sessions close their DuckDB connection
+data_analysis_sessions = SessionTable(DataAnalysisInsightsAgent, on_evict=DataAnalysisInsightsAgent.close)
 
 # Wrapper for analyze_data to simplify the function signature for automatic function calling
-def analyze_data_wrapper(data_sources: list[str]):
+def analyze_data_wrapper(data_sources: list[str], tool_context: ToolContext):
     """
-    :param data_sources: List of data source identifiers (e.g., file paths, database URIs)
+    :param data_sources: List of CSV, JSONL or Parquet file paths (or file:// URIs) in the data directory, relative to it or absolute
     """
-    return data_analysis_agent_instance.analyze_data(data_sources)
+    return data_analysis_sessions.for_context(tool_context).analyze_data(data_sources)
 
 # Wrapper for derive_insights to simplify the function signature for automatic function calling
-def derive_insights_wrapper(query: str):
-    return data_analysis_agent_instance.derive_insights(query)
+def derive_insights_wrapper(query: str, tool_context: ToolContext, limit: int = 100, approximate: bool = False):
+    """
+    :param query: Read-only SQL over the analyzed files; each file is a table named after it (sales.csv -> sales)
+    :param limit: Maximum number of rows to return
+    :param approximate: Answer aggregates from sketches in milliseconds, with error bounds, instead of scanning files
+    """
+    return data_analysis_sessions.for_context(tool_context).derive_insights(query, limit=limit, approximate=approximate)
 
 # Wrapper for present_findings to simplify the function signature for automatic function calling
-def present_findings_wrapper(audience: str, format: str = "summary"):
-    return data_analysis_agent_instance.present_findings(audience, format=format)
+def present_findings_wrapper(audience: str, tool_context: ToolContext, format: str = "summary"):
+    """
+    :param audience: Who the findings are for
+    :param format: 'summary', 'detailed' (adds per-column statistics) or 'visual' (adds PNG charts); any other value gives 'summary'
+    """
+    return data_analysis_sessions.for_context(tool_context).present_findings(audience, format=format)
 
 # Define tools using FunctionTool (not AgentTool)
 analyze_data_tool = FunctionTool(
@@ -40,7 +51,7 @@ Data_analysis_insights_agent = Agent(
     model="gemini-2.0-flash",
     name="data_analysis_insights_agent",
     instruction=Data_Analysis_Insights_agent,
-    description="Performs autonomous data analysis, insight derivation, and collaborative presentation of findings.",
+    description=Data_Analysis_Insights_Description,
     tools=[
         analyze_data_tool,
         derive_insights_tool,
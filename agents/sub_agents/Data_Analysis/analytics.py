@@ -0,0 +1,741 @@
+"""Chunked, vectorized statistics over local CSV, JSONL and Parquet files.
+
+A source is read `CHUNK_ROWS` rows at a time, so memory stays bounded however
+large the file is. Every chunk is folded into an `Aggregate` with NumPy: per-column
+counts, sums and extremes, pairwise sums for correlations and sums against the row
+number for trends. Aggregates are plain arrays that merge by addition, so they can
+be combined across chunks, runs or workers. Several sources are analyzed in
+parallel on a process pool.
+
+Each analyzed file is fingerprinted (mtime, size, sha256) and its aggregate kept
+in a `SourceIndex`. A repeat analysis reuses the aggregate of a file that did not
+change. For a CSV or JSONL file that only grew at the end (its old content is an
+unchanged prefix), only the appended rows are parsed and merged in.
+"""
+
+import concurrent.futures
+import copy
+import hashlib
+import io
+import multiprocessing
+import os
+import time
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+try:  # pandas/NumPy are only needed by the data analysis tools.
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
+from agents.sub_agents.Data_Analysis.sketches import TableSketch
+from agents.tools.cache import TTLCache
+from agents.tools.files import DATA_ROOT, confine
+
+CHUNK_ROWS = int(os.getenv("MYBOT_ANALYSIS_CHUNK_ROWS", "100000"))
+ANALYSIS_WORKERS = int(os.getenv("MYBOT_ANALYSIS_WORKERS", "0")) or os.cpu_count() or 1
+# Analyzed files whose fingerprint and aggregate are kept for repeat analyses (LRU).
+ANALYSIS_INDEX_SIZE = int(os.getenv("MYBOT_ANALYSIS_INDEX_SIZE", "1024"))
+
+# Distinct values counted per text column; beyond that only the most frequent are kept.
+MAX_TRACKED_VALUES = 10000
+TOP_VALUES = 5
+MAX_REPORTED_CORRELATIONS = 20
+STRONG_CORRELATION = 0.5
+# |r| between a column and the row number above which it is reported as a trend.
+TREND_THRESHOLD = 0.1
+# Row buckets kept per numeric column for charts; a bucket's width doubles as rows grow.
+SERIES_BUCKETS = 256
+
+FORMATS = {
+    ".csv": "csv",
+    ".tsv": "csv",
+    ".txt": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".json": "jsonl",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+_COMPRESSION_SUFFIXES = (".gz", ".bz2", ".xz", ".zst", ".zip")
+# Formats whose rows can be appended to by writing more lines at the end.
+_LINE_FORMATS = ("csv", "jsonl")
+_HASH_BLOCK = 1 << 20
+
+# Per numeric column, summed over its non-null values; x is shifted by `shift` for precision.
+_VECTORS = ("count", "sum", "sumsq", "st", "stt", "stx")
+# Per pair of numeric columns (i, j), over rows where both are non-null.
+_MATRICES = ("pair_n", "pair_sx", "pair_sxx", "pair_sxy")
+
+
+class AnalysisError(Exception):
+    """Raised for sources that are not local files in a supported format."""
+
+
+def require_pandas():
+    if pd is None:
+        raise AnalysisError("Data analysis needs pandas and NumPy; install them with `pip install pandas numpy`")
+
+
+def resolve_source(source: str) -> Tuple[str, str]:
+    """Returns the local path and format ("csv", "jsonl" or "parquet") of `source`.
+
+    Only files under the data root (`MYBOT_ANALYSIS_ROOT`) can be analyzed; relative
+    paths are taken relative to it.
+
+    Raises:
+        AnalysisError: if the source is not a readable local file in a supported
+            format under the data root.
+    """
+    source = str(source or "").strip()
+    parsed = urlparse(source)
+    if parsed.scheme == "file":
+        path = unquote(parsed.path)
+    elif parsed.scheme and len(parsed.scheme) > 1:  # one letter is a Windows drive
+        raise AnalysisError(f"Unsupported data source {source!r}: only local files can be analyzed")
+    else:
+        path = source
+    resolved = confine(path)
+    if resolved is None:
+        raise AnalysisError(f"Data source {source!r} is outside the data directory {DATA_ROOT!r}")
+    path = resolved
+    if not os.path.isfile(path):
+        raise AnalysisError(f"Data source {source!r} does not exist or is not a file")
+    name = path.lower()
+    for suffix in _COMPRESSION_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+    fmt = FORMATS.get(os.path.splitext(name)[1])
+    if fmt is None:
+        raise AnalysisError(f"Unsupported file type for {source!r}; expected one of {', '.join(sorted(FORMATS))}")
+    return path, fmt
+
+
+def is_compressed(path: str) -> bool:
+    return path.lower().endswith(_COMPRESSION_SUFFIXES)
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of bytes [start, end) of a file, after `prefix`, for parsing part of a
+    line-based file."""
+
+    def __init__(self, f, start: int, end: int, prefix: bytes = b""):
+        self._f, self._end, self._prefix = f, end, prefix
+        f.seek(start)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._prefix:
+            n = min(len(buffer), len(self._prefix))
+            buffer[:n], self._prefix = self._prefix[:n], self._prefix[n:]
+            return n
+        n = min(len(buffer), self._end - self._f.tell())
+        if n <= 0:
+            return 0
+        data = self._f.read(n)
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def read_chunks(
+    path: str,
+    fmt: str,
+    chunk_rows: int = CHUNK_ROWS,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> Iterator["pd.DataFrame"]:
+    """Yields the rows of a file as DataFrames of at most `chunk_rows` rows.
+
+    For uncompressed CSV and JSONL, `start`/`end` restrict reading to a byte range
+    that starts and ends on line boundaries. A CSV range that does not start at 0
+    is read after the file's header line, and rows with more fields than the header
+    raise `pd.errors.ParserError`.
+    """
+    require_pandas()
+    if fmt == "parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise AnalysisError("Reading Parquet needs pyarrow; install it with `pip install pyarrow`") from None
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+        return
+    if is_compressed(path):
+        source, f = path, None
+    else:
+        f = open(path, "rb")
+        header = f.readline() if start and fmt == "csv" else b""
+        source = io.BufferedReader(_ByteRange(f, start, os.fstat(f.fileno()).st_size if end is None else end, header))
+    try:
+        if fmt == "jsonl":
+            with pd.read_json(source, lines=True, chunksize=chunk_rows) as reader:
+                yield from reader
+        else:
+            sep = "\t" if ".tsv" in os.path.basename(path).lower() else ","
+            try:
+                with pd.read_csv(source, sep=sep, chunksize=chunk_rows) as reader:
+                    rows = 0
+                    for frame in reader:
+                        if start and not frame.index.equals(pd.RangeIndex(rows, rows + len(frame))):
+                            # pandas reads extra fields on the first rows as an index instead of failing.
+                            raise pd.errors.ParserError(f"Expected {len(frame.columns)} fields in the rows read")
+                        rows += len(frame)
+                        yield frame
+            except pd.errors.EmptyDataError:
+                return
+    finally:
+        if f is not None:
+            f.close()
+
+
+class Fingerprint(NamedTuple):
+    mtime_ns: int
+    size: int
+    sha256: str
+    ends_with_newline: bool
+
+
+def fingerprint(path: str, previous: Optional[Fingerprint] = None) -> Tuple[Fingerprint, bool]:
+    """Hashes a file; also tells whether `previous`'s content is an unchanged prefix of it."""
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    prefix_matches = False
+    check_at = previous.size if previous is not None and previous.size <= stat.st_size else None
+    done, last = 0, b""
+    with open(path, "rb") as f:
+        while done < stat.st_size:
+            size = _HASH_BLOCK if check_at is None or done >= check_at else min(_HASH_BLOCK, check_at - done)
+            block = f.read(min(size, stat.st_size - done))
+            if not block:
+                break
+            digest.update(block)
+            done += len(block)
+            last = block[-1:]
+            if done == check_at:
+                prefix_matches = digest.hexdigest() == previous.sha256
+        if check_at == 0:
+            prefix_matches = True
+    return Fingerprint(stat.st_mtime_ns, done, digest.hexdigest(), last == b"\n"), prefix_matches
+
+
+def _is_numeric(series: "pd.Series") -> bool:
+    return pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)
+
+
+class Aggregate:
+    """Mergeable summary statistics of a table, kept as NumPy arrays.
+
+    Numeric columns are indexed by their position in `numeric`; text columns
+    (anything else) keep value counts. Numeric columns also keep value counts in
+    `history` while they have at most MAX_TRACKED_VALUES distinct values, so a
+    column that turns out to be text in a later chunk (or a merged aggregate) is
+    counted as if it had been read as text throughout. Rows are numbered from 0 across chunks so
+    trends can be fitted against the row number, and each numeric column also
+    keeps its sums over `SERIES_BUCKETS` consecutive row ranges for plotting.
+    `sketch` holds the distinct-count, quantile and frequency sketches and the
+    row sample used for approximate answers.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.columns: List[str] = []  # every column, in the order first seen
+        self.nulls: Dict[str, int] = {}
+        self.numeric: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.shift = np.zeros(0)
+        self.min = np.zeros(0)
+        self.max = np.zeros(0)
+        for name in _VECTORS:
+            setattr(self, name, np.zeros(0))
+        for name in _MATRICES:
+            setattr(self, name, np.zeros((0, 0)))
+        self.bucket_rows = 1
+        self.series_sum = np.zeros((0, SERIES_BUCKETS))
+        self.series_count = np.zeros((0, SERIES_BUCKETS))
+        self.values: Dict[str, Dict[Any, int]] = {}  # text column -> value counts
+        self.truncated: set = set()  # text columns whose counts were capped
+        self.history: Dict[str, Optional[Dict[str, int]]] = {}  # numeric column -> value counts, None past the cap
+        self.sketch = TableSketch()
+        self.chunks = 0
+
+    def _add_numeric(self, names: List[str], shifts: "np.ndarray"):
+        k, extra = len(self.numeric), len(names)
+        for name in names:
+            self._index[name] = len(self.numeric)
+            self.numeric.append(name)
+        self.shift = np.concatenate([self.shift, shifts])
+        self.min = np.concatenate([self.min, np.full(extra, np.inf)])
+        self.max = np.concatenate([self.max, np.full(extra, -np.inf)])
+        for name in _VECTORS:
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(extra)]))
+        for name in _MATRICES:
+            grown = np.zeros((k + extra, k + extra))
+            grown[:k, :k] = getattr(self, name)
+            setattr(self, name, grown)
+        self.series_sum = np.vstack([self.series_sum, np.zeros((extra, SERIES_BUCKETS))])
+        self.series_count = np.vstack([self.series_count, np.zeros((extra, SERIES_BUCKETS))])
+
+    def _fit_rows(self, rows: int):
+        """Widens the series buckets until `rows` rows fit."""
+        while rows > self.bucket_rows * SERIES_BUCKETS:
+            self.series_sum = _coarsen(self.series_sum)
+            self.series_count = _coarsen(self.series_count)
+            self.bucket_rows *= 2
+
+    def update(self, frame: "pd.DataFrame"):
+        """Folds the next chunk of rows into the aggregate."""
+        n = len(frame)
+        t = np.arange(self.rows, self.rows + n, dtype=np.float64)
+        self._fit_rows(self.rows + n)
+        numeric_cols, text_counts = [], []
+        for name in frame.columns:
+            series = frame[name]
+            key = str(name)
+            if key not in self.nulls:
+                self.columns.append(key)
+                self.nulls[key] = 0
+            nulls = int(series.isna().sum())
+            self.nulls[key] += nulls
+            if nulls == n:
+                continue  # an all-null chunk says nothing about the column's type
+            if _is_numeric(series) and key not in self.values:
+                numeric_cols.append((key, series))
+                self._update_history(key, series)
+            else:
+                if key in self._index:
+                    self._to_text(key)
+                text_counts.append((key, self._update_values(key, series)))
+        numeric = []
+        if numeric_cols:
+            new = [key for key, _ in numeric_cols if key not in self._index]
+            if new:
+                with np.errstate(all="ignore"):
+                    shifts = [np.nanmean(s.to_numpy(np.float64, na_value=np.nan)) for key, s in numeric_cols if key in new]
+                self._add_numeric(new, np.nan_to_num(np.array(shifts, dtype=np.float64)))
+            idx = np.array([self._index[key] for key, _ in numeric_cols])
+            x = np.column_stack([s.to_numpy(np.float64, na_value=np.nan) for _, s in numeric_cols])
+            x[~np.isfinite(x)] = np.nan
+            self._update_numeric(idx, x, t)
+            numeric = [(key, x[:, j]) for j, (key, _) in enumerate(numeric_cols)]
+        self.sketch.update(frame, numeric, text_counts)
+        self.rows += n
+        self.chunks += 1
+
+    def _update_numeric(self, idx: "np.ndarray", x: "np.ndarray", t: "np.ndarray"):
+        mask = ~np.isnan(x)
+        m = mask.astype(np.float64)
+        x0 = np.where(mask, x - self.shift[idx], 0.0)
+        self.count[idx] += m.sum(axis=0)
+        self.sum[idx] += x0.sum(axis=0)
+        self.sumsq[idx] += (x0 * x0).sum(axis=0)
+        self.st[idx] += t @ m
+        self.stt[idx] += (t * t) @ m
+        self.stx[idx] += t @ x0
+        with np.errstate(all="ignore"):
+            self.min[idx] = np.fmin(self.min[idx], np.nanmin(np.where(mask, x, np.inf), axis=0))
+            self.max[idx] = np.fmax(self.max[idx], np.nanmax(np.where(mask, x, -np.inf), axis=0))
+        pairs = np.ix_(idx, idx)
+        self.pair_n[pairs] += m.T @ m
+        self.pair_sx[pairs] += x0.T @ m
+        self.pair_sxx[pairs] += (x0 * x0).T @ m
+        self.pair_sxy[pairs] += x0.T @ x0
+        bucket = (t // self.bucket_rows).astype(np.intp)
+        for j, i in enumerate(idx):
+            self.series_sum[i] += np.bincount(bucket, weights=x0[:, j], minlength=SERIES_BUCKETS)
+            self.series_count[i] += np.bincount(bucket, weights=m[:, j], minlength=SERIES_BUCKETS)
+
+    def _update_history(self, key: str, series: "pd.Series"):
+        counts = self.history.setdefault(key, {})
+        if counts is None:
+            return
+        chunk = series.value_counts(sort=False)
+        if len(chunk) > MAX_TRACKED_VALUES:  # checked first: stringifying the values is the costly part
+            self.history[key] = None
+            return
+        for value, count in zip(chunk.index.astype(str), chunk.to_numpy()):
+            counts[value] = counts.get(value, 0) + int(count)
+        if len(counts) > MAX_TRACKED_VALUES:
+            self.history[key] = None
+
+    def _to_text(self, key: str):
+        """Turns numeric column `key` into a text column counting the values seen so far."""
+        counts = self.history.pop(key, None)
+        if counts is None:
+            self.values.setdefault(key, {})
+            self.truncated.add(key)  # its numeric values were not all kept
+        else:
+            mine = self.values.setdefault(key, {})
+            for value, count in counts.items():
+                mine[value] = mine.get(value, 0) + count
+        self.sketch.to_text(key, None if counts is None else pd.Series(counts, dtype=np.int64))
+        i = self._index.pop(key)
+        self.numeric.pop(i)
+        self._index = {name: j for j, name in enumerate(self.numeric)}
+        for name in ("shift", "min", "max") + _VECTORS:
+            setattr(self, name, np.delete(getattr(self, name), i))
+        for name in _MATRICES:
+            setattr(self, name, np.delete(np.delete(getattr(self, name), i, axis=0), i, axis=1))
+        self.series_sum = np.delete(self.series_sum, i, axis=0)
+        self.series_count = np.delete(self.series_count, i, axis=0)
+
+    def _update_values(self, key: str, series: "pd.Series") -> "pd.Series":
+        """Adds the chunk's value counts to the column's and returns them."""
+        counts = self.values.setdefault(key, {})
+        chunk = series.dropna().astype(str).value_counts(sort=False)
+        for value, count in chunk.items():
+            counts[value] = counts.get(value, 0) + int(count)
+        if len(counts) > MAX_TRACKED_VALUES:
+            keep = sorted(counts.items(), key=lambda item: item[1], reverse=True)[: MAX_TRACKED_VALUES // 2]
+            self.values[key] = dict(keep)
+            self.truncated.add(key)
+        return chunk
+
+    def merge(self, other: "Aggregate", offset_rows: bool = True) -> "Aggregate":
+        """Adds `other`, the rows that follow this aggregate's, into this one.
+
+        With `offset_rows`, `other`'s row numbers are shifted to continue after
+        `self.rows`, as if its rows had been appended to this table.
+        """
+        # A column numeric on one side and text on the other is text in both.
+        for name in [name for name in self.numeric if name in other.values]:
+            self._to_text(name)
+        conflicts = [name for name in other.numeric if name in self.values]
+        if conflicts:
+            other = copy.deepcopy(other)
+            for name in conflicts:
+                other._to_text(name)
+        dt = float(self.rows) if offset_rows else 0.0
+        self._fit_rows(int(dt) + other.rows)
+        new = [name for name in other.numeric if name not in self._index]
+        if new:
+            self._add_numeric(new, np.array([other.shift[other._index[name]] for name in new]))
+        idx = np.array([self._index[name] for name in other.numeric], dtype=np.intp)
+        if len(idx):
+            # Re-express other's sums around this aggregate's shifts: x - c1 = (x - c2) + d.
+            d = other.shift - self.shift[idx]
+            n, s, ss = other.count, other.sum, other.sumsq
+            st = other.st + dt * n
+            self.count[idx] += n
+            self.sum[idx] += s + n * d
+            self.sumsq[idx] += ss + 2 * d * s + n * d * d
+            self.st[idx] += st
+            self.stt[idx] += other.stt + 2 * dt * other.st + dt * dt * n
+            self.stx[idx] += other.stx + dt * s + d * st
+            self.min[idx] = np.fmin(self.min[idx], other.min)
+            self.max[idx] = np.fmax(self.max[idx], other.max)
+            pn, psx = other.pair_n, other.pair_sx
+            di, dj = d[:, None], d[None, :]
+            pairs = np.ix_(idx, idx)
+            self.pair_n[pairs] += pn
+            self.pair_sx[pairs] += psx + pn * di
+            self.pair_sxx[pairs] += other.pair_sxx + 2 * di * psx + pn * di * di
+            self.pair_sxy[pairs] += other.pair_sxy + dj * psx + di * psx.T + pn * di * dj
+            self._merge_series(other, idx, d, int(dt))
+        for name in other.columns:
+            if name not in self.nulls:
+                self.columns.append(name)
+                self.nulls[name] = 0
+            self.nulls[name] += other.nulls[name]
+        for name, counts in other.history.items():
+            mine = self.history.get(name, {})
+            if mine is not None and counts is not None:
+                for value, count in counts.items():
+                    mine[value] = mine.get(value, 0) + count
+            self.history[name] = mine if counts is not None and mine is not None and len(mine) <= MAX_TRACKED_VALUES else None
+        for name, counts in other.values.items():
+            mine = self.values.setdefault(name, {})
+            for value, count in counts.items():
+                mine[value] = mine.get(value, 0) + count
+            if name in other.truncated or len(mine) > MAX_TRACKED_VALUES:
+                self.values[name] = dict(sorted(mine.items(), key=lambda item: item[1], reverse=True)[: MAX_TRACKED_VALUES // 2])
+                self.truncated.add(name)
+        self.sketch.merge(other.sketch)
+        self.rows += other.rows
+        self.chunks += other.chunks
+        return self
+
+    def _merge_series(self, other: "Aggregate", idx: "np.ndarray", d: "np.ndarray", dt: int):
+        series_sum, series_count, width = other.series_sum, other.series_count, other.bucket_rows
+        while width < self.bucket_rows:
+            series_sum, series_count, width = _coarsen(series_sum), _coarsen(series_count), width * 2
+        while self.bucket_rows < width:
+            self.series_sum, self.series_count = _coarsen(self.series_sum), _coarsen(self.series_count)
+            self.bucket_rows *= 2
+        # Each of other's buckets lands in the bucket holding its first row, which is
+        # exact when `dt` is a multiple of the width and a close approximation otherwise.
+        first = dt // width
+        used = min(SERIES_BUCKETS - first, SERIES_BUCKETS)
+        if used > 0:
+            self.series_sum[idx, first:first + used] += series_sum[:, :used] + series_count[:, :used] * d[:, None]
+            self.series_count[idx, first:first + used] += series_count[:, :used]
+
+    # -- derived statistics ---------------------------------------------------
+
+    def means(self) -> "np.ndarray":
+        with np.errstate(all="ignore"):
+            return self.shift + self.sum / self.count
+
+    def stds(self) -> "np.ndarray":
+        with np.errstate(all="ignore"):
+            var = (self.sumsq - self.sum * self.sum / self.count) / (self.count - 1)
+        return np.sqrt(np.maximum(var, 0.0))
+
+    def correlations(self) -> "np.ndarray":
+        """Pearson r of every pair of numeric columns over their pairwise complete rows."""
+        n, sx, sxx, sxy = self.pair_n, self.pair_sx, self.pair_sxx, self.pair_sxy
+        with np.errstate(all="ignore"):
+            cov = n * sxy - sx * sx.T
+            var = n * sxx - sx * sx
+            return cov / np.sqrt(var * var.T)
+
+    def trends(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Least-squares slope of each numeric column against the row number, and its r."""
+        n = self.count
+        with np.errstate(all="ignore"):
+            cov = n * self.stx - self.st * self.sum
+            var_t = n * self.stt - self.st * self.st
+            var_x = n * self.sumsq - self.sum * self.sum
+            return cov / var_t, cov / np.sqrt(var_t * var_x)
+
+    def series(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Returns the first row of every used bucket and each numeric column's mean per bucket."""
+        used = max(1, -(-self.rows // self.bucket_rows))
+        with np.errstate(all="ignore"):
+            means = self.shift[:, None] + self.series_sum[:, :used] / self.series_count[:, :used]
+        return np.arange(used) * self.bucket_rows, means
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns per-column statistics, trends and the strongest correlations as plain values."""
+        means, stds = self.means(), self.stds()
+        slopes, trend_r = self.trends()
+        columns: Dict[str, Any] = {}
+        for name in self.columns:
+            i = self._index.get(name)
+            if i is not None and name not in self.values:
+                count = int(self.count[i])
+                columns[name] = {
+                    "type": "numeric",
+                    "count": count,
+                    "nulls": self.nulls[name],
+                    "mean": _number(means[i]) if count else None,
+                    "std": _number(stds[i]) if count > 1 else None,
+                    "min": _number(self.min[i]) if count else None,
+                    "max": _number(self.max[i]) if count else None,
+                }
+            else:
+                counts = self.values.get(name, {})
+                top = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:TOP_VALUES]
+                columns[name] = {
+                    "type": "text",
+                    "count": self.rows - self.nulls[name],
+                    "nulls": self.nulls[name],
+                    "distinct": len(counts),
+                    "distinct_is_lower_bound": name in self.truncated,
+                    "top_values": [[value, count] for value, count in top],
+                }
+        trends = {}
+        for name, i in self._index.items():
+            if name in columns and columns[name]["type"] == "numeric" and np.isfinite(trend_r[i]):
+                r = float(trend_r[i])
+                direction = "increasing" if r > TREND_THRESHOLD else "decreasing" if r < -TREND_THRESHOLD else "flat"
+                trends[name] = {"direction": direction, "slope_per_row": _number(slopes[i]), "r": round(r, 4)}
+        corr = self.correlations()
+        pairs = []
+        numeric = [name for name in self.numeric if columns.get(name, {}).get("type") == "numeric"]
+        for a in range(len(numeric)):
+            for b in range(a + 1, len(numeric)):
+                r = corr[self._index[numeric[a]], self._index[numeric[b]]]
+                if np.isfinite(r) and abs(r) >= STRONG_CORRELATION:
+                    pairs.append({"columns": [numeric[a], numeric[b]], "r": round(float(r), 4)})
+        pairs.sort(key=lambda pair: abs(pair["r"]), reverse=True)
+        return {"columns": columns, "trends": trends, "correlations": pairs[:MAX_REPORTED_CORRELATIONS]}
+
+
+def _coarsen(buckets: "np.ndarray") -> "np.ndarray":
+    """Sums adjacent pairs of buckets, leaving the upper half empty."""
+    pairs = buckets.reshape(buckets.shape[0], SERIES_BUCKETS // 2, 2).sum(axis=2)
+    return np.hstack([pairs, np.zeros_like(pairs)])
+
+
+def _number(value) -> Optional[float]:
+    value = float(value)
+    return round(value, 6) if np.isfinite(value) else None
+
+
+def _scan(path: str, fmt: str, chunk_rows: int, start: int, end: int, result: Dict[str, Any]) -> "Aggregate":
+    result["header"] = None
+    aggregate = Aggregate()
+    for frame in read_chunks(path, fmt, chunk_rows, start=start, end=end):
+        if result["header"] is None:
+            result["header"] = [str(name) for name in frame.columns]
+        aggregate.update(frame)
+    return aggregate
+
+
+def analyze_source(
+    source: str,
+    chunk_rows: int = CHUNK_ROWS,
+    previous: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Scans one source chunk by chunk; returns its aggregate and scan metrics.
+
+    `previous` has the `format`, `fingerprint` and `header` of the source's
+    `SourceIndex` entry from an earlier scan. When the file is unchanged, the
+    result's mode is "unchanged" and it has no aggregate. When the file only grew,
+    the mode is "append" and the aggregate covers just the new rows. Otherwise, or
+    when the new rows do not parse on their own, the whole file is scanned ("full").
+
+    Errors are returned in the result rather than raised, so one bad source does
+    not fail a batch.
+    """
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"source": source}
+    try:
+        require_pandas()
+        path, fmt = resolve_source(source)
+        old = previous["fingerprint"] if previous is not None and previous["format"] == fmt else None
+        fp, prefix_matches = fingerprint(path, old)
+        result.update(path=path, format=fmt, bytes=fp.size, fingerprint=fp, header=None)
+        if old is not None and fp.sha256 == old.sha256:
+            result.update(status="success", mode="unchanged", rows_scanned=0, chunks=0)
+        else:
+            appended = (
+                old is not None and prefix_matches and old.ends_with_newline
+                and fmt in _LINE_FORMATS and not is_compressed(path)
+            )
+            try:
+                aggregate = _scan(path, fmt, chunk_rows, old.size if appended else 0, fp.size, result)
+            except pd.errors.ParserError:
+                if not appended:
+                    raise
+                # Let the whole file decide: the same rows may be valid in it (an implicit index column).
+                appended = False
+                aggregate = _scan(path, fmt, chunk_rows, 0, fp.size, result)
+            if appended:
+                result["header"] = previous["header"]
+            result.update(
+                status="success",
+                mode="append" if appended else "full",
+                aggregate=aggregate,
+                rows_scanned=aggregate.rows,
+                chunks=aggregate.chunks,
+            )
+    except Exception as e:
+        result.update(status="error", error_message=f"{type(e).__name__}: {e}" if not isinstance(e, AnalysisError) else str(e))
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+class SourceIndex:
+    """Fingerprint and aggregate of every analyzed file, by path (LRU)."""
+
+    def __init__(self, maxsize: int = ANALYSIS_INDEX_SIZE):
+        self._entries = TTLCache(maxsize=maxsize)
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(path)
+
+    def update(self, scan: Dict[str, Any]) -> Optional["Aggregate"]:
+        """Records a successful scan and returns the file's aggregate over all its rows."""
+        previous = self._entries.get(scan["path"])
+        if scan["mode"] == "unchanged":
+            aggregate = previous["aggregate"]
+        elif scan["mode"] == "append":
+            # Entries are shared, so merge into a copy.
+            aggregate = copy.deepcopy(previous["aggregate"]).merge(scan["aggregate"])
+        else:
+            aggregate = scan["aggregate"]
+        self._entries.set(scan["path"], {
+            "format": scan["format"],
+            "fingerprint": scan["fingerprint"],
+            "header": scan["header"] if scan["mode"] != "unchanged" else previous["header"],
+            "aggregate": aggregate,
+        })
+        return aggregate
+
+    def stats(self) -> Dict[str, Any]:
+        return self._entries.stats()
+
+
+class AnalyticsEngine:
+    """Analyzes several sources at once on a process pool (inline for a single source)."""
+
+    def __init__(
+        self,
+        max_workers: int = ANALYSIS_WORKERS,
+        chunk_rows: int = CHUNK_ROWS,
+        index: Optional[SourceIndex] = None,
+    ):
+        self.max_workers = max_workers
+        self.chunk_rows = chunk_rows
+        self.index = index if index is not None else SourceIndex()
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+    def _executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a process that runs event loops and threads is unsafe.
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def _unchanged(self, source: str) -> Optional[Dict[str, Any]]:
+        """Result for a source whose size and mtime match the index, without reading it."""
+        try:
+            path, fmt = resolve_source(source)
+            entry = self.index.get(path)
+            stat = os.stat(path)
+        except (AnalysisError, OSError):
+            return None
+        if entry is None or entry["format"] != fmt:
+            return None
+        fp = entry["fingerprint"]
+        if (stat.st_mtime_ns, stat.st_size) != (fp.mtime_ns, fp.size):
+            return None
+        return {
+            "source": source, "path": path, "format": fmt, "bytes": fp.size, "fingerprint": fp,
+            "header": entry["header"], "status": "success", "mode": "unchanged", "rows_scanned": 0, "chunks": 0,
+            "seconds": 0.0,
+        }
+
+    def analyze(self, sources: List[str]) -> List[Dict[str, Any]]:
+        """Returns `analyze_source` results in the order of `sources`.
+
+        Successful results carry the aggregate over all of the file's rows, also
+        when only part of it (or none) was scanned, plus the number of rows.
+        """
+        results: List[Optional[Dict[str, Any]]] = [self._unchanged(source) for source in sources]
+        todo = [i for i, result in enumerate(results) if result is None]
+        previous = []
+        for i in todo:
+            try:
+                entry = self.index.get(resolve_source(sources[i])[0])
+            except AnalysisError:
+                entry = None
+            # Workers only need to know what was scanned, not the cached aggregate.
+            previous.append(None if entry is None else {key: entry[key] for key in ("format", "fingerprint", "header")})
+        todo_sources = [sources[i] for i in todo]
+        if len(todo) <= 1 or self.max_workers <= 1:
+            scans = [analyze_source(source, self.chunk_rows, prev) for source, prev in zip(todo_sources, previous)]
+        else:
+            pool = self._executor()
+            scans = list(pool.map(analyze_source, todo_sources, [self.chunk_rows] * len(todo), previous))
+        for i, scan in zip(todo, scans):
+            results[i] = scan
+        for result in results:
+            if result["status"] == "success":
+                result["aggregate"] = self.index.update(result)
+                result["rows"] = result["aggregate"].rows
+        return results
+
+    def shutdown(self, wait: bool = True):
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+analytics_engine = AnalyticsEngine()
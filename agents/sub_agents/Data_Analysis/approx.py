@@ -0,0 +1,363 @@
+"""Approximate answers to aggregate queries from what `analyze_data` stored, without reading files.
+
+Understands one SELECT over one analyzed table:
+
+    SELECT item, ... FROM table [WHERE condition] [GROUP BY column] [ORDER BY ...] [LIMIT n]
+
+where an item is COUNT(*), COUNT([DISTINCT] col), APPROX_COUNT_DISTINCT(col),
+SUM/AVG/MIN/MAX/STDDEV(col), MEDIAN(col), QUANTILE(col, q) (or QUANTILE_CONT,
+QUANTILE_DISC, APPROX_QUANTILE), or, with GROUP BY, the grouped column.
+
+- With neither WHERE nor GROUP BY, counts, sums, means, extremes and standard
+  deviations are exact from the aggregate, distinct counts come from HyperLogLog
+  and quantiles from the quantile sketch.
+- GROUP BY a text column with only COUNT(*), ordered by the count, lists the most
+  frequent values: exact while the column has few distinct values, otherwise
+  bounded between the counts kept and the Count-Min estimate.
+- Anything else runs on the table's row sample and is scaled up to the whole
+  table, with 95% normal intervals for counts, sums and means. A sample bounds
+  neither extremes nor quantiles, so MIN/MAX/STDDEV/MEDIAN/QUANTILE with WHERE
+  or GROUP BY are `Unsupported` and run exactly.
+
+Results have the keys of `SQLEngine.query`, plus "error_bounds": the estimator
+used for every column and a [low, high] interval for every estimated value
+(None where the value is exact).
+"""
+
+import math
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:  # DuckDB evaluates filters and groups on the row sample.
+    import duckdb
+except ImportError:
+    duckdb = None
+
+try:  # pandas/NumPy are only needed by the data analysis tools.
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
+from agents.sub_agents.Data_Analysis.sketches import Z_95, hash_values
+from agents.sub_agents.Data_Analysis.sql import SQL_DEFAULT_LIMIT, SQL_MAX_ROWS, QueryError, _jsonable
+
+CONFIDENCE = 0.95
+
+_QUERY = re.compile(
+    r"^\s*select\s+(?P<items>.+?)\s+from\s+(?P<table>\"[^\"]+\"|\w+)"
+    r"(?:\s+where\s+(?P<where>.+?))?"
+    r"(?:\s+group\s+by\s+(?P<group>\"[^\"]+\"|\w+))?"
+    r"(?:\s+order\s+by\s+(?P<order>.+?))?"
+    r"(?:\s+limit\s+(?P<limit>\d+))?\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_ITEM = re.compile(
+    r"^(?P<func>[a-z_]+)\s*\(\s*(?P<distinct>distinct\s+)?(?P<arg>\*|\"[^\"]+\"|\w+)"
+    r"\s*(?:,\s*(?P<q>\d*\.?\d+)\s*)?\)(?:\s+as\s+(?P<alias>\"[^\"]+\"|\w+))?$",
+    re.IGNORECASE,
+)
+_COLUMN = re.compile(r"^(?P<arg>\"[^\"]+\"|\w+)(?:\s+as\s+(?P<alias>\"[^\"]+\"|\w+))?$", re.IGNORECASE)
+_COUNT_DESC = re.compile(r"^(?P<key>.+?)\s+desc$", re.IGNORECASE | re.DOTALL)
+
+_QUANTILE_FUNCS = ("median", "quantile", "quantile_cont", "quantile_disc", "approx_quantile")
+_MOMENT_FUNCS = ("sum", "avg", "mean", "min", "max", "stddev", "stddev_samp")
+
+
+class Unsupported(QueryError):
+    """Raised for queries the approximate mode cannot answer; they are run exactly instead."""
+
+
+def _unquote(name: str) -> str:
+    return name[1:-1] if name.startswith('"') else name
+
+
+def _split_items(text: str) -> List[str]:
+    items, depth, current = [], 0, []
+    for ch in text:
+        if ch == "," and depth == 0:
+            items.append("".join(current).strip())
+            current = []
+            continue
+        depth += {"(": 1, ")": -1}.get(ch, 0)
+        current.append(ch)
+    items.append("".join(current).strip())
+    return items
+
+
+class _Item:
+    def __init__(self, text: str):
+        self.text = text
+        match = _ITEM.match(text)
+        if match:
+            self.func = match["func"].lower()
+            self.distinct = bool(match["distinct"])
+            self.arg = None if match["arg"] == "*" else _unquote(match["arg"])
+            self.q = float(match["q"]) if match["q"] else 0.5 if self.func == "median" else None
+            self.alias = match["alias"]
+        else:
+            match = _COLUMN.match(text)
+            if not match:
+                raise Unsupported(f"Cannot estimate {text!r}")
+            self.func, self.distinct, self.q = None, False, None
+            self.arg, self.alias = _unquote(match["arg"]), match["alias"]
+        if self.func in _QUANTILE_FUNCS and (self.q is None or not 0 <= self.q <= 1):
+            raise Unsupported(f"{text!r} needs a quantile between 0 and 1")
+        if self.func == "approx_count_distinct":
+            self.func, self.distinct = "count", True
+        if self.func is not None and self.func not in ("count",) + _QUANTILE_FUNCS + _MOMENT_FUNCS:
+            raise Unsupported(f"{self.func.upper()} has no approximate estimator")
+
+
+def _column(aggregate, name: Optional[str]) -> Optional[str]:
+    """Resolves a column name the way SQL does: exactly, else case-insensitively."""
+    if name is None or name in aggregate.nulls:
+        return name
+    matches = [c for c in aggregate.columns if c.lower() == name.lower()]
+    if len(matches) != 1:
+        raise Unsupported(f"Unknown column {name!r}")
+    return matches[0]
+
+
+def _sample_connection(table: str, aggregate):
+    if duckdb is None:
+        raise Unsupported("Approximate answers over the row sample need DuckDB")
+    frame = aggregate.sketch.sample.frame
+    if frame is None:
+        frame = pd.DataFrame(columns=aggregate.columns)
+    conn = duckdb.connect(":memory:")
+    conn.register(table, frame)
+    conn.execute("SET enable_external_access = false")
+    conn.execute("SET lock_configuration = true")
+    return conn
+
+
+def _names(conn, items: List[str], table: str, group: Optional[str]) -> List[str]:
+    """The column names DuckDB gives the items, so both modes label results alike."""
+    sql = f"SELECT {', '.join(items)} FROM \"{table}\""
+    if group:
+        sql += f' GROUP BY "{group}"'
+    try:
+        return [c[0] for c in conn.execute(sql + " LIMIT 0").description]
+    except duckdb.Error as e:
+        raise QueryError(str(e).splitlines()[0]) from None
+
+
+def _interval(estimate: float, half_width: float) -> List[float]:
+    return [estimate - half_width, estimate + half_width]
+
+
+def _from_sketches(aggregate, items: List[_Item]) -> Tuple[List[Any], List[str], List[Optional[List[float]]]]:
+    """One row of whole-table aggregates."""
+    row, estimators, intervals = [], [], []
+    sketch = aggregate.sketch
+    for item in items:
+        column = _column(aggregate, item.arg)
+        if item.func is None:
+            raise Unsupported(f"{item.text!r} needs a GROUP BY")
+        numeric = column in aggregate._index and column not in aggregate.values
+        i = aggregate._index.get(column)
+        value, estimator, interval = None, "exact", None
+        if item.func == "count" and column is None:
+            value = aggregate.rows
+        elif item.func == "count" and not item.distinct:
+            value = aggregate.rows - aggregate.nulls[column]
+        elif item.func == "count":
+            if column in aggregate.values and column not in aggregate.truncated:
+                value = len(aggregate.values[column])
+            elif column in sketch.distinct:
+                hll = sketch.distinct[column]
+                value, estimator = round(hll.estimate()), "hyperloglog"
+                interval = [value * (1 - hll.relative_error), value * (1 + hll.relative_error)]
+            else:
+                value = 0
+        elif not numeric:
+            raise Unsupported(f"{item.func.upper()} of non-numeric column {column!r} has no estimator")
+        elif not aggregate.count[i]:
+            value = None
+        elif item.func == "sum":
+            value = float(aggregate.shift[i] * aggregate.count[i] + aggregate.sum[i])
+        elif item.func in ("avg", "mean"):
+            value = float(aggregate.means()[i])
+        elif item.func == "min":
+            value = float(aggregate.min[i])
+        elif item.func == "max":
+            value = float(aggregate.max[i])
+        elif item.func in ("stddev", "stddev_samp"):
+            value = float(aggregate.stds()[i]) if aggregate.count[i] > 1 else None
+        else:
+            quantiles = sketch.quantiles[column]
+            eps = quantiles.rank_error
+            value, low, high = quantiles.quantiles([item.q, item.q - eps, item.q + eps])
+            estimator, interval = "quantile_sketch", [low, high] if eps else None
+        row.append(value)
+        estimators.append(estimator)
+        intervals.append(interval)
+    return row, estimators, intervals
+
+
+def _top_values(aggregate, items: List[_Item], group: str, limit: int):
+    """The most frequent values of a text column, with their counts."""
+    counts = aggregate.values[group]
+    ranked = [(value, count) for value, count in counts.items()]
+    if aggregate.nulls[group]:
+        ranked.append((None, aggregate.nulls[group]))
+    truncated = group in aggregate.truncated
+    if truncated:
+        # Kept counts are lower bounds once values were dropped; Count-Min gives upper bounds.
+        cms = aggregate.sketch.frequencies[group]
+        keys = [value for value, _ in ranked if value is not None]
+        upper = dict(zip(keys, cms.estimate_hashes(hash_values(np.array(keys, dtype=object))).tolist()))
+        upper[None] = aggregate.nulls[group]
+        ranked = [(value, upper[value], count) for value, count in ranked]
+    else:
+        ranked = [(value, count, count) for value, count in ranked]
+    ranked.sort(key=lambda entry: entry[1], reverse=True)
+    rows, intervals = [], []
+    for value, estimate, low in ranked[: limit + 1]:
+        rows.append([value if item.func is None else estimate for item in items])
+        bound = [low, estimate] if low != estimate else None
+        intervals.append([None if item.func is None else bound for item in items])
+    estimators = ["exact" if item.func is None or not truncated else "count_min" for item in items]
+    return rows, estimators, intervals
+
+
+def _from_sample(conn, table: str, aggregate, items: List[_Item], parts: Dict[str, Optional[str]], limit: int):
+    """Runs the query on the row sample and scales counts and sums to the whole table."""
+    helpers = []
+    for i, item in enumerate(items):
+        if item.func == "count" and item.distinct:
+            raise Unsupported("Distinct counts with WHERE or GROUP BY cannot be estimated from a sample")
+        if item.func in _QUANTILE_FUNCS + ("min", "max", "stddev", "stddev_samp"):
+            raise Unsupported(f"{item.func.upper()} with WHERE or GROUP BY cannot be bounded from a sample")
+        if item.func == "sum":
+            helpers.append(f'sum(CAST("{item.arg}" AS DOUBLE) * "{item.arg}") AS __ss{i}')
+        elif item.func in ("avg", "mean"):
+            helpers.append(f'stddev_samp("{item.arg}") AS __sd{i}, count("{item.arg}") AS __c{i}')
+    sql = f"SELECT {', '.join([item.text for item in items] + helpers)} FROM \"{table}\""
+    if parts["where"]:
+        sql += f" WHERE {parts['where']}"
+    if parts["group"]:
+        sql += f" GROUP BY {parts['group']}"
+    if parts["order"]:
+        sql += f" ORDER BY {parts['order']}"
+    sql += f" LIMIT {limit + 1}"
+    try:
+        if len(conn.extract_statements(sql)) != 1:
+            raise QueryError("Send exactly one SQL statement")
+        cursor = conn.execute(sql)
+        fetched = cursor.fetchall()
+    except duckdb.Error as e:
+        raise QueryError(str(e).splitlines()[0]) from None
+    sample = aggregate.sketch.sample.frame
+    population, n = aggregate.rows, 0 if sample is None else len(sample)
+    if not n:
+        raise Unsupported(f"{table!r} has no sampled rows")
+    scale = population / n
+    # Finite population correction: no error at all when the sample is the whole table.
+    fpc = math.sqrt((population - n) / (population - 1)) if population > 1 else 0.0
+    estimators = ["exact" if item.func is None else "sample" for item in items]
+    rows, intervals = [], []
+    width = len(items)
+    for record in fetched:
+        values, helper = list(record[:width]), dict(zip([c[0] for c in cursor.description[width:]], record[width:]))
+        cells = []
+        for i, item in enumerate(items):
+            value, interval = values[i], None
+            if value is None or item.func is None:
+                pass
+            elif item.func == "count":
+                seen, p = value, value / n
+                value = round(value * scale)
+                interval = _interval(value, Z_95 * population * math.sqrt(p * (1 - p) / n) * fpc)
+                interval[0] = max(interval[0], seen)  # at least the matching rows sampled
+            elif item.func == "sum":
+                mean, mean_sq = float(value) / n, float(helper[f"__ss{i}"] or 0.0) / n
+                value = float(value) * scale
+                interval = _interval(value, Z_95 * population * math.sqrt(max(mean_sq - mean * mean, 0.0) / n) * fpc)
+            elif item.func in ("avg", "mean") and helper[f"__sd{i}"] is not None:
+                interval = _interval(value, Z_95 * helper[f"__sd{i}"] / math.sqrt(helper[f"__c{i}"]) * fpc)
+            values[i] = value
+            cells.append(interval)
+        rows.append(values)
+        intervals.append(cells)
+    return rows, estimators, intervals
+
+
+def approximate_query(sql: str, tables: Dict[str, Any], limit: Optional[int] = None) -> Dict[str, Any]:
+    """Answers `sql` from the aggregates and sketches of `tables` (name -> Aggregate).
+
+    Raises:
+        Unsupported: if the query is outside what the sketches can answer.
+        QueryError: if the query refers to columns or syntax DuckDB rejects.
+    """
+    limit = SQL_DEFAULT_LIMIT if limit is None else limit
+    limit = max(0, min(int(limit), SQL_MAX_ROWS))
+    start = time.perf_counter()
+    match = _QUERY.match(sql)
+    if not match:
+        raise Unsupported("Only SELECT <aggregates> FROM <one table> [WHERE] [GROUP BY] [ORDER BY] [LIMIT] is estimated")
+    table = _unquote(match["table"])
+    aggregate = next((agg for name, agg in tables.items() if name.lower() == table.lower()), None)
+    if aggregate is None:
+        raise Unsupported(f"No analyzed table named {table!r}")
+    if pd is None:
+        raise Unsupported("Approximate answers need pandas and NumPy")
+    if match["limit"] is not None:
+        limit = min(limit, int(match["limit"]))
+    items = [_Item(text) for text in _split_items(match["items"])]
+    group = _unquote(match["group"]) if match["group"] else None
+    if group is None and any(item.func is None for item in items):
+        raise Unsupported("Only aggregates can be estimated without GROUP BY")
+    if group is not None and any(item.func is None and item.arg.lower() != group.lower() for item in items):
+        raise Unsupported("Selected columns must be the GROUP BY column")
+    conn = _sample_connection(table, aggregate)
+    try:
+        columns = _names(conn, [item.text for item in items], table, group)
+        if not match["where"] and group is None:
+            row, estimators, cells = _from_sketches(aggregate, items)
+            rows, intervals = [row], [cells]
+        elif not match["where"] and _counts_by_text(aggregate, items, group, match["order"], columns):
+            rows, estimators, intervals = _top_values(aggregate, items, _column(aggregate, group), limit)
+        else:
+            rows, estimators, intervals = _from_sample(conn, table, aggregate, items, match.groupdict(), limit)
+    finally:
+        conn.close()
+    truncated = len(rows) > limit
+    elapsed = round((time.perf_counter() - start) * 1000, 2)
+    return {
+        "columns": columns,
+        "rows": [[_jsonable(value) for value in row] for row in rows[:limit]],
+        "row_count": min(len(rows), limit),
+        "truncated": truncated,
+        "limit": limit,
+        "timing_ms": {"execute": elapsed, "fetch": 0.0, "total": elapsed},
+        "error_bounds": {
+            "confidence": CONFIDENCE,
+            "estimators": estimators,
+            "intervals": [[_jsonable(cell) for cell in row] for row in intervals[:limit]],
+        },
+    }
+
+
+def _counts_by_text(aggregate, items: List[_Item], group: str, order: Optional[str], columns: List[str]) -> bool:
+    """Whether the query lists a text column's values by descending COUNT(*)."""
+    column = _column(aggregate, group)
+    if column not in aggregate.values:
+        return False
+    counts = [i for i, item in enumerate(items) if item.func == "count" and item.arg is None and not item.distinct]
+    if any(item.func is not None and i not in counts for i, item in enumerate(items)) or len(counts) != 1:
+        return False
+    if order is None:
+        return True
+    match = _COUNT_DESC.match(order.strip())
+    if not match:
+        return False
+    key = match["key"].strip()
+    i = counts[0]
+    names = {items[i].text.lower(), re.sub(r"\s+", "", items[i].text.lower()), columns[i].lower(), str(i + 1)}
+    names |= {"count(*)", "count_star()"}
+    if items[i].alias:
+        names.add(_unquote(items[i].alias).lower())
+    return key.lower() in names or re.sub(r"\s+", "", key.lower()) in names
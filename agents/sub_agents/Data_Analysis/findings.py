@@ -0,0 +1,240 @@
+"""Findings and charts built from the aggregates `analyze_data` keeps, without rescanning sources.
+
+Findings depend only on the analyzed data and the format, never on the audience,
+so they are cached per (format, analyses) and shared by every audience and session;
+what differs between sessions (the source each table was read from) is added per call. Charts
+are rendered with matplotlib's headless Agg backend on a process pool and stored
+under a hash of what they plot, so an unchanged chart is never drawn twice.
+"""
+
+import concurrent.futures
+import multiprocessing
+import os
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from agents.tools.cache import TTLCache
+from agents.tools.memo import canonical_hash
+
+CHART_DIR = os.getenv("MYBOT_CHART_DIR") or os.path.join(tempfile.gettempdir(), "mybot-charts")
+CHART_WORKERS = int(os.getenv("MYBOT_CHART_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+FINDINGS_CACHE_SIZE = int(os.getenv("MYBOT_FINDINGS_CACHE_SIZE", "256"))
+
+FORMATS = ("summary", "detailed", "visual")
+
+MAX_HIGHLIGHTS = 8
+MAX_TREND_COLUMNS = 6
+MAX_HEATMAP_COLUMNS = 12
+MAX_VALUE_CHARTS = 3
+# Share of nulls above which a column is called out.
+MISSING_THRESHOLD = 0.05
+# Distinct values per non-null row from which a text column is treated as an identifier,
+# whose most frequent value says nothing.
+NEAR_UNIQUE_RATIO = 0.9
+
+
+def _round(value: Optional[float], digits: int = 4) -> Optional[float]:
+    return None if value is None else round(value, digits)
+
+
+def highlights(table: str, stats: Dict[str, Any], rows: int) -> List[str]:
+    """Plain-language statements about one analyzed table, most notable first."""
+    notes = []
+    trends = sorted(stats["trends"].items(), key=lambda item: abs(item[1]["r"]), reverse=True)
+    for column, trend in trends:
+        if trend["direction"] != "flat":
+            notes.append(
+                f"{table}.{column} is {trend['direction']} over the rows "
+                f"(r={trend['r']:.2f}, {trend['slope_per_row']:+.4g} per row)"
+            )
+    for pair in stats["correlations"]:
+        a, b = pair["columns"]
+        kind = "positively" if pair["r"] > 0 else "negatively"
+        notes.append(f"{table}.{a} and {table}.{b} are strongly {kind} correlated (r={pair['r']:.2f})")
+    for column, col in stats["columns"].items():
+        if col["type"] == "text" and col["top_values"] and col["count"]:
+            value, count = col["top_values"][0]
+            if count == 1 or col["distinct"] >= NEAR_UNIQUE_RATIO * col["count"]:
+                continue
+            notes.append(f"{table}.{column}: most frequent value is {value!r} ({count / col['count']:.1%} of rows)")
+    for column, col in stats["columns"].items():
+        if rows and col["nulls"] / rows > MISSING_THRESHOLD:
+            notes.append(f"{table}.{column} is missing in {col['nulls'] / rows:.1%} of rows")
+    return notes
+
+
+def chart_specs(table: str, aggregate, stats: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Describes the charts of one table as plain data, ready to hash and render."""
+    specs = []
+    numeric = [c for c in aggregate.numeric if stats["columns"].get(c, {}).get("type") == "numeric"]
+    if numeric and aggregate.rows:
+        by_trend = sorted(numeric, key=lambda c: -abs(stats["trends"].get(c, {}).get("r", 0)))[:MAX_TREND_COLUMNS]
+        starts, means = aggregate.series()
+        specs.append({
+            "kind": "trend",
+            "title": f"{table}: column means by row range",
+            "x": starts.tolist(),
+            "series": {c: [_round(float(v), 6) if v == v else None for v in means[aggregate._index[c]]] for c in by_trend},
+        })
+    if len(numeric) > 1:
+        shown = numeric[:MAX_HEATMAP_COLUMNS]
+        corr = aggregate.correlations()
+        idx = [aggregate._index[c] for c in shown]
+        specs.append({
+            "kind": "correlation",
+            "title": f"{table}: correlations",
+            "labels": shown,
+            "matrix": [[_round(float(corr[i, j])) if corr[i, j] == corr[i, j] else None for j in idx] for i in idx],
+        })
+    text = [(c, col) for c, col in stats["columns"].items() if col["type"] == "text" and col["top_values"]]
+    for column, col in text[:MAX_VALUE_CHARTS]:
+        specs.append({
+            "kind": "top_values",
+            "title": f"{table}.{column}: most frequent values",
+            "labels": [str(value)[:40] for value, _ in col["top_values"]],
+            "counts": [count for _, count in col["top_values"]],
+        })
+    return specs
+
+
+def render_chart(spec: Dict[str, Any], path: str) -> str:
+    """Draws one chart spec to a PNG file; runs in a pool worker."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    if spec["kind"] == "trend":
+        # One panel per column: columns rarely share a scale.
+        panels = len(spec["series"])
+        fig, axes = plt.subplots(panels, 1, sharex=True, squeeze=False, figsize=(8, 1.2 + 1.6 * panels), dpi=100)
+        ax = axes[0][0]
+    else:
+        fig, ax = plt.subplots(figsize=(8, 4.5), dpi=100)
+    try:
+        if spec["kind"] == "trend":
+            for (name, values), (panel,) in zip(spec["series"].items(), axes):
+                panel.plot(spec["x"], [float("nan") if v is None else v for v in values])
+                panel.set_ylabel(name)
+            axes[-1][0].set_xlabel("row")
+        elif spec["kind"] == "correlation":
+            matrix = [[float("nan") if v is None else v for v in row] for row in spec["matrix"]]
+            image = ax.imshow(matrix, vmin=-1, vmax=1, cmap="coolwarm")
+            ax.set_xticks(range(len(spec["labels"])), spec["labels"], rotation=45, ha="right")
+            ax.set_yticks(range(len(spec["labels"])), spec["labels"])
+            fig.colorbar(image, ax=ax)
+        else:
+            ax.barh(spec["labels"][::-1], spec["counts"][::-1])
+            ax.set_xlabel("rows")
+        ax.set_title(spec["title"])
+        fig.tight_layout()
+        tmp = f"{path}.{os.getpid()}.tmp.png"
+        fig.savefig(tmp)
+        os.replace(tmp, path)
+    finally:
+        plt.close(fig)
+    return path
+
+
+class ChartRenderer:
+    """Renders chart specs on a spawn process pool, reusing images already on disk."""
+
+    def __init__(self, chart_dir: str = CHART_DIR, max_workers: int = CHART_WORKERS):
+        self.chart_dir = chart_dir
+        self.max_workers = max_workers
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a process that runs event loops and threads is unsafe.
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def render(self, specs: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int, int]:
+        """Returns chart descriptors (kind, title, path) and the numbers rendered and reused."""
+        os.makedirs(self.chart_dir, exist_ok=True)
+        charts, pending = [], {}
+        for spec in specs:
+            path = os.path.join(self.chart_dir, canonical_hash(spec)[:32] + ".png")
+            charts.append({"kind": spec["kind"], "title": spec["title"], "path": path})
+            if not os.path.exists(path):
+                pending.setdefault(path, spec)
+        if pending:
+            pool = self._executor()
+            futures = [pool.submit(render_chart, spec, path) for path, spec in pending.items()]
+            for future in futures:
+                future.result()
+        return charts, len(pending), len(specs) - len(pending)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+class FindingsPresenter:
+    """Builds findings in each format from analyzed datasets and caches them."""
+
+    def __init__(self, renderer: Optional[ChartRenderer] = None, cache_size: int = FINDINGS_CACHE_SIZE):
+        self.renderer = renderer or ChartRenderer()
+        self.cache = TTLCache(maxsize=cache_size)
+
+    def present(self, datasets: Dict[str, Dict[str, Any]], fmt: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Returns the findings for `datasets` in `fmt`, and how much came from cache.
+
+        `datasets` maps paths to `analyze_data` entries, each with a "table", an
+        "analysis_id" (the content hash of the file) and its "aggregate".
+
+        Raises:
+            ValueError: if `fmt` is not one of FORMATS.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        entries = sorted(datasets.values(), key=lambda entry: (entry["table"], entry["analysis_id"]))
+        key = (fmt,) + tuple((entry["table"], entry["analysis_id"]) for entry in entries)
+        content = self.cache.get(key)
+        if content is not None:
+            cache = {"findings": "cached", "charts_rendered": 0, "charts_cached": len(content.get("charts", ()))}
+            return _with_sources(content, entries), cache
+        tables, notes, specs = [], [], []
+        for entry in entries:
+            aggregate = entry["aggregate"]
+            stats = aggregate.summary()
+            table_notes = highlights(entry["table"], stats, aggregate.rows)
+            notes.extend(table_notes[:2])
+            table = {
+                "table": entry["table"],
+                "rows": aggregate.rows,
+                "columns": len(aggregate.columns),
+                "highlights": table_notes[:MAX_HIGHLIGHTS],
+            }
+            if fmt == "detailed":
+                table.update(statistics=stats["columns"], trends=stats["trends"], correlations=stats["correlations"])
+            tables.append(table)
+            if fmt == "visual":
+                specs.extend(chart_specs(entry["table"], aggregate, stats))
+        content = {"datasets": tables, "highlights": notes[:MAX_HIGHLIGHTS]}
+        rendered = reused = 0
+        if fmt == "visual":
+            try:
+                content["charts"], rendered, reused = self.renderer.render(specs)
+            except Exception as e:  # e.g. matplotlib is not installed; keep the text findings
+                content.update(charts=[], charts_error=f"{type(e).__name__}: {e}")
+                return _with_sources(content, entries), {"findings": "built", "charts_rendered": 0, "charts_cached": 0}
+        self.cache.set(key, content)
+        return _with_sources(content, entries), {"findings": "built", "charts_rendered": rendered, "charts_cached": reused}
+
+
+def _with_sources(content: Dict[str, Any], entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """A copy of cached findings with each table's source from the caller's `entries`."""
+    tables = [dict(table, source=entry["source"]) for table, entry in zip(content["datasets"], entries)]
+    return dict(content, datasets=tables)
+
+
+findings_presenter = FindingsPresenter()
@@ -0,0 +1,313 @@
+"""One-pass, mergeable sketches for approximate answers over large tables.
+
+- `HyperLogLog`: distinct counts, relative standard error 1.04 / sqrt(2**precision).
+- `QuantileSketch`: a KLL-style stack of compactors for quantiles, with a rank error
+  estimated from the compactions it actually performed.
+- `CountMin`: frequency upper bounds; an estimate exceeds the true count by at most
+  e / width * N with probability 1 - exp(-depth).
+- `Reservoir`: a uniform random sample of rows, for questions with filters.
+
+All of them are updated with NumPy arrays a chunk at a time and merge without
+loss of their guarantees, like the aggregates they are kept with.
+"""
+
+import math
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:  # pandas/NumPy are only needed by the data analysis tools.
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
+HLL_PRECISION = 12
+QUANTILE_K = int(os.getenv("MYBOT_SKETCH_QUANTILE_K", "256"))
+COUNT_MIN_WIDTH = 1024
+COUNT_MIN_DEPTH = 4
+SAMPLE_ROWS = int(os.getenv("MYBOT_SKETCH_SAMPLE_ROWS", "10000"))
+# z for the two-sided 95% intervals reported with estimates.
+Z_95 = 1.96
+
+
+def hash_values(values) -> "np.ndarray":
+    """Deterministic 64-bit hashes of an array or Series, stable across processes."""
+    return pd.util.hash_array(np.asarray(values))
+
+
+def _bit_length32(x: "np.ndarray") -> "np.ndarray":
+    # frexp is exact for 32-bit integers: x = m * 2**e with 0.5 <= m < 1, so e is the bit length.
+    return np.where(x > 0, np.frexp(x.astype(np.float64))[1], 0)
+
+
+class HyperLogLog:
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: "np.ndarray"):
+        if not len(hashes):
+            return
+        p = self.precision
+        idx = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        rest = hashes << np.uint64(p)
+        bits = np.where(
+            rest >> np.uint64(32) > 0,
+            32 + _bit_length32((rest >> np.uint64(32)).astype(np.uint32)),
+            _bit_length32((rest & np.uint64(0xFFFFFFFF)).astype(np.uint32)),
+        )
+        rank = np.minimum(65 - bits, 64 - p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # linear counting for small cardinalities
+        return float(estimate)
+
+    @property
+    def relative_error(self) -> float:
+        """Half-width of the 95% interval, relative to the estimate."""
+        return Z_95 * 1.04 / math.sqrt(len(self.registers))
+
+
+class QuantileSketch:
+    """Compactors of capacity `k`; an item at level h stands for 2**h items."""
+
+    def __init__(self, k: int = QUANTILE_K, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.levels: List["np.ndarray"] = [np.zeros(0)]
+        self.compactions: List[int] = [0]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: "np.ndarray"):
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self.k:
+                level = np.sort(level)
+                keep = level[-1:] if len(level) % 2 else level[:0]
+                pairs = level[: len(level) - len(keep)]
+                promoted = pairs[int(self._rng.integers(2))::2]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.zeros(0))
+                    self.compactions.append(0)
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                self.compactions[h] += 1
+            h += 1
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.zeros(0))
+            self.compactions.append(0)
+        for h, level in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], level])
+            self.compactions[h] += other.compactions[h]
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantiles(self, qs: Iterable[float]) -> List[Optional[float]]:
+        items = np.concatenate(self.levels)
+        if not len(items):
+            return [None for _ in qs]
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        result = []
+        for q in qs:
+            i = int(np.searchsorted(cumulative, min(max(q, 0.0), 1.0) * cumulative[-1], side="left"))
+            result.append(float(items[min(i, len(items) - 1)]))
+        return result
+
+    @property
+    def rank_error(self) -> float:
+        """95% bound on the error of a quantile's rank, as a fraction of n.
+
+        Each compaction at level h moves any rank by 2**h in a random direction,
+        so the errors add up like a random walk.
+        """
+        if not self.n:
+            return 0.0
+        variance = sum(c * 4.0 ** h for h, c in enumerate(self.compactions))
+        return min(1.0, Z_95 * math.sqrt(variance) / self.n)
+
+
+class CountMin:
+    def __init__(self, width: int = COUNT_MIN_WIDTH, depth: int = COUNT_MIN_DEPTH):
+        self.width, self.depth = width, depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+
+    def _columns(self, hashes: "np.ndarray") -> "np.ndarray":
+        # Double hashing: row i uses h1 + i * h2 (Kirsch-Mitzenmacher).
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = hashes >> np.uint64(32)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((h1[None, :] + rows * h2[None, :]) % np.uint64(self.width)).astype(np.intp)
+
+    def add_hashes(self, hashes: "np.ndarray", counts: "np.ndarray"):
+        if not len(hashes):
+            return
+        for i, columns in enumerate(self._columns(hashes)):
+            self.table[i] += np.bincount(columns, weights=counts, minlength=self.width).astype(np.int64)
+        self.total += int(counts.sum())
+
+    def estimate_hashes(self, hashes: "np.ndarray") -> "np.ndarray":
+        columns = self._columns(hashes)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def merge(self, other: "CountMin") -> "CountMin":
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    @property
+    def error(self) -> float:
+        """Largest overestimate, as a count, with probability 1 - exp(-depth)."""
+        return math.e / self.width * self.total
+
+
+class Reservoir:
+    """Uniform sample of at most `size` rows (Algorithm R, vectorized per chunk)."""
+
+    def __init__(self, size: int = SAMPLE_ROWS, seed: int = 0):
+        self.size = size
+        self.seen = 0
+        self.frame: Optional["pd.DataFrame"] = None
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, frame: "pd.DataFrame"):
+        n = len(frame)
+        if not n:
+            return
+        frame = frame.reset_index(drop=True)
+        have = 0 if self.frame is None else len(self.frame)
+        fill = min(self.size - have, n)
+        if fill > 0:
+            head = frame.iloc[:fill]
+            self.frame = head.copy() if self.frame is None else pd.concat([self.frame, head], ignore_index=True)
+        rest = np.arange(fill, n)
+        if len(rest):
+            # Row number t (1-based) replaces a random slot with probability size / t.
+            t = self.seen + rest + 1
+            accepted = rest[self._rng.random(len(rest)) < self.size / t]
+            if len(accepted):
+                slots = self._rng.integers(0, self.size, len(accepted))
+                # A slot hit twice keeps the later row, as a sequential pass would.
+                _, last = np.unique(slots[::-1], return_index=True)
+                keep = len(slots) - 1 - last
+                self._assign(slots[keep], frame.iloc[accepted[keep]])
+        self.seen += n
+
+    def _assign(self, slots: "np.ndarray", rows: "pd.DataFrame"):
+        missing = [c for c in rows.columns if c not in self.frame.columns]
+        if missing:
+            self.frame = self.frame.reindex(columns=list(self.frame.columns) + missing)
+        rows = rows.reindex(columns=self.frame.columns)
+        frame = self.frame.copy()
+        for column in frame.columns:
+            values = frame[column].to_numpy(copy=True)
+            new = rows[column].to_numpy()
+            if values.dtype != new.dtype and not np.can_cast(new.dtype, values.dtype):
+                values = values.astype(object)
+            values[slots] = new
+            frame[column] = values
+        self.frame = frame
+
+    def merge(self, other: "Reservoir") -> "Reservoir":
+        if other.frame is None:
+            return self
+        if self.frame is None:
+            self.frame, self.seen = other.frame.copy(), other.seen
+            return self
+        total = self.seen + other.seen
+        if len(self.frame) + len(other.frame) <= self.size:
+            self.frame = pd.concat([self.frame, other.frame], ignore_index=True)
+        else:
+            # Draw from each side in proportion to the rows it stands for.
+            mine = int(self._rng.binomial(self.size, self.seen / total))
+            mine = min(max(mine, self.size - len(other.frame)), len(self.frame))
+            theirs = min(self.size - mine, len(other.frame))
+            a = self.frame.iloc[self._rng.choice(len(self.frame), mine, replace=False)]
+            b = other.frame.iloc[self._rng.choice(len(other.frame), theirs, replace=False)]
+            self.frame = pd.concat([a, b], ignore_index=True)
+        self.seen = total
+        return self
+
+
+class TableSketch:
+    """Sketches of one table: distinct counts of every column, quantiles of numeric
+    columns, frequencies of text columns and a row sample."""
+
+    def __init__(self):
+        self.distinct: Dict[str, HyperLogLog] = {}
+        self.quantiles: Dict[str, QuantileSketch] = {}
+        self.frequencies: Dict[str, CountMin] = {}
+        self.sample = Reservoir()
+
+    def update(
+        self,
+        frame: "pd.DataFrame",
+        numeric: List[Tuple[str, "np.ndarray"]],
+        text: List[Tuple[str, "pd.Series"]],
+    ):
+        """Folds a chunk in; `numeric` holds float arrays, `text` value counts of the chunk."""
+        for key, x in numeric:
+            x = x[~np.isnan(x)]
+            self.distinct.setdefault(key, HyperLogLog()).add_hashes(hash_values(x))
+            self.quantiles.setdefault(key, QuantileSketch()).update(x)
+        for key, counts in text:
+            # The chunk's distinct values and their counts are enough for both sketches.
+            hashes = hash_values(counts.index.to_numpy(dtype=object))
+            self.distinct.setdefault(key, HyperLogLog()).add_hashes(hashes)
+            self.frequencies.setdefault(key, CountMin()).add_hashes(hashes, counts.to_numpy(dtype=np.float64))
+        self.sample.update(frame)
+
+    def to_text(self, key: str, counts: Optional["pd.Series"]):
+        """Re-keeps numeric column `key` as a text column; `counts` are its values so far, if known."""
+        self.quantiles.pop(key, None)
+        if counts is None:
+            return  # the distinct count keeps the numbers' hashes: an estimate either way
+        hashes = hash_values(counts.index.to_numpy(dtype=object))
+        self.distinct[key] = HyperLogLog()
+        self.distinct[key].add_hashes(hashes)
+        self.frequencies[key] = CountMin()
+        self.frequencies[key].add_hashes(hashes, counts.to_numpy(dtype=np.float64))
+
+    def merge(self, other: "TableSketch") -> "TableSketch":
+        for mine, theirs in (
+            (self.distinct, other.distinct),
+            (self.quantiles, other.quantiles),
+            (self.frequencies, other.frequencies),
+        ):
+            for key, sketch in theirs.items():
+                if key in mine:
+                    mine[key].merge(sketch)
+                else:
+                    mine[key] = sketch
+        self.sample.merge(other.sample)
+        return self
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "distinct": {key: round(hll.estimate()) for key, hll in self.distinct.items()},
+            "sample_rows": 0 if self.sample.frame is None else len(self.sample.frame),
+        }
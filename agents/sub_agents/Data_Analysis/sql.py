@@ -0,0 +1,206 @@
+"""Read-only SQL over the files a session analyzed, run by an embedded DuckDB.
+
+Every analyzed file is exposed as a view named after it (`sales.csv` -> `sales`)
+over DuckDB's file readers, so filters and column selections in a query are
+pushed down into the file scan instead of loading whole files. Results are
+fetched in batches and only up to the row limit.
+
+The connection can read only the registered files: its configuration is locked
+with external access disabled, which also blocks writing files, attaching
+databases and installing extensions.
+"""
+
+import datetime
+import decimal
+import os
+import re
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+try:  # DuckDB is only needed to run queries.
+    import duckdb
+except ImportError:
+    duckdb = None
+
+SQL_MAX_ROWS = int(os.getenv("MYBOT_SQL_MAX_ROWS", "1000"))
+SQL_DEFAULT_LIMIT = int(os.getenv("MYBOT_SQL_DEFAULT_LIMIT", "100"))
+SQL_BATCH_ROWS = int(os.getenv("MYBOT_SQL_BATCH_ROWS", "1024"))
+SQL_TIMEOUT = float(os.getenv("MYBOT_SQL_TIMEOUT", "30"))
+SQL_THREADS = int(os.getenv("MYBOT_SQL_THREADS", "0"))  # 0: DuckDB's default, one per core
+
+_READERS = {
+    "csv": "read_csv('{path}')",
+    "jsonl": "read_json('{path}', format = 'newline_delimited')",
+    "parquet": "read_parquet('{path}')",
+}
+_NOT_IDENTIFIER = re.compile(r"\W+")
+
+
+class QueryError(Exception):
+    """Raised for queries that are not a single read-only statement or that fail to run."""
+
+
+def table_name(path: str) -> str:
+    """Derives a SQL identifier from a file name, e.g. "Sales 2024.csv.gz" -> "sales_2024"."""
+    name = os.path.basename(path).split(".")[0].lower()
+    name = _NOT_IDENTIFIER.sub("_", name).strip("_") or "data"
+    return f"t_{name}" if name[0].isdigit() else name
+
+
+def _jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        return value if value == value and value not in (float("inf"), float("-inf")) else None
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (datetime.timedelta, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return str(value)
+
+
+class SQLEngine:
+    """One DuckDB connection over a session's registered files."""
+
+    def __init__(
+        self,
+        max_rows: int = SQL_MAX_ROWS,
+        batch_rows: int = SQL_BATCH_ROWS,
+        timeout: Optional[float] = SQL_TIMEOUT,
+        threads: int = SQL_THREADS,
+    ):
+        self.max_rows = max_rows
+        self.batch_rows = batch_rows
+        self.timeout = timeout
+        self.threads = threads
+        self._tables: Dict[str, Tuple[str, str]] = {}  # view name -> (path, format)
+        self._conn = None
+        self._schemas: Dict[str, List[Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, path: str, fmt: str) -> str:
+        """Exposes a file as a view and returns the view's name."""
+        with self._lock:
+            for name, (known, _) in self._tables.items():
+                if known == path:
+                    return name
+            base = name = table_name(path)
+            n = 2
+            while name in self._tables:
+                name, n = f"{base}_{n}", n + 1
+            self._tables[name] = (path, fmt)
+            # The locked configuration cannot grant access to a new file, so reconnect.
+            self._close()
+            return name
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._schemas = {}
+
+    def _connect(self):
+        if self._conn is None:
+            if duckdb is None:
+                raise QueryError("Running SQL needs DuckDB; install it with `pip install duckdb`")
+            conn = duckdb.connect(":memory:")
+            if self.threads:
+                conn.execute(f"SET threads = {int(self.threads)}")
+            for name, (path, fmt) in self._tables.items():
+                reader = _READERS[fmt].format(path=path.replace("'", "''"))
+                conn.execute(f'CREATE VIEW "{name}" AS SELECT * FROM {reader}')
+            conn.execute("SET allowed_paths = $paths", {"paths": [path for path, _ in self._tables.values()]})
+            conn.execute("SET enable_external_access = false")
+            conn.execute("SET lock_configuration = true")
+            self._conn = conn
+        return self._conn
+
+    def tables(self) -> Dict[str, Any]:
+        """Returns each view's file and columns; a file that fails to load reports its error."""
+        with self._lock:
+            conn = self._connect()
+            result = {}
+            for name, (path, fmt) in self._tables.items():
+                if name not in self._schemas:
+                    try:
+                        rows = conn.execute(f'DESCRIBE "{name}"').fetchall()
+                        self._schemas[name] = [{"name": row[0], "type": row[1]} for row in rows]
+                    except duckdb.Error as e:
+                        result[name] = {"path": path, "format": fmt, "error": str(e).splitlines()[0]}
+                        continue
+                result[name] = {"path": path, "format": fmt, "columns": self._schemas[name]}
+            return result
+
+    def query(self, sql: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Runs one read-only statement and returns up to `limit` rows with timings.
+
+        Raises:
+            QueryError: if no file is registered, the query is not a single SELECT
+                (or EXPLAIN), or DuckDB rejects it.
+        """
+        limit = SQL_DEFAULT_LIMIT if limit is None else limit
+        limit = max(0, min(int(limit), self.max_rows))
+        start = time.perf_counter()
+        with self._lock:
+            if not self._tables:
+                raise QueryError("No data sources are registered; analyze some files with analyze_data first")
+            conn = self._connect()
+            try:
+                statements = conn.extract_statements(sql)
+            except duckdb.Error as e:
+                raise QueryError(f"Not a valid SQL query: {str(e).splitlines()[0]}") from None
+            if len(statements) != 1:
+                raise QueryError("Send exactly one SQL statement")
+            if statements[0].type not in (duckdb.StatementType.SELECT, duckdb.StatementType.EXPLAIN):
+                raise QueryError("Only read-only queries (SELECT, WITH, DESCRIBE, SUMMARIZE, EXPLAIN) are allowed")
+            timer = threading.Timer(self.timeout, conn.interrupt) if self.timeout else None
+            if timer is not None:
+                timer.daemon = True
+                timer.start()
+            try:
+                cursor = conn.execute(sql)
+                executed = time.perf_counter()
+                columns = [column[0] for column in cursor.description or ()]
+                rows: List[Any] = []
+                # Stream batches until one row past the limit shows whether there is more.
+                while len(rows) <= limit:
+                    batch = cursor.fetchmany(min(self.batch_rows, limit + 1 - len(rows)))
+                    if not batch:
+                        break
+                    rows.extend(batch)
+            except duckdb.InterruptException:
+                raise QueryError(f"Query was cancelled after {self.timeout:g}s") from None
+            except duckdb.Error as e:
+                raise QueryError(str(e).splitlines()[0]) from None
+            finally:
+                if timer is not None:
+                    timer.cancel()
+            fetched = time.perf_counter()
+        truncated = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            "columns": columns,
+            "rows": [[_jsonable(value) for value in row] for row in rows],
+            "row_count": len(rows),
+            "truncated": truncated,
+            "limit": limit,
+            "timing_ms": {
+                "execute": round((executed - start) * 1000, 2),
+                "fetch": round((fetched - executed) * 1000, 2),
+                "total": round((fetched - start) * 1000, 2),
+            },
+        }
+
+    def close(self):
+        with self._lock:
+            self._close()
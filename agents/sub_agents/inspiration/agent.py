@@ -1,13 +1,16 @@
 from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
-from agents.sub_agents.inspiration.prompt import PLACE_AGENT_INSTR, NEWS_AGENT_INSTR, INSPIRATION_AGENT_INSTR
+from agents.sub_agents.inspiration.prompt import PLACE_AGENT_INSTR, NEWS_AGENT_INSTR, INSPIRATION_AGENT_INSTR, INSPIRATION_AGENT_DESC
 from google.adk.tools.google_search_tool import google_search
 # Wrapped agent
 from agents.tools.search import google_search_grounding
 from google.adk.tools import FunctionTool
-from agents.tools.places import PlacesService
+from agents.tools.places import places_service
+from agents.tools.http_client import prefer_async
 
-places_tool = FunctionTool(func=PlacesService().find_place_from_text)
+places_tool = FunctionTool(
+    func=prefer_async(places_service.find_place_from_text, places_service.find_place_from_text_async)
+)
 
 place_agent = Agent(
     model="gemini-2.0-flash",
@@ -29,7 +32,7 @@ news_agent = Agent(
 inspiration_agent = Agent(
     model="gemini-2.0-flash",
     name="inspiration_agent",
-    description="A travel inspiration agent who inspire users, and discover their next vacations; Provide information about places, activities, interests,",
+    description=INSPIRATION_AGENT_DESC,
     instruction=INSPIRATION_AGENT_INSTR,
     tools=[AgentTool(agent=place_agent), AgentTool(agent=news_agent)],
 )
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""Lazy registry of the root agent's sub-agents.
+
+The root agent only needs each sub-agent's name and description to route to it,
+so it is built with lightweight `LazySubAgent` stand-ins. The real agent module
+(with its tools, service instances and nested agents) is imported the first time
+the stand-in runs or is looked up by name, and the real agent then replaces the
+stand-in in the tree. Lookups resolve so that ADK routes a session back to the
+sub-agent that last replied (which needs its transfer settings) after a cold start.
+"""
+
+import importlib
+import os
+import threading
+from typing import AsyncGenerator, Dict, List, NamedTuple, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from pydantic import PrivateAttr
+
+from agents.sub_agents.Automation.prompt import Automation_Agent_Description
+from agents.sub_agents.Content_Creation_Generation.prompt import Content_Creation_Generation_Description
+from agents.sub_agents.Customer_Service.prompt import Customer_Service_Engagement_Description
+from agents.sub_agents.Data_Analysis.prompt import Data_Analysis_Insights_Description
+from agents.sub_agents.inspiration.prompt import INSPIRATION_AGENT_DESC
+
+# Set to build every sub-agent at import time instead (e.g. to fail fast in CI).
+EAGER_SUB_AGENTS = os.getenv("MYBOT_EAGER_SUB_AGENTS", "").lower() in ("1", "true", "yes")
+
+
+class SubAgentSpec(NamedTuple):
+    name: str
+    description: str
+    module: str
+    attribute: str
+
+
+SUB_AGENTS: Dict[str, SubAgentSpec] = {
+    spec.name: spec
+    for spec in (
+        SubAgentSpec("inspiration_agent", INSPIRATION_AGENT_DESC,
+                     "agents.sub_agents.inspiration.agent", "inspiration_agent"),
+        SubAgentSpec("automation_agent", Automation_Agent_Description,
+                     "agents.sub_agents.Automation.agent", "Automation_agent"),
+        SubAgentSpec("content_creation_generation_agent", Content_Creation_Generation_Description,
+                     "agents.sub_agents.Content_Creation_Generation.agent", "Content_creation_generation_agent"),
+        SubAgentSpec("customer_service_agent", Customer_Service_Engagement_Description,
+                     "agents.sub_agents.Customer_Service.agent", "Customer_service_agent"),
+        SubAgentSpec("data_analysis_insights_agent", Data_Analysis_Insights_Description,
+                     "agents.sub_agents.Data_Analysis.agent", "Data_analysis_insights_agent"),
+    )
+}
+
+_resolve_lock = threading.Lock()
+
+
+def load_sub_agent(name: str) -> BaseAgent:
+    """Imports the module of a registered sub-agent and returns the real agent."""
+    spec = SUB_AGENTS[name]
+    agent = getattr(importlib.import_module(spec.module), spec.attribute)
+    if agent.name != spec.name:
+        raise ValueError(f"Registry entry {name!r} resolved to agent {agent.name!r}")
+    return agent
+
+
+class LazySubAgent(BaseAgent):
+    """Routing stand-in for a sub-agent that is built on first use."""
+
+    _agent: Optional[BaseAgent] = PrivateAttr(default=None)
+
+    def resolve(self) -> BaseAgent:
+        """Builds the real agent once and swaps it into the parent's sub_agents."""
+        if self._agent is None:
+            with _resolve_lock:
+                if self._agent is None:
+                    agent = load_sub_agent(self.name)
+                    parent = self.parent_agent
+                    if parent is not None:
+                        agent.parent_agent = parent
+                        parent.sub_agents[parent.sub_agents.index(self)] = agent
+                    self._agent = agent
+        return self._agent
+
+    def find_agent(self, name: str) -> Optional[BaseAgent]:
+        # Whoever looks an agent up (session routing, transfers) gets the real one.
+        if name == self.name:
+            return self.resolve()
+        return self._agent.find_agent(name) if self._agent is not None else None
+
+    def find_sub_agent(self, name: str) -> Optional[BaseAgent]:
+        return self._agent.find_sub_agent(name) if self._agent is not None else None
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        async for event in self.resolve().run_async(ctx):
+            yield event
+
+    async def _run_live_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        async for event in self.resolve().run_live(ctx):
+            yield event
+
+
+def build_sub_agents() -> List[BaseAgent]:
+    """Returns the root agent's sub-agents: lazy stand-ins unless EAGER_SUB_AGENTS is set."""
+    if EAGER_SUB_AGENTS:
+        return [load_sub_agent(name) for name in SUB_AGENTS]
+    return [
+        LazySubAgent(name=spec.name, description=spec.description)
+        for spec in SUB_AGENTS.values()
+    ]
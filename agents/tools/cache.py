@@ -0,0 +1,176 @@
+"""Bounded TTL + LRU cache with optional SQLite persistence, shared by the tools."""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+_MISSING = object()
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Folds case, Unicode forms, punctuation and whitespace of a free-text query.
+
+    "Eiffel Tower, Paris" and "  eiffel   tower paris " normalize to the same key.
+    """
+    text = unicodedata.normalize("NFKC", query or "").casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after a time-to-live.
+
+    When `path` is given, entries are written through to a SQLite table so the
+    cache survives restarts; values must then be JSON-serializable and keys strings.
+    An in-memory miss falls back to disk and promotes the entry.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        path: Optional[str] = None,
+        table: str = "cache",
+        disk_maxsize: Optional[int] = None,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        if not table.isidentifier():
+            raise ValueError("table must be a valid SQL identifier")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = self._misses = self._evictions = self._expirations = 0
+        self._disk_hits = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._table = table
+        self._disk_maxsize = disk_maxsize or maxsize * 10
+        self._disk_writes = 0
+        if path:
+            self._open_disk(path)
+
+    # -- disk backing -------------------------------------------------------
+
+    def _open_disk(self, path: str):
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            f"CREATE TABLE IF NOT EXISTS {self._table} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, updated_at REAL NOT NULL)"
+        )
+        self._prune_disk()
+
+    def _prune_disk(self):
+        now = time.time()
+        self._db.execute(
+            f"DELETE FROM {self._table} WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        )
+        self._db.execute(
+            f"DELETE FROM {self._table} WHERE key NOT IN "
+            f"(SELECT key FROM {self._table} ORDER BY updated_at DESC LIMIT ?)",
+            (self._disk_maxsize,),
+        )
+
+    def _disk_get(self, key):
+        row = self._db.execute(
+            f"SELECT value, expires_at FROM {self._table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return _MISSING, None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self._db.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+            return _MISSING, None
+        return json.loads(value), expires_at
+
+    def _disk_set(self, key, value, expires_at):
+        self._db.execute(
+            f"INSERT OR REPLACE INTO {self._table} (key, value, expires_at, updated_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), expires_at, time.time()),
+        )
+        self._disk_writes += 1
+        if self._disk_writes % 256 == 0:
+            self._prune_disk()
+
+    # -- mapping API --------------------------------------------------------
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.time():
+                    self._data.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._data[key]
+                self._expirations += 1
+            if self._db is not None:
+                value, expires_at = self._disk_get(key)
+                if value is not _MISSING:
+                    self._hits += 1
+                    self._disk_hits += 1
+                    self._store(key, value, expires_at)
+                    return value
+            self._misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Stores `value`; `ttl` overrides the cache-wide time-to-live for this entry."""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._store(key, value, expires_at)
+            if self._db is not None:
+                self._disk_set(key, value, expires_at)
+
+    def _store(self, key, value, expires_at):
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+            if self._db is not None:
+                self._db.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+            return default if entry is _MISSING else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            if self._db is not None:
+                self._db.execute(f"DELETE FROM {self._table}")
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            return entry is not _MISSING and (entry[1] is None or entry[1] > time.time())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss/eviction counters and the current hit ratio."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self._hits,
+                "misses": self._misses,
+                "disk_hits": self._disk_hits,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
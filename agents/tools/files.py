@@ -0,0 +1,23 @@
+"""Confines the local files tools may read to one directory."""
+
+import os
+from typing import Optional
+
+# Directory whose files the file-reading tools may open; relative paths are taken
+# relative to it. Defaults to `data` under the working directory.
+DATA_ROOT = os.getenv("MYBOT_ANALYSIS_ROOT") or "data"
+
+
+def confine(path: str, root: str = DATA_ROOT) -> Optional[str]:
+    """Returns the real path of `path` if it lies under `root`, else None.
+
+    Symlinks are resolved before the check, so a link under `root` cannot lead
+    outside it.
+    """
+    root = os.path.realpath(os.path.expanduser(root))
+    resolved = os.path.realpath(os.path.join(root, os.path.expanduser(path)))
+    try:
+        inside = os.path.commonpath([resolved, root]) == root
+    except ValueError:  # e.g. different drives on Windows
+        inside = False
+    return resolved if inside else None
@@ -0,0 +1,443 @@
+"""Shared, pooled HTTP client for every outbound tool request."""
+
+import asyncio
+import codecs
+import functools
+import os
+import re
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+try:  # httpx ships with google-genai; without it the tools stay synchronous.
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+ASYNC_HTTP_AVAILABLE = httpx is not None
+
+DEFAULT_POOL_CONNECTIONS = int(os.getenv("MYBOT_HTTP_POOL_CONNECTIONS", "16"))
+DEFAULT_POOL_MAXSIZE = int(os.getenv("MYBOT_HTTP_POOL_MAXSIZE", "32"))
+DEFAULT_MAX_RETRIES = int(os.getenv("MYBOT_HTTP_MAX_RETRIES", "2"))
+DEFAULT_BACKOFF_FACTOR = float(os.getenv("MYBOT_HTTP_BACKOFF_FACTOR", "0.2"))
+DEFAULT_TIMEOUT = float(os.getenv("MYBOT_HTTP_TIMEOUT", "5"))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+DEFAULT_FETCH_MAX_BYTES = int(os.getenv("MYBOT_FETCH_MAX_BYTES", "65536"))
+FETCH_CHUNK_SIZE = 8192
+
+_TEXTUAL_APPLICATION_TYPES = ("json", "xml", "javascript", "ecmascript", "yaml", "toml", "x-sh", "x-python", "sql")
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+
+
+def parse_content_type(content_type: str):
+    """Splits a Content-Type header into (lowercase mime type, charset or None)."""
+    mime, _, params = (content_type or "").partition(";")
+    charset = None
+    for param in params.split(";"):
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset" and value.strip():
+            charset = value.strip().strip("\"'")
+    return mime.strip().lower(), charset
+
+
+def is_textual(mime: str) -> bool:
+    """Whether a mime type carries text worth decoding (unknown/empty counts as text)."""
+    if not mime or mime.startswith("text/"):
+        return True
+    major, _, minor = mime.partition("/")
+    if major != "application":
+        return False
+    return any(t in minor for t in _TEXTUAL_APPLICATION_TYPES)
+
+
+def _decoder(charset: Optional[str]):
+    try:
+        return codecs.getincrementaldecoder(charset or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+class FetchResult(NamedTuple):
+    """Outcome of `HttpClient.fetch_text`."""
+
+    url: str
+    text: str
+    content_type: str
+    encoding: Optional[str]
+    bytes_read: int  # body bytes consumed from the connection
+    bytes_skipped: Optional[int]  # declared length that was never read; None if unknown
+    truncated: bool
+    binary: bool
+
+    def summary(self) -> Dict[str, Any]:
+        """The result without the text, for reporting alongside tool output."""
+        fields = self._asdict()
+        del fields["text"]
+        return fields
+
+
+class PoolStats:
+    """Thread-safe per-host counters of requests and newly opened connections."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, int]] = {}
+
+    def _host(self, host: str) -> Dict[str, int]:
+        return self._hosts.setdefault(host, {"requests": 0, "new_connections": 0})
+
+    def record_request(self, host: str):
+        with self._lock:
+            self._host(host)["requests"] += 1
+
+    def record_new_connection(self, host: str):
+        with self._lock:
+            self._host(host)["new_connections"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns totals plus a per-host breakdown of pool hits and misses."""
+        with self._lock:
+            hosts = {
+                host: {
+                    "requests": c["requests"],
+                    "pool_hits": max(c["requests"] - c["new_connections"], 0),
+                    "pool_misses": c["new_connections"],
+                }
+                for host, c in self._hosts.items()
+            }
+        return {
+            "requests": sum(h["requests"] for h in hosts.values()),
+            "pool_hits": sum(h["pool_hits"] for h in hosts.values()),
+            "pool_misses": sum(h["pool_misses"] for h in hosts.values()),
+            "hosts": hosts,
+        }
+
+
+def _counting_pool_class(base, stats: PoolStats):
+    """Builds a connection pool class that reports into `stats`.
+
+    Every attempt (including retries) goes through `urlopen`, and a pool miss is
+    any attempt that had to open a fresh socket instead of reusing a kept-alive one.
+    """
+
+    class CountingPool(base):
+        def urlopen(self, *args, **kwargs):
+            stats.record_request(self.host)
+            return super().urlopen(*args, **kwargs)
+
+        def _new_conn(self):
+            stats.record_new_connection(self.host)
+            return super()._new_conn()
+
+    CountingPool.__name__ = f"Counting{base.__name__}"
+    return CountingPool
+
+
+class _CountingAdapter(HTTPAdapter):
+    def __init__(self, stats: PoolStats, **kwargs):
+        self._stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self._stats),
+            "https": _counting_pool_class(HTTPSConnectionPool, self._stats),
+        }
+
+
+class _TextReader:
+    """Incremental decoding behind `fetch_text`, shared by the sync and async clients."""
+
+    def __init__(self, headers, max_bytes: int, max_chars: Optional[int]):
+        self.content_type = headers.get("Content-Type", "")
+        self.mime, self.charset = parse_content_type(self.content_type)
+        try:
+            self.length = int(headers.get("Content-Length", ""))
+        except ValueError:
+            self.length = None
+        self.max_bytes, self.max_chars = max_bytes, max_chars
+        self.binary = self.truncated = not is_textual(self.mime)
+        self.decoder = None
+        self.parts = []
+        self.bytes_read = self.chars = 0
+
+    def feed(self, chunk: bytes) -> bool:
+        """Decodes the next chunk of the body; returns True once no more are needed."""
+        if self.decoder is None:
+            if not self.mime and b"\x00" in chunk:
+                self.binary = self.truncated = True
+                self.bytes_read = len(chunk)
+                return True
+            if self.charset is None and "html" in self.mime:
+                match = _META_CHARSET.search(chunk[:4096])
+                self.charset = match.group(1).decode("ascii") if match else None
+            self.decoder = _decoder(self.charset)
+            self.charset = self.charset or "utf-8"
+        # Truncated only once there is more than the limit: a body of exactly
+        # `max_bytes` (or `max_chars`) reads the next, empty, chunk to tell.
+        if self.bytes_read + len(chunk) > self.max_bytes:
+            chunk = chunk[:self.max_bytes - self.bytes_read]
+            self.truncated = True
+        self.bytes_read += len(chunk)
+        text = self.decoder.decode(chunk)
+        self.parts.append(text)
+        self.chars += len(text)
+        if self.max_chars is not None and self.chars > self.max_chars:
+            self.truncated = True
+        return self.truncated
+
+    def result(self, url: str, wire_read: int) -> FetchResult:
+        """The fetch result; `wire_read` is how many body bytes came off the wire."""
+        if self.binary:
+            return FetchResult(url, "", self.content_type, self.charset, self.bytes_read,
+                               self._skipped(wire_read), True, True)
+        if self.decoder is not None and not self.truncated:
+            self.parts.append(self.decoder.decode(b"", final=True))
+        text, truncated = "".join(self.parts), self.truncated
+        if self.max_chars is not None and len(text) > self.max_chars:
+            text, truncated = text[:self.max_chars], True
+        return FetchResult(url, text, self.content_type, self.charset, self.bytes_read,
+                           self._skipped(wire_read), truncated, False)
+
+    def _skipped(self, wire_read: int) -> Optional[int]:
+        return max(self.length - wire_read, 0) if self.length is not None else None
+
+
+class HttpClient:
+    """A keep-alive `requests.Session` with per-host connection pools and retries.
+
+    The session is safe to share between the worker threads that run tool calls;
+    each host gets its own pool of up to `pool_maxsize` idle connections.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.timeout = timeout
+        self._stats = PoolStats()
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+        adapter = _CountingAdapter(
+            self._stats,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """Sends a request through the shared pools; `timeout` defaults to the client's."""
+        return self.session.request(
+            method, url, timeout=self.timeout if timeout is None else timeout, **kwargs
+        )
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request("HEAD", url, **kwargs)
+
+    def fetch_text(
+        self,
+        url: str,
+        max_bytes: int = DEFAULT_FETCH_MAX_BYTES,
+        max_chars: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> FetchResult:
+        """Streams the start of a text resource without downloading the whole body.
+
+        Reads at most `max_bytes` of the body (and stops early once more than
+        `max_chars` characters are decoded), decoding incrementally with the charset
+        from the Content-Type header or an HTML <meta> tag. `truncated` is set only
+        when the body goes past one of the limits. Binary content types, or bodies
+        whose first chunk contains NUL bytes, are abandoned before any decoding.
+
+        Raises:
+            requests.exceptions.RequestException: on transport errors or HTTP error status.
+        """
+        with self.get(url, stream=True, timeout=timeout) as resp:
+            resp.raise_for_status()
+            reader = _TextReader(resp.headers, max_bytes, max_chars)
+            if not reader.binary:
+                for chunk in resp.iter_content(chunk_size=FETCH_CHUNK_SIZE):
+                    if reader.feed(chunk):
+                        break
+            wire_read = resp.raw.tell() if hasattr(resp.raw, "tell") else reader.bytes_read
+            return reader.result(resp.url, wire_read)
+
+    def stats(self, host: Optional[str] = None) -> Dict[str, Any]:
+        """Returns pool hit/miss counters, optionally for a single host or URL."""
+        snapshot = self._stats.snapshot()
+        if host is None:
+            return snapshot
+        host = urlparse(host).hostname or host
+        return snapshot["hosts"].get(host, {"requests": 0, "pool_hits": 0, "pool_misses": 0})
+
+    def close(self):
+        self.session.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Returns the process-wide HTTP client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+
+def http_stats() -> Dict[str, Any]:
+    """Pool hit/miss counters of the process-wide client."""
+    return get_http_client().stats()
+
+
+class AsyncHttpClient:
+    """Async counterpart of `HttpClient` backed by a pooled `httpx.AsyncClient`.
+
+    httpx clients are bound to the event loop they were created on, so use
+    `get_async_http_client()` rather than sharing an instance across loops.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        if httpx is None:
+            raise RuntimeError("httpx is required for async HTTP")
+        self.timeout = timeout
+        self._closer = None  # set by get_async_http_client
+        # httpx limits are global rather than per host; size them like the sync pools.
+        connections = pool_connections * pool_maxsize
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=connections, max_keepalive_connections=connections
+            ),
+            # httpx retries connection failures only; there is no status-based retry.
+            transport=httpx.AsyncHTTPTransport(retries=max_retries),
+            timeout=timeout,
+        )
+
+    async def request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs):
+        """Sends a request; `timeout` defaults to the client's."""
+        return await self.client.request(
+            method, url, timeout=self.timeout if timeout is None else timeout, **kwargs
+        )
+
+    async def get(self, url: str, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def head(self, url: str, **kwargs):
+        return await self.request("HEAD", url, **kwargs)
+
+    async def fetch_text(
+        self,
+        url: str,
+        max_bytes: int = DEFAULT_FETCH_MAX_BYTES,
+        max_chars: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> FetchResult:
+        """Async variant of `HttpClient.fetch_text`, with the same limits and result.
+
+        Raises:
+            httpx.HTTPError: on transport errors or HTTP error status.
+        """
+        async with self.client.stream(
+            "GET", url, follow_redirects=True, timeout=self.timeout if timeout is None else timeout
+        ) as resp:
+            resp.raise_for_status()
+            reader = _TextReader(resp.headers, max_bytes, max_chars)
+            if not reader.binary:
+                async for chunk in resp.aiter_bytes(FETCH_CHUNK_SIZE):
+                    if reader.feed(chunk):
+                        break
+            return reader.result(str(resp.url), resp.num_bytes_downloaded)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHttpClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _closing(client: AsyncHttpClient):
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+def get_async_http_client() -> AsyncHttpClient:
+    """Returns the async client of the running event loop, creating it on first use.
+
+    The client is closed when the loop shuts down its async generators, as
+    `asyncio.run` does before closing the loop; loops run otherwise should await
+    `close_async_http_client()` instead.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncHttpClient()
+        # A started async generator is finalized (its `finally` awaited) at loop shutdown.
+        client._closer = _closing(client)
+        asyncio.ensure_future(client._closer.__anext__())
+    return client
+
+
+async def close_async_http_client():
+    """Closes the running event loop's async client, if it has one."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def prefer_async(
+    sync_func: Callable[..., Any], async_func: Callable[..., Awaitable[Any]]
+) -> Callable[..., Any]:
+    """Picks the tool callable to register with `FunctionTool`.
+
+    Returns an `async def` that awaits `async_func` but keeps the name, docstring and
+    signature of `sync_func`, so the tool declaration seen by the model is unchanged.
+    Falls back to `sync_func` when no async HTTP client is available.
+    """
+    if not ASYNC_HTTP_AVAILABLE:
+        return sync_func
+
+    @functools.wraps(sync_func)
+    async def tool(*args, **kwargs):
+        return await async_func(*args, **kwargs)
+
+    return tool
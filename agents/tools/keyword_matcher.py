@@ -0,0 +1,64 @@
+"""Multi-keyword substring matching in a single pass over the text (Aho-Corasick)."""
+
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """Finds which of a fixed set of keywords occur in a text.
+
+    Keywords match anywhere in the text, exactly like `keyword in text`, but all of
+    them are found in one scan, so the cost depends on the text length and the
+    number of hits rather than on how many keywords are registered. Matching is
+    case-sensitive; lower-case both sides for case-insensitive lookups.
+    """
+
+    def __init__(self, keywords: Iterable[str] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[str, ...]] = [()]
+        self.keywords = frozenset(k for k in keywords if k)
+        for keyword in self.keywords:
+            self._add(keyword)
+        self._link()
+
+    def _add(self, keyword: str):
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = self._goto[state][ch] = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = (keyword,)
+
+    def _link(self):
+        # Breadth-first, so a state's failure link is final before its children use it.
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = fail
+                # Keywords that end at the failure state also end here ("ui" in "swiftui").
+                self._out[nxt] += self._out[fail]
+
+    def find(self, text: str) -> Set[str]:
+        """Returns the keywords that occur in `text`."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[str] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def __len__(self) -> int:
+        return len(self.keywords)
@@ -0,0 +1,188 @@
+"""URL detection and cached link metadata probes shared by the content tools."""
+
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from agents.tools.cache import TTLCache
+from agents.tools.http_client import get_async_http_client, get_http_client
+
+LINK_CACHE_SIZE = int(os.getenv("MYBOT_LINK_CACHE_SIZE", "4096"))
+# Metadata younger than this is served without touching the network.
+LINK_CACHE_TTL = float(os.getenv("MYBOT_LINK_CACHE_TTL", "300"))
+# Stale metadata is kept this long so it can be revalidated with a conditional request.
+LINK_CACHE_MAX_AGE = float(os.getenv("MYBOT_LINK_CACHE_MAX_AGE", "86400"))
+# 4xx/5xx answers are often transient (rate limits, outages), so they are reused only briefly.
+LINK_ERROR_CACHE_TTL = float(os.getenv("MYBOT_LINK_ERROR_CACHE_TTL", "30"))
+
+# Servers that answer HEAD with these are probed with a one-byte ranged GET instead.
+HEAD_REJECTED_STATUSES = (403, 405, 501)
+
+_CONTENT_RANGE_TOTAL = re.compile(r"/(\d+)\s*$")
+
+# Longer inputs are never treated as a link, whatever they contain.
+MAX_URL_LENGTH = int(os.getenv("MYBOT_MAX_URL_LENGTH", "8192"))
+
+_URL = re.compile(
+    r"(?:"
+    r"https?://(?:\d{1,3}(?:\.\d{1,3}){3}|localhost)"  # IP or localhost, only with a scheme
+    r"|(?:https?://)?[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"  # domain
+    r")"
+    r"(?::\d+)?"  # optional port
+    r"(?:/\S*)?"  # path
+)
+_WHITESPACE = re.compile(r"\s")
+# URLs inside free text need a scheme or "www." so that dotted names in prose or
+# code ("os.path", "v1.2") are not picked up.
+_EMBEDDED_URL = re.compile(r"(?<![\w@/.-])(?:https?://|www\.)[^\s<>\"'`]+")
+_TRAILING_PUNCTUATION = ".,;:!?)]}'\""
+
+
+def is_url(text: str) -> bool:
+    """Returns whether the whole of `text` (ignoring surrounding whitespace) is a URL.
+
+    Inputs longer than MAX_URL_LENGTH, or with whitespace inside, are rejected
+    before the pattern runs, so a large code paste costs a length check.
+    """
+    if not isinstance(text, str) or len(text) > MAX_URL_LENGTH:
+        return False
+    text = text.strip()
+    if not text or _WHITESPACE.search(text):
+        return False
+    return _URL.fullmatch(text) is not None
+
+
+def find_urls(text: str, limit: Optional[int] = None) -> List[str]:
+    """Returns the URLs embedded in `text`, in order of appearance, without duplicates.
+
+    Only "http(s)://" and "www." URLs are found; trailing punctuation is dropped.
+    """
+    urls: List[str] = []
+    if not isinstance(text, str) or ("://" not in text and "www." not in text):
+        return urls
+    for match in _EMBEDDED_URL.finditer(text):
+        url = match.group().rstrip(_TRAILING_PUNCTUATION)
+        if url not in urls and is_url(url):
+            urls.append(url)
+            if limit is not None and len(urls) >= limit:
+                break
+    return urls
+
+
+def _size(status_code: int, headers) -> Optional[int]:
+    if status_code == 206:
+        match = _CONTENT_RANGE_TOTAL.search(headers.get("Content-Range", ""))
+        return int(match.group(1)) if match else None
+    try:
+        return int(headers.get("Content-Length", ""))
+    except ValueError:
+        return None
+
+
+class LinkProbe:
+    """Probes URLs for their final location, content type, size and validators.
+
+    Results are cached per URL. A fresh entry is served as is; a stale entry with an
+    ETag or Last-Modified is revalidated with a conditional request, so an unchanged
+    resource costs a 304 instead of a full probe. Error statuses are cached for
+    `error_ttl` seconds only, and then probed again in full.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[TTLCache] = None,
+        ttl: float = LINK_CACHE_TTL,
+        error_ttl: float = LINK_ERROR_CACHE_TTL,
+    ):
+        self.cache = cache if cache is not None else TTLCache(
+            maxsize=LINK_CACHE_SIZE, ttl=LINK_CACHE_MAX_AGE
+        )
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self._probes = self._revalidated = self._range_fallbacks = 0
+
+    def peek(self, url: str) -> Optional[Dict[str, Any]]:
+        """Returns fresh cached metadata for `url` without any network access."""
+        entry = self.cache.get(url)
+        if entry is not None and time.time() - entry["probed_at"] < self.ttl:
+            return entry
+        return None
+
+    def probe(self, url: str, timeout: float = 5) -> Dict[str, Any]:
+        """Returns metadata for `url`, probing the network only when the cache can't answer.
+
+        Raises:
+            requests.exceptions.RequestException: if the probe itself fails.
+        """
+        entry = self.cache.get(url)
+        if entry is not None and time.time() - entry["probed_at"] < self.ttl:
+            return entry
+        client = get_http_client()
+        headers = self._conditional_headers(entry)
+        self._probes += 1
+        resp = client.head(url, allow_redirects=True, timeout=timeout, headers=headers)
+        if resp.status_code in HEAD_REJECTED_STATUSES:
+            self._range_fallbacks += 1
+            with client.get(url, allow_redirects=True, timeout=timeout, stream=True,
+                            headers={**headers, "Range": "bytes=0-0"}) as resp:
+                return self._store(url, entry, resp.status_code, resp.headers, resp.url)
+        return self._store(url, entry, resp.status_code, resp.headers, resp.url)
+
+    async def probe_async(self, url: str, timeout: float = 5) -> Dict[str, Any]:
+        """Async variant of `probe`, sharing its cache."""
+        entry = self.cache.get(url)
+        if entry is not None and time.time() - entry["probed_at"] < self.ttl:
+            return entry
+        client = get_async_http_client()
+        headers = self._conditional_headers(entry)
+        self._probes += 1
+        resp = await client.head(url, follow_redirects=True, timeout=timeout, headers=headers)
+        if resp.status_code in HEAD_REJECTED_STATUSES:
+            self._range_fallbacks += 1
+            async with client.client.stream(
+                "GET", url, follow_redirects=True, timeout=timeout,
+                headers={**headers, "Range": "bytes=0-0"},
+            ) as resp:
+                return self._store(url, entry, resp.status_code, resp.headers, str(resp.url))
+        return self._store(url, entry, resp.status_code, resp.headers, str(resp.url))
+
+    @staticmethod
+    def _conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _store(self, url, entry, status_code, headers, final_url) -> Dict[str, Any]:
+        if status_code == 304 and entry is not None:
+            self._revalidated += 1
+            entry = dict(entry, probed_at=time.time())
+        else:
+            entry = {
+                "url": url,
+                "final_url": str(final_url),
+                "status": status_code,
+                "content_type": headers.get("Content-Type", ""),
+                "size": _size(status_code, headers),
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "probed_at": time.time(),
+            }
+        self.cache.set(url, entry, ttl=min(self.error_ttl, self.ttl) if entry["status"] >= 400 else None)
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "probes": self._probes,
+            "revalidated": self._revalidated,
+            "range_fallbacks": self._range_fallbacks,
+            "cache": self.cache.stats(),
+        }
+
+
+# Shared by every tool that inspects or fetches links.
+link_probe = LinkProbe()
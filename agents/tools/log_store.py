@@ -0,0 +1,139 @@
+"""Bounded, indexed interaction logs for the domain agents."""
+
+import json
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence
+
+DEFAULT_LOG_CAPACITY = int(os.getenv("MYBOT_LOG_CAPACITY", "1000"))
+# Capacity of the logs an agent keeps per session; there can be MYBOT_MAX_SESSIONS of those.
+SESSION_LOG_CAPACITY = int(os.getenv("MYBOT_SESSION_LOG_CAPACITY", "100"))
+# When set, entries evicted from a log are appended to <dir>/<log name>.jsonl.
+LOG_SPILL_DIR = os.getenv("MYBOT_LOG_SPILL_DIR")
+
+DEFAULT_INDEX_FIELDS = ("customer_id", "session_id")
+
+# Spill files are shared by every log writing to the same path (e.g. one per session).
+_spill_files: Dict[str, Any] = {}
+_spill_lock = threading.Lock()
+
+
+def _spill_file(path: str):
+    with _spill_lock:
+        f = _spill_files.get(path)
+        if f is None:
+            f = _spill_files[path] = open(path, "a", encoding="utf-8", buffering=1)
+        return f
+
+
+class LogStore:
+    """Fixed-capacity ring buffer of dict entries with per-field lookup.
+
+    Appends are O(1): once full, the oldest entry is overwritten (and optionally
+    spilled to an append-only JSONL file). Entries are also indexed by the values
+    of `index_fields`, so `find("customer_id", "c42")` does not scan the buffer.
+    Supports `len()`, iteration (oldest first) and indexing like the plain lists it
+    replaces, e.g. `log[-1]` for the newest entry.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: Optional[int] = None,
+        spill_path: Optional[str] = None,
+        index_fields: Sequence[str] = DEFAULT_INDEX_FIELDS,
+    ):
+        self.name = name
+        self.capacity = capacity or DEFAULT_LOG_CAPACITY
+        if self.capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if spill_path is None and LOG_SPILL_DIR:
+            spill_path = os.path.join(LOG_SPILL_DIR, f"{name}.jsonl")
+        self.spill_path = spill_path
+        if spill_path:
+            os.makedirs(os.path.dirname(os.path.abspath(spill_path)), exist_ok=True)
+        self.index_fields = tuple(index_fields)
+        self._slots: List[Any] = []  # grows up to capacity, then wraps around
+        self._next = 0  # sequence number of the next append; slot = seq % capacity
+        self._spilled = 0
+        self._index: Dict[str, Dict[Any, Deque[int]]] = {f: {} for f in self.index_fields}
+        self._lock = threading.Lock()
+
+    @property
+    def _first(self) -> int:
+        return max(self._next - self.capacity, 0)
+
+    def append(self, entry: Dict[str, Any]):
+        with self._lock:
+            seq = self._next
+            slot = seq % self.capacity
+            if seq < self.capacity:
+                self._slots.append(entry)
+            else:
+                self._evict(seq - self.capacity, self._slots[slot])
+                self._slots[slot] = entry
+            self._next += 1
+            if isinstance(entry, dict):
+                for field in self.index_fields:
+                    if field in entry:
+                        self._index[field].setdefault(entry[field], deque()).append(seq)
+
+    def _evict(self, seq: int, entry: Any):
+        if isinstance(entry, dict):
+            for field in self.index_fields:
+                if field in entry:
+                    seqs = self._index[field].get(entry[field])
+                    # The evicted entry is always the oldest one under its key.
+                    if seqs and seqs[0] == seq:
+                        seqs.popleft()
+                        if not seqs:
+                            del self._index[field][entry[field]]
+        if self.spill_path:
+            self._spill(entry)
+
+    def _spill(self, entry: Any):
+        line = json.dumps(entry, default=str) + "\n"
+        f = _spill_file(self.spill_path)
+        with _spill_lock:
+            f.write(line)
+        self._spilled += 1
+
+    def find(self, field: str, value: Any, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Returns the in-memory entries whose `field` equals `value`, oldest first.
+
+        `limit` keeps only the newest `limit` matches.
+        """
+        if field not in self._index:
+            raise KeyError(f"{field!r} is not an indexed field of log {self.name!r}")
+        with self._lock:
+            seqs = list(self._index[field].get(value, ()))
+            if limit is not None:
+                seqs = seqs[-limit:] if limit > 0 else []
+            return [self._slots[seq % self.capacity] for seq in seqs]
+
+    def __len__(self) -> int:
+        return self._next - self._first
+
+    def __iter__(self) -> Iterator[Any]:
+        with self._lock:
+            entries = [self._slots[seq % self.capacity] for seq in range(self._first, self._next)]
+        return iter(entries)
+
+    def __getitem__(self, i: int) -> Any:
+        with self._lock:
+            size = self._next - self._first
+            if i < 0:
+                i += size
+            if not 0 <= i < size:
+                raise IndexError("log index out of range")
+            return self._slots[(self._first + i) % self.capacity]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "size": len(self),
+            "capacity": self.capacity,
+            "appended": self._next,
+            "spilled": self._spilled,
+        }
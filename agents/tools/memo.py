@@ -0,0 +1,125 @@
+"""Content-addressed memoization for deterministic tool functions."""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional
+
+from agents.tools.cache import TTLCache
+
+MEMO_CACHE_SIZE = int(os.getenv("MYBOT_MEMO_CACHE_SIZE", "4096"))
+MEMO_CACHE_TTL = float(os.getenv("MYBOT_MEMO_CACHE_TTL", "86400"))
+# SQLite file shared by every worker that points at it.
+MEMO_CACHE_PATH = os.getenv("MYBOT_MEMO_CACHE_PATH")
+# Comma-separated tool names to run without memoization, or "*" for all of them.
+MEMO_DISABLED = {name.strip() for name in os.getenv("MYBOT_MEMO_DISABLED", "").split(",") if name.strip()}
+
+_MISSING = object()
+
+
+def canonical_hash(payload: Any) -> str:
+    """Returns the sha256 of `payload` as JSON with sorted keys and no insignificant whitespace."""
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class ToolMemo:
+    """Memoizes tool results under a hash of the tool name and its bound arguments.
+
+    Calls that differ only in dict key order or in spelling out default arguments
+    share an entry. Results are returned as stored, without copying or
+    re-serializing them, so callers must treat them as read-only.
+    """
+
+    def __init__(self, cache: Optional[TTLCache] = None, disabled=None):
+        self.cache = cache if cache is not None else TTLCache(
+            maxsize=MEMO_CACHE_SIZE, ttl=MEMO_CACHE_TTL, path=MEMO_CACHE_PATH, table="tool_memo"
+        )
+        self._disabled = set(MEMO_DISABLED if disabled is None else disabled)
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "bypassed": 0})
+        self._lock = threading.Lock()
+
+    def enable(self, tool: str):
+        self._disabled.discard(tool)
+
+    def disable(self, tool: str):
+        self._disabled.add(tool)
+
+    def is_enabled(self, tool: str) -> bool:
+        return "*" not in self._disabled and tool not in self._disabled
+
+    def _count(self, tool: str, counter: str):
+        with self._lock:
+            self._counters[tool][counter] += 1
+
+    def memoize(
+        self,
+        name: Optional[str] = None,
+        version: str = "1",
+        bypass: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        store_if: Optional[Callable[[Any], bool]] = None,
+        on_hit: Optional[Callable[..., None]] = None,
+    ):
+        """Decorator that memoizes a function or method.
+
+        Args:
+            name: Tool name used in keys, stats and enable/disable; defaults to the function name.
+            version: Part of the key; bump it when the function's output changes.
+            bypass: Called with the bound arguments (without `self`); a true result
+                runs the function without touching the cache, e.g. for URL inputs.
+            store_if: Called with a fresh result; a false result keeps it out of the cache.
+            on_hit: Called as `on_hit(self, result)` for methods (or `on_hit(result)`)
+                when a result is served from the cache, e.g. to keep a log complete.
+        """
+
+        def decorator(func):
+            tool = name or func.__name__
+            signature = inspect.signature(func)
+            is_method = next(iter(signature.parameters), None) == "self"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.is_enabled(tool):
+                    return func(*args, **kwargs)
+                try:
+                    bound = signature.bind(*args, **kwargs)
+                except TypeError:
+                    return func(*args, **kwargs)  # let the call raise its own error
+                bound.apply_defaults()
+                arguments = dict(bound.arguments)
+                owner = arguments.pop("self", None) if is_method else None
+                if bypass is not None and bypass(arguments):
+                    self._count(tool, "bypassed")
+                    return func(*args, **kwargs)
+
+                key = f"{tool}:{version}:" + canonical_hash(arguments)
+                result = self.cache.get(key, _MISSING)
+                if result is not _MISSING:
+                    self._count(tool, "hits")
+                    if on_hit is not None:
+                        on_hit(owner, result) if is_method else on_hit(result)
+                    return result
+                self._count(tool, "misses")
+                result = func(*args, **kwargs)
+                if store_if is None or store_if(result):
+                    self.cache.set(key, result)
+                return result
+
+            wrapper.memo_tool = tool
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns per-tool hit/miss/bypass counters plus the underlying cache stats."""
+        with self._lock:
+            tools = {tool: dict(counters) for tool, counters in self._counters.items()}
+        return {"tools": tools, "disabled": sorted(self._disabled), "cache": self.cache.stats()}
+
+
+# Shared by the content tools, so identical calls hit across agent instances and sessions.
+tool_memo = ToolMemo()
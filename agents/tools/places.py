@@ -1,15 +1,44 @@
 """Wrapper to Google Maps Places API."""
 
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 
 from google.adk.tools import ToolContext
 import requests
 
+from agents.tools.cache import TTLCache, normalize_query
+from agents.tools.http_client import ASYNC_HTTP_AVAILABLE, get_async_http_client, get_http_client, httpx
+
+# Overridable so the service can be pointed at a local stand-in server.
+PLACES_API_BASE_URL = os.getenv(
+    "GOOGLE_PLACES_API_BASE_URL", "https://maps.googleapis.com/maps/api/place"
+)
+
+# Geocoding cache: positive results live for a day, "No places found." for an hour.
+PLACES_CACHE_SIZE = int(os.getenv("MYBOT_PLACES_CACHE_SIZE", "4096"))
+PLACES_CACHE_TTL = float(os.getenv("MYBOT_PLACES_CACHE_TTL", "86400"))
+PLACES_NEGATIVE_CACHE_TTL = float(os.getenv("MYBOT_PLACES_NEGATIVE_CACHE_TTL", "3600"))
+PLACES_CACHE_PATH = os.getenv("MYBOT_PLACES_CACHE_PATH")  # SQLite file, unset = memory only
+
+# Upper bound on concurrent Places API requests issued by one batch.
+PLACES_BATCH_CONCURRENCY = int(os.getenv("MYBOT_PLACES_BATCH_CONCURRENCY", "8"))
+
+NO_PLACES_FOUND = "No places found."
+
 
 class PlacesService:
     """Wrapper to Placees API."""
 
+    def __init__(self, cache: Optional[TTLCache] = None):
+        self.cache = cache if cache is not None else TTLCache(
+            maxsize=PLACES_CACHE_SIZE,
+            ttl=PLACES_CACHE_TTL,
+            path=PLACES_CACHE_PATH,
+            table="places",
+        )
+
     def _check_key(self):
         if (
             not hasattr(self, "places_api_key") or not self.places_api_key
@@ -28,52 +57,172 @@ class PlacesService:
             A dictionary with place_id, place_name, place_address, photos (list), map_url, lat, lng.
             If no place is found, returns {'error': ...}
         """
+        key = normalize_query(query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._response(cached)
+        return self._response(self._remember(key, self._fetch_place(query)))
+
+    def find_places_from_text(
+        self, queries: List[str], max_workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find several places at once, geocoding the uncached ones concurrently.
+
+        Queries that normalize to the same text are looked up only once.
+
+        Args:
+            queries: The search queries (e.g., ["Eiffel Tower Paris", "Louvre Paris"]).
+            max_workers: Cap on concurrent API requests; defaults to PLACES_BATCH_CONCURRENCY.
+
+        Returns:
+            One result dictionary per query, in the same order as `queries`.
+        """
+        keys, results, pending = self._lookup_batch(queries)
+
+        if len(pending) == 1:
+            (key, query), = pending.items()
+            results[key] = self._remember(key, self._fetch_place(query))
+        elif pending:
+            workers = min(len(pending), max_workers or PLACES_BATCH_CONCURRENCY)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="places") as pool:
+                fetched = pool.map(self._fetch_place, pending.values())
+                for key, result in zip(pending, fetched):
+                    results[key] = self._remember(key, result)
+
+        return [self._response(results[key]) for key in keys]
+
+    def _lookup_batch(self, queries: List[str]):
+        """Splits a batch into cached results and queries to fetch, one per normalized key."""
+        keys = [normalize_query(query) for query in queries]
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, str] = {}  # normalized key -> first raw query seen
+        for key, query in zip(keys, queries):
+            if key in results or key in pending:
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending[key] = query
+        return keys, results, pending
+
+    def _response(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """A copy of a (cached) result, with photo URLs built from its references.
+
+        The API key only goes into the URLs here, so it is never cached or written
+        to MYBOT_PLACES_CACHE_PATH.
+        """
+        response = dict(result)
+        references = response.pop("photo_references", None)
+        if references is not None:
+            self._check_key()
+            response["photos"] = self.get_photo_urls(
+                [{"photo_reference": reference} for reference in references], maxwidth=400
+            )
+        return response
+
+    def _remember(self, key: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Caches a fresh API result; transport errors are never cached."""
+        if "error" not in result:
+            self.cache.set(key, result)
+        elif result["error"] == NO_PLACES_FOUND:
+            self.cache.set(key, result, ttl=PLACES_NEGATIVE_CACHE_TTL)
+        return result
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit ratio and eviction counters of the geocoding cache."""
+        return self.cache.stats()
+
+    async def find_place_from_text_async(self, query: str) -> Dict[str, Any]:
+        """Async variant of `find_place_from_text`, sharing its cache."""
+        key = normalize_query(query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._response(cached)
+        return self._response(self._remember(key, await self._fetch_place_async(query)))
+
+    async def find_places_from_text_async(
+        self, queries: List[str], max_workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Async variant of `find_places_from_text`, sharing its cache and concurrency cap."""
+        if not ASYNC_HTTP_AVAILABLE:
+            return await asyncio.to_thread(self.find_places_from_text, queries, max_workers)
+        keys, results, pending = self._lookup_batch(queries)
+
+        limit = asyncio.Semaphore(max_workers or PLACES_BATCH_CONCURRENCY)
+
+        async def fetch(query: str) -> Dict[str, Any]:
+            async with limit:
+                return await self._fetch_place_async(query)
+
+        fetched = await asyncio.gather(*(fetch(query) for query in pending.values()))
+        for key, result in zip(pending, fetched):
+            results[key] = self._remember(key, result)
+
+        return [self._response(results[key]) for key in keys]
+
+    def _request_params(self, query: str) -> Dict[str, Any]:
         self._check_key()
-        places_url = "https://maps.googleapis.com/maps/api/place/findplacefromtext/json"
-        params = {
+        return {
             "input": query,
             "inputtype": "textquery",
             "fields": "place_id,formatted_address,name,photos,geometry",
             "key": self.places_api_key,
         }
 
+    def _fetch_place(self, query: str) -> Dict[str, Any]:
+        """Queries the Places API, bypassing the cache."""
+        places_url = f"{PLACES_API_BASE_URL}/findplacefromtext/json"
         try:
-            response = requests.get(places_url, params=params)
+            response = get_http_client().get(places_url, params=self._request_params(query))
             response.raise_for_status()
-            place_data = response.json()
-
-            if not place_data.get("candidates"):
-                return {"error": "No places found."}
-
-            # Extract data for the first candidate
-            place_details = place_data["candidates"][0]
-            place_id = place_details["place_id"]
-            place_name = place_details["name"]
-            place_address = place_details["formatted_address"]
-            photos = self.get_photo_urls(place_details.get("photos", []), maxwidth=400)
-            map_url = self.get_map_url(place_id)
-            location = place_details["geometry"]["location"]
-            lat = str(location["lat"])
-            lng = str(location["lng"])
-
-            return {
-                "place_id": place_id,
-                "place_name": place_name,
-                "place_address": place_address,
-                "photos": photos,
-                "map_url": map_url,
-                "lat": lat,
-                "lng": lng,
-            }
-
+            return self._parse_place(response.json())
         except requests.exceptions.RequestException as e:
             return {"error": f"Error fetching place data: {e}"}
 
+    async def _fetch_place_async(self, query: str) -> Dict[str, Any]:
+        """Queries the Places API without blocking the event loop, bypassing the cache."""
+        places_url = f"{PLACES_API_BASE_URL}/findplacefromtext/json"
+        try:
+            response = await get_async_http_client().get(
+                places_url, params=self._request_params(query)
+            )
+            response.raise_for_status()
+            return self._parse_place(response.json())
+        except (httpx.HTTPError, ValueError) as e:  # ValueError: a body that is not JSON
+            return {"error": f"Error fetching place data: {e}"}
+
+    def _parse_place(self, place_data: Dict[str, Any]) -> Dict[str, Any]:
+        if not place_data.get("candidates"):
+            return {"error": NO_PLACES_FOUND}
+
+        # Extract data for the first candidate
+        place_details = place_data["candidates"][0]
+        place_id = place_details["place_id"]
+        place_name = place_details["name"]
+        place_address = place_details["formatted_address"]
+        photo_references = [photo["photo_reference"] for photo in place_details.get("photos", [])]
+        map_url = self.get_map_url(place_id)
+        location = place_details["geometry"]["location"]
+        lat = str(location["lat"])
+        lng = str(location["lng"])
+
+        return {
+            "place_id": place_id,
+            "place_name": place_name,
+            "place_address": place_address,
+            "photo_references": photo_references,
+            "map_url": map_url,
+            "lat": lat,
+            "lng": lng,
+        }
+
     def get_photo_urls(self, photos: List[Dict[str, Any]], maxwidth: int = 400) -> List[str]:
         """Helper to build photo URLs from Google Places API photo references."""
         if not photos:
             return []
-        base_url = "https://maps.googleapis.com/maps/api/place/photo"
+        base_url = f"{PLACES_API_BASE_URL}/photo"
         return [
             f"{base_url}?maxwidth={maxwidth}&photoreference={photo['photo_reference']}&key={self.places_api_key}"
             for photo in photos
@@ -88,10 +237,11 @@ class PlacesService:
 places_service = PlacesService()
 
 
-def map_tool(key: str, tool_context: ToolContext):
+async def map_tool(key: str, tool_context: ToolContext):
     """
     This is going to inspect the pois stored under the specified key in the state.
-    One by one it will retrieve the accurate Lat/Lon from the Map API, if the Map API is available for use.
+    It retrieves the accurate Lat/Lon of all of them from the Map API in one concurrent batch,
+    without blocking the event loop, if the Map API is available for use.
 
     Args:
         key: The key under which the POIs are stored.
@@ -108,9 +258,9 @@ def map_tool(key: str, tool_context: ToolContext):
         tool_context.state[key]["places"] = []
 
     pois = tool_context.state[key]["places"]
-    for poi in pois:  # The pydantic object types.POI
-        location = poi["place_name"] + ", " + poi["address"]
-        result = places_service.find_place_from_text(location)
+    locations = [poi["place_name"] + ", " + poi["address"] for poi in pois]
+    results = await places_service.find_places_from_text_async(locations)
+    for poi, result in zip(pois, results):  # The pydantic object types.POI
         # Fill the place holders with verified information.
         poi["place_id"] = result["place_id"] if "place_id" in result else None
         poi["map_url"] = result["map_url"] if "map_url" in result else None
@@ -119,74 +269,3 @@ def map_tool(key: str, tool_context: ToolContext):
             poi["long"] = result["lng"]
 
     return {"places": pois}  # Return the updated pois
-
-
-# """Wrapper to Google Maps Places API."""
-
-# import os
-# from typing import Dict, List, Any, Optional
-
-# from google.adk.tools import ToolContext
-# import requests
-
-
-# class PlacesService:
-#     """Wrapper to Placees API."""
-
-#     def _check_key(self):
-#         if (
-#             not hasattr(self, "places_api_key") or not self.places_api_key
-#         ):  # Either it doesn't exist or is None.
-#             # https://developers.google.com/maps/documentation/places/web-service/get-api-key
-#             self.places_api_key = os.getenv("GOOGLE_PLACES_API_KEY")
-
-#     def find_place_from_text(self, query: str) -> Dict[str, Any]:
-#         """
-#         Find a place using a text query via Google Places API.
-
-#         Args:
-#             query: The search query (e.g., "Eiffel Tower Paris").
-
-#         Returns:
-#             A dictionary with place_id, place_name, place_address, photos (list), map_url, lat, lng.
-#             If no place is found, returns {'error': ...}
-#         """
-#         self._check_key()
-#         places_url = "https://maps.googleapis.com/maps/api/place/findplacefromtext/json"
-#         params = {
-#             "input": query,
-#             "inputtype": "textquery",
-#             "fields": "place_id,formatted_address,name,photos,geometry",
-#             "key": self.places_api_key,
-#         }
-
-#         try:
-#             response = requests.get(places_url, params=params)
-#             response.raise_for_status()
-#             place_data = response.json()
-
-#             if not place_data.get("candidates"):
-#                 return {"error": "No places found."}
-
-#             # Extract data for the first candidate
-#             place_details = place_data["candidates"][0]
-#             place_id = place_details["place_id"]
-#             place_name = place_details["name"]
-#             place_address = place_details["formatted_address"]
-#             location = place_details["geometry"]["location"]
-#             lat = str(location["lat"])
-#             lng = str(location["lng"])
-
-#             return {
-#                 "place_id": place_id,
-#                 "place_name": place_name,
-#                 "place_address": place_address,
-#                 "lat": lat,
-#                 "lng": lng,
-#             }
-
-#         except requests.exceptions.RequestException as e:
-#             return {"error": f"Error fetching place data: {e}"}
-
-# # Google Places API
-# places_service = PlacesService()
\ No newline at end of file
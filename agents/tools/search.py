@@ -1,10 +1,107 @@
 """Wrapper to Google Search Grounding with custom prompt."""
 
+import asyncio
+import json
+import os
+import re
+from typing import Any, Dict, Optional
+
 from google.adk.agents import Agent
+from google.adk.tools import ToolContext
 from google.adk.tools.agent_tool import AgentTool
 
 from google.adk.tools.google_search_tool import google_search
 
+from agents.tools.cache import TTLCache, normalize_query
+
+SEARCH_CACHE_SIZE = int(os.getenv("MYBOT_SEARCH_CACHE_SIZE", "2048"))
+SEARCH_CACHE_TTL = float(os.getenv("MYBOT_SEARCH_CACHE_TTL", "3600"))
+# News-like queries go stale quickly, so they are only reused for a short while.
+SEARCH_NEWS_CACHE_TTL = float(os.getenv("MYBOT_SEARCH_NEWS_CACHE_TTL", "120"))
+
+_NEWS_TERMS = re.compile(
+    r"\b(news|breaking|latest|today|tonight|tomorrow|yesterday|now|live|current|"
+    r"events?|this (?:week|weekend|month)|weather|forecast|scores?)\b"
+)
+
+# Result of an in-flight run whose caller was cancelled: its followers run the call again.
+_ABANDONED = object()
+
+
+class CachedAgentTool(AgentTool):
+    """AgentTool whose answers are cached per normalized request.
+
+    Concurrent calls with the same request share a single in-flight run of the
+    wrapped agent (single-flight), so a burst of identical queries costs one
+    LLM + search round-trip. If the caller running it is cancelled, the first of
+    the waiting calls takes over the run.
+    """
+
+    def __init__(self, agent, cache: Optional[TTLCache] = None, **kwargs):
+        super().__init__(agent=agent, **kwargs)
+        self.cache = cache if cache is not None else TTLCache(
+            maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL
+        )
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._hits = self._misses = self._coalesced = 0
+
+    @staticmethod
+    def cache_key(args: Dict[str, Any]) -> str:
+        if set(args) == {"request"}:
+            return normalize_query(str(args["request"]))
+        return json.dumps(args, sort_keys=True, default=str)
+
+    @staticmethod
+    def ttl_for(key: str) -> float:
+        return SEARCH_NEWS_CACHE_TTL if _NEWS_TERMS.search(key) else SEARCH_CACHE_TTL
+
+    async def run_async(self, *, args: Dict[str, Any], tool_context: ToolContext) -> Any:
+        key = self.cache_key(args)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._hits += 1
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight.get_loop() is asyncio.get_running_loop():
+            self._coalesced += 1
+            result = await asyncio.shield(inflight)
+            if result is not _ABANDONED:
+                return result
+            return await self.run_async(args=args, tool_context=tool_context)
+
+        self._misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await super().run_async(args=args, tool_context=tool_context)
+        except asyncio.CancelledError:
+            future.set_result(_ABANDONED)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Followers re-raise it; don't warn if there are none.
+            raise
+        else:
+            if result:
+                self.cache.set(key, result, ttl=self.ttl_for(key))
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss/coalesced counters plus the underlying cache stats."""
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "coalesced": self._coalesced,
+            "inflight": len(self._inflight),
+            "cache": self.cache.stats(),
+        }
+
+
 _search_agent = Agent(
     model="gemini-2.0-flash",
     name="google_search_grounding",
@@ -21,4 +118,4 @@ _search_agent = Agent(
     tools=[google_search],
 )
 
-google_search_grounding = AgentTool(agent=_search_agent)
\ No newline at end of file
+google_search_grounding = CachedAgentTool(agent=_search_agent)
@@ -0,0 +1,123 @@
+"""Session-scoped tool state, keyed by the ADK session id."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
+
+from google.adk.tools import ToolContext
+
+MAX_SESSIONS = int(os.getenv("MYBOT_MAX_SESSIONS", "10000"))
+SESSION_IDLE_TIMEOUT = float(os.getenv("MYBOT_SESSION_IDLE_TIMEOUT", "1800"))
+
+DEFAULT_SESSION_ID = "default"
+DEFAULT_USER_ID = "anonymous"
+
+T = TypeVar("T")
+
+
+def session_id(tool_context: Optional[ToolContext]) -> str:
+    """Returns the id of the ADK session a tool call belongs to."""
+    if tool_context is None:
+        return DEFAULT_SESSION_ID
+    session = getattr(tool_context, "session", None)
+    if session is None:
+        session = tool_context._invocation_context.session
+    return session.id
+
+
+def user_id(tool_context: Optional[ToolContext]) -> str:
+    """Returns the id of the user (tenant) a tool call is made for."""
+    if tool_context is None:
+        return DEFAULT_USER_ID
+    uid = getattr(tool_context, "user_id", None)
+    if uid is None:
+        uid = getattr(getattr(tool_context, "session", None), "user_id", None)
+    if uid is None:
+        uid = getattr(getattr(tool_context, "_invocation_context", None), "user_id", None)
+    return uid or DEFAULT_USER_ID
+
+
+class SessionTable(Generic[T]):
+    """LRU table of per-session objects that also drops sessions left idle.
+
+    `get()` builds the object for a new session with `factory`. Once the table holds
+    `max_sessions` entries the least recently used one is evicted, and any session
+    untouched for `idle_timeout` seconds is reclaimed on the next access. Evicted and
+    reclaimed objects are passed to `on_evict`, outside the table's lock, so they can
+    release what they hold; objects taken out with `pop()` are the caller's.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], T],
+        max_sessions: int = MAX_SESSIONS,
+        idle_timeout: Optional[float] = SESSION_IDLE_TIMEOUT,
+        on_evict: Optional[Callable[[T], Any]] = None,
+    ):
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.on_evict = on_evict
+        self._sessions: "OrderedDict[str, list]" = OrderedDict()  # id -> [value, last_used]
+        self._lock = threading.Lock()
+        self._created = self._evicted = self._expired = 0
+
+    def get(self, key: str) -> T:
+        now = time.monotonic()
+        with self._lock:
+            dropped = self._expire(now)
+            entry = self._sessions.get(key)
+            if entry is None:
+                entry = self._sessions[key] = [self.factory(), now]
+                self._created += 1
+                while len(self._sessions) > self.max_sessions:
+                    dropped.append(self._sessions.popitem(last=False)[1][0])
+                    self._evicted += 1
+            else:
+                entry[1] = now
+                self._sessions.move_to_end(key)
+        if self.on_evict is not None:
+            for value in dropped:
+                self.on_evict(value)
+        return entry[0]
+
+    def for_context(self, tool_context: Optional[ToolContext]) -> T:
+        """Returns the object of the session `tool_context` belongs to."""
+        return self.get(session_id(tool_context))
+
+    def _expire(self, now: float) -> List[T]:
+        # Entries are kept in last-used order, so idle ones sit at the front.
+        expired: List[T] = []
+        if self.idle_timeout is None:
+            return expired
+        while self._sessions:
+            key, (value, last_used) = next(iter(self._sessions.items()))
+            if now - last_used < self.idle_timeout:
+                break
+            del self._sessions[key]
+            expired.append(value)
+            self._expired += 1
+        return expired
+
+    def pop(self, key: str) -> Optional[T]:
+        with self._lock:
+            entry = self._sessions.pop(key, None)
+            return None if entry is None else entry[0]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "created": self._created,
+                "evicted": self._evicted,
+                "expired": self._expired,
+            }
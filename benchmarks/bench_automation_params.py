@@ -0,0 +1,70 @@
+"""Decode + validate cost per call for large Automation tool parameter payloads.
+
+Usage:
+    python -m benchmarks.bench_automation_params [--items 100,1000,10000] [--repeat 20]
+
+Payloads are "testing" stage details whose test_suites list (validated item by
+item) and free-form results list grow with --items. Each row shows the per-call
+time with the stdlib json parser and, when it is installed, with orjson, plus the
+cost the same call would have if the schema were recompiled on every call.
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from agents.sub_agents.Automation import params
+from agents.sub_agents.Automation.params import compile_schema, param_schemas
+
+
+def payload(items: int) -> str:
+    return json.dumps({
+        "test_suites": [f"tests/suite_{i:05d}.py::TestCase::test_case_{i}" for i in range(items)],
+        "coverage_target": 85,
+        "results": [
+            {"id": i, "name": f"test_case_{i}", "passed": i % 7 != 0, "duration_ms": i * 0.37,
+             "tags": ["unit", "fast"] if i % 2 else ["integration"]}
+            for i in range(items)
+        ],
+    })
+
+
+def per_call_us(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", default="100,1000,10000", help="comma-separated list lengths")
+    parser.add_argument("--repeat", type=int, default=20, help="calls per measurement (median is shown)")
+    args = parser.parse_args()
+
+    backend = params.orjson
+    schema = params.DEFAULT_SCHEMAS["stage"]["testing"]
+    print(f"{'items':>6} {'KiB':>7} {'json us':>9} {'orjson us':>10} {'validate us':>12} {'recompile us':>13}")
+    for items in (int(n) for n in args.items.split(",")):
+        text = payload(items)
+        decode = lambda: param_schemas.decode("stage", "testing", text, max_bytes=len(text) * 4)
+
+        params.orjson = None
+        with_json = per_call_us(decode, args.repeat)
+        params.orjson = backend
+        with_orjson = per_call_us(decode, args.repeat) if backend is not None else float("nan")
+
+        value = json.loads(text)
+        validate = param_schemas.validator("stage", "testing")
+        validate_only = per_call_us(lambda: validate(value, None, []), args.repeat)
+        recompile = per_call_us(lambda: compile_schema(schema)(value, None, []), args.repeat)
+
+        print(f"{items:>6} {len(text) / 1024:>7.0f} {with_json:>9.0f} {with_orjson:>10.0f} "
+              f"{validate_only:>12.0f} {recompile:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
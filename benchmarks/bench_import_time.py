@@ -0,0 +1,54 @@
+"""Cold-start cost of `import agents` and of building each sub-agent on first routing.
+
+Usage:
+    python -m benchmarks.bench_import_time [--repeat 3]
+
+Every measurement runs in a fresh interpreter under `python -X importtime`. A
+sub-agent's cost is measured after `import agents`, so it only counts what its
+module adds on top of the root agent (tools, services, nested agents).
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from agents.sub_agents.registry import SUB_AGENTS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_time_us(code: str, module: str) -> int:
+    """Runs `code` under -X importtime and returns the cumulative time of `module`."""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, MYBOT_EAGER_SUB_AGENTS="")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() == module:
+            return int(cumulative)
+    raise RuntimeError(f"{module} was not imported by: {code}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (median is shown)")
+    args = parser.parse_args()
+
+    def median_ms(code, module):
+        return statistics.median(import_time_us(code, module) for _ in range(args.repeat)) / 1000
+
+    print(f"{'import agents':<40} {median_ms('import agents', 'agents'):>8.1f} ms")
+    for spec in SUB_AGENTS.values():
+        code = f"import agents; import {spec.module}"
+        print(f"{'+ ' + spec.name:<40} {median_ms(code, spec.module):>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Repeat-analysis time of analyze_data against the fraction of sources that changed.
+
+Usage:
+    python -m benchmarks.bench_incremental_analysis [--sources 20] [--rows 50000]
+        [--fractions 0,0.1,0.25,0.5,1] [--workers 1]
+
+Writes --sources CSV files to a temporary directory and analyzes them once to
+fill the index. Each row then changes a fraction of the files and times a repeat
+analysis of all of them: "rewrite" replaces the changed files with new content
+(a full rescan of each), and "append" adds 5% more rows to them (only the new
+rows are read). "cold" is the same analysis with an empty index.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from agents.sub_agents.Data_Analysis.analytics import AnalyticsEngine
+from agents.tools.files import DATA_ROOT
+
+
+def write_source(path: str, rows: int, seed: int, append: bool = False):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "id": np.arange(rows),
+        "amount": rng.gamma(2.0, 50.0, rows).round(2),
+        "quantity": rng.integers(1, 20, rows),
+        "discount": rng.random(rows).round(3),
+        "region": rng.choice(["north", "south", "east", "west"], rows),
+    })
+    frame.to_csv(path, mode="a" if append else "w", header=not append, index=False)
+
+
+def timed(engine: AnalyticsEngine, paths):
+    start = time.perf_counter()
+    results = engine.analyze(paths)
+    return time.perf_counter() - start, sum(result["rows_scanned"] for result in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sources", type=int, default=20, help="number of CSV sources")
+    parser.add_argument("--rows", type=int, default=50000, help="rows per source")
+    parser.add_argument("--fractions", default="0,0.1,0.25,0.5,1", help="comma-separated fractions of sources to change")
+    parser.add_argument("--workers", type=int, default=1, help="analysis worker processes")
+    args = parser.parse_args()
+
+    # Only files under the data root can be analyzed.
+    os.makedirs(DATA_ROOT, exist_ok=True)
+    root = tempfile.mkdtemp(prefix="bench-incremental-", dir=os.path.abspath(DATA_ROOT))
+    try:
+        paths = [os.path.join(root, f"source_{i:03d}.csv") for i in range(args.sources)]
+        for i, path in enumerate(paths):
+            write_source(path, args.rows, seed=i)
+        cold, _ = timed(AnalyticsEngine(max_workers=args.workers), paths)
+        print(f"{args.sources} sources x {args.rows} rows; cold analysis {cold:.3f}s")
+        print(f"{'changed':>8} {'rewrite s':>10} {'rows read':>10} {'append s':>9} {'rows read':>10} {'cold s':>7}")
+        seed = args.sources
+        for fraction in (float(f) for f in args.fractions.split(",")):
+            changed = paths[: round(fraction * len(paths))]
+            row = []
+            for append in (False, True):
+                engine = AnalyticsEngine(max_workers=args.workers)
+                engine.analyze(paths)
+                for path in changed:
+                    seed += 1
+                    write_source(path, args.rows // 20 if append else args.rows, seed, append=append)
+                row.append(timed(engine, paths))
+                engine.shutdown()
+            cold, _ = timed(AnalyticsEngine(max_workers=args.workers), paths)
+            (rewrite, rewrite_rows), (appended, appended_rows) = row
+            print(f"{fraction:>8.0%} {rewrite:>10.3f} {rewrite_rows:>10} {appended:>9.3f} {appended_rows:>10} {cold:>7.3f}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Build time, query latency and incremental-update time of the customer-service knowledge base.
+
+Usage:
+    python -m benchmarks.bench_knowledge_base [--docs 100000] [--files 200] [--queries 1000] [--vectors]
+
+Writes --docs synthetic FAQ entries (a few uniformly drawn topic words among common
+words drawn from a Zipf distribution) into --files JSONL files in a temporary
+directory, then reports: the initial index build; search latency (p50/p95/max) for
+questions paraphrased by dropping and shuffling words, with how often the source
+entry ranks first and is answered; how often questions about topics the knowledge
+base lacks (an entry's question with its topic words replaced by unknown words)
+are answered anyway; and the time to pick up one changed file. --vectors adds the
+memory-mapped vector index.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from agents.sub_agents.Customer_Service.knowledge_base import KnowledgeBase
+
+VOCABULARY = 20000
+
+
+def make_words(rng) -> list:
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    return ["".join(rng.choice(letters, rng.integers(4, 10))) for _ in range(VOCABULARY)]
+
+
+def common(rng, words, n: int) -> str:
+    return " ".join(words[min(int(w), VOCABULARY) - 1] for w in rng.zipf(1.2, n))
+
+
+def entry(rng, words, i: int) -> dict:
+    # A few uniformly drawn topic words, as product names and error codes are, among common ones.
+    topic = " ".join(words[int(w)] for w in rng.integers(0, VOCABULARY, 3))
+    return {"id": i, "question": f"{common(rng, words, 3)} {topic}?", "answer": f"{topic} {common(rng, words, 40)}."}
+
+
+def unanswerable(rng, words) -> str:
+    """A question in the style of the entries about a topic none of them covers."""
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    topic = " ".join("".join(rng.choice(letters, 12)) for _ in range(3))  # longer than any vocabulary word
+    return f"{common(rng, words, 3)} {topic}"
+
+
+def write_files(root: str, rng, words, docs: int, files: int) -> list:
+    entries = [entry(rng, words, i) for i in range(docs)]
+    per_file = -(-docs // files)
+    for f in range(files):
+        with open(os.path.join(root, f"faq_{f:04d}.jsonl"), "w", encoding="utf-8") as out:
+            for e in entries[f * per_file:(f + 1) * per_file]:
+                out.write(json.dumps(e) + "\n")
+    return entries
+
+
+def paraphrase(rng, question: str) -> str:
+    words = question.rstrip("?").split()
+    keep = [w for w in words if rng.random() > 0.25] or words[:1]
+    rng.shuffle(keep)
+    return " ".join(keep)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=100000, help="FAQ entries")
+    parser.add_argument("--files", type=int, default=200, help="JSONL files they are spread over")
+    parser.add_argument("--queries", type=int, default=1000, help="searches timed")
+    parser.add_argument("--vectors", action="store_true", help="also build the memory-mapped vector index")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    root = tempfile.mkdtemp(prefix="bench-kb-")
+    try:
+        docs_dir = os.path.join(root, "docs")
+        os.makedirs(docs_dir)
+        words = make_words(rng)
+        entries = write_files(docs_dir, rng, words, args.docs, args.files)
+        kb = KnowledgeBase(docs_dir, vector_path=os.path.join(root, "vectors.f32") if args.vectors else None)
+
+        start = time.perf_counter()
+        kb.refresh(force=True)
+        build = time.perf_counter() - start
+        stats = kb.stats()
+        print(f"{stats['passages']} passages in {stats['files']} files, {stats['terms']} terms; build {build:.2f}s")
+
+        latencies, first, answered = [], 0, 0
+        for i in rng.integers(0, len(entries), args.queries):
+            query = paraphrase(rng, entries[i]["question"])
+            start = time.perf_counter()
+            result = kb.search(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+            top = result["passages"][:1]
+            hit = bool(top) and top[0]["title"] == entries[i]["question"]
+            first += hit
+            answered += hit and result["answered"]
+        latencies.sort()
+        print(
+            f"search: p50 {statistics.median(latencies):.2f} ms, p95 {latencies[int(0.95 * len(latencies))]:.2f} ms, "
+            f"max {latencies[-1]:.2f} ms; source entry ranked first in {first / args.queries:.1%}, "
+            f"and answered in {answered / args.queries:.1%}"
+        )
+        wrong = sum(kb.search(unanswerable(rng, words))["answered"] for _ in range(args.queries))
+        print(f"questions on topics not in the knowledge base answered anyway: {wrong / args.queries:.1%}")
+
+        path = os.path.join(docs_dir, "faq_0000.jsonl")
+        with open(path, "a", encoding="utf-8") as out:
+            out.write(json.dumps(entry(rng, words, len(entries))) + "\n")
+        start = time.perf_counter()
+        changed = kb.refresh(force=True)["changed"]
+        print(f"incremental refresh of {changed} changed file: {(time.perf_counter() - start) * 1000:.1f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
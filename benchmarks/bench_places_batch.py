@@ -0,0 +1,89 @@
+"""Wall-clock of sequential vs. batched geocoding against a local stub Places API.
+
+Usage:
+    python -m benchmarks.bench_places_batch [--latency 0.05] [--sizes 1,2,5,10,20]
+
+The stub server sleeps `--latency` seconds per request to mimic the round-trip to
+maps.googleapis.com; every run uses a fresh cache so each query hits the server.
+"""
+
+import argparse
+import json
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def start_stub_server(latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            # Headers and body go out in separate writes; avoid Nagle stalls on keep-alive.
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def do_GET(self):
+            time.sleep(latency)
+            query = parse_qs(urlparse(self.path).query).get("input", [""])[0]
+            body = json.dumps({
+                "candidates": [{
+                    "place_id": f"id-{query}",
+                    "name": query,
+                    "formatted_address": f"{query} street",
+                    "geometry": {"location": {"lat": 48.85, "lng": 2.29}},
+                }]
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per stub request")
+    parser.add_argument("--sizes", default="1,2,5,10,20", help="comma-separated batch sizes")
+    args = parser.parse_args()
+
+    server = start_stub_server(args.latency)
+    os.environ["GOOGLE_PLACES_API_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    # Imported late so the module picks up the stub base URL.
+    from agents.tools.cache import TTLCache
+    from agents.tools.places import PlacesService
+
+    print(f"stub latency {args.latency * 1000:.0f} ms/request")
+    print(f"{'batch':>5}  {'sequential':>11}  {'batched':>9}  {'speedup':>7}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        queries = [f"Place {i} Paris" for i in range(size)]
+
+        service = PlacesService(cache=TTLCache(maxsize=1024))
+        start = time.perf_counter()
+        for query in queries:
+            service.find_place_from_text(query)
+        sequential = time.perf_counter() - start
+
+        service = PlacesService(cache=TTLCache(maxsize=1024))
+        start = time.perf_counter()
+        service.find_places_from_text(queries)
+        batched = time.perf_counter() - start
+
+        print(f"{size:>5}  {sequential * 1000:>9.1f}ms  {batched * 1000:>7.1f}ms  {sequential / batched:>6.1f}x")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
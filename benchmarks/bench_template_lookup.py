@@ -0,0 +1,97 @@
+"""Template lookup cost as the code template catalog grows.
+
+Usage:
+    python -m benchmarks.bench_template_lookup [--sizes 0,100,1000,5000] [--lookups 2000]
+
+Each catalog is the built-in templates plus `size` synthetic ones spread over the
+same languages, each triggered by its own keyword pair. Lookups use realistic
+descriptions (including a few that trigger synthetic templates) and are timed
+against the registry and against a linear scan that tests every template in
+priority order, the way the old if/elif chains did.
+"""
+
+import argparse
+import random
+import time
+
+from agents.sub_agents.Content_Creation_Generation.templates import (
+    ANY_LANGUAGE,
+    CODE_TEMPLATES,
+    CodeTemplate,
+    TemplateRegistry,
+)
+
+LANGUAGES = ("python", "swift", "javascript", "reactnative", "flutter", "java", "go")
+
+DESCRIPTIONS = (
+    "a dashboard with charts for the sales team",
+    "login form with fields for email and password",
+    "table of customers",
+    "write a for loop that prints numbers",
+    "sort a list of prices",
+    "binary search over an array",
+    "window with a button and an input box",
+    "a class for a bank account",
+    "explain recursion",
+)
+
+
+def synthetic_templates(size: int, seed: int = 0):
+    rng = random.Random(seed)
+    for i in range(size):
+        yield CodeTemplate(
+            name=f"synthetic/{i}",
+            languages=(rng.choice(LANGUAGES),),
+            keywords=((f"widget{i:05d}",), (rng.choice(("panel", "view", "screen")),)),
+            priority=rng.randint(1, 99),
+            code=f"// synthetic template {i}",
+        )
+
+
+def linear_lookup(templates, description: str, language: str):
+    """Reference lookup: test every template, highest priority first."""
+    desc_lower = description.lower()
+    own_default = any(not t.keywords and language in t.languages for t in templates)
+    for t in templates:
+        if language in t.languages or (not own_default and ANY_LANGUAGE in t.languages):
+            if all(any(kw in desc_lower for kw in group) for group in t.keywords):
+                return t
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="0,100,1000,5000", help="comma-separated synthetic template counts")
+    parser.add_argument("--lookups", type=int, default=2000, help="lookups timed per catalog")
+    args = parser.parse_args()
+
+    print(f"{'templates':>9} {'registry us/lookup':>19} {'linear us/lookup':>17}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        templates = list(CODE_TEMPLATES) + list(synthetic_templates(size))
+        registry = TemplateRegistry(templates)
+        registry.match("warm up", "python")  # builds the keyword automaton
+        ordered = sorted(templates, key=lambda t: (-t.priority, ANY_LANGUAGE in t.languages))
+
+        rng = random.Random(1)
+        queries = []
+        for _ in range(args.lookups):
+            description = rng.choice(DESCRIPTIONS)
+            if size and rng.random() < 0.2:
+                description += f" with a widget{rng.randrange(size):05d} panel"
+            queries.append((description, rng.choice(LANGUAGES)))
+
+        start = time.perf_counter()
+        for description, language in queries:
+            registry.match(description, language)
+        indexed = (time.perf_counter() - start) / len(queries) * 1e6
+
+        start = time.perf_counter()
+        for description, language in queries:
+            linear_lookup(ordered, description, language)
+        linear = (time.perf_counter() - start) / len(queries) * 1e6
+
+        print(f"{len(templates):>9} {indexed:>19.1f} {linear:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Cost of the "is this input a URL?" check that improve_code runs on every input.
+
+Usage:
+    python -m benchmarks.bench_url_check [--sizes 10000,100000,1000000,10000000] [--repeat 5]
+
+Compares the previous check (pattern compiled per call, run on the stripped
+input) with `agents.tools.links.is_url` on multi-line code pastes and on
+single-line minified blobs, and shows what share of `improve_code` the check
+takes now.
+"""
+
+import argparse
+import re
+import statistics
+import time
+
+from agents.sub_agents.Content_Creation_Generation.Content_Creation_Generation import ContentCreationGenerationAgent
+from agents.tools.links import is_url
+
+CODE_LINES = (
+    "import os\n",
+    "def load(path)\n",
+    "    with open(os.path.join('data', path)) as f:\n",
+    "        return f.read()\n",
+    "class Loader\n",
+    "    pass\n",
+)
+
+
+def old_is_url(text: str) -> bool:
+    url_regex = re.compile(
+        r'^(https?://)?'  # http:// or https://
+        r'([a-zA-Z0-9.-]+(\.[a-zA-Z]{2,}))'  # domain
+        r'(:\d+)?'  # optional port
+        r'(/[^\s]*)?$'  # path
+    )
+    return bool(url_regex.match(text.strip()))
+
+
+def code_input(size: int) -> str:
+    chunk = "".join(CODE_LINES)
+    return (chunk * (size // len(chunk) + 1))[:size]
+
+
+def blob_input(size: int) -> str:
+    # Minified data with no whitespace: dotted tokens make the old pattern backtrack.
+    chunk = "abc.defgh-0123."
+    return "  " + (chunk * (size // len(chunk) + 1))[:size] + "\n"
+
+
+def best_ms(func, text: str, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000,10000000", help="comma-separated input sizes in chars")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is shown)")
+    args = parser.parse_args()
+
+    agent = ContentCreationGenerationAgent()
+    print(f"{'input':<6} {'chars':>10} {'old check ms':>13} {'is_url ms':>10} {'improve_code ms':>16}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        for kind, text in (("code", code_input(size)), ("blob", blob_input(size))):
+            old = best_ms(old_is_url, text, args.repeat)
+            new = best_ms(is_url, text, args.repeat)
+            improve = statistics.median(
+                best_ms(agent.improve_code, text, 1) for _ in range(min(args.repeat, 3))
+            ) if kind == "code" else float("nan")
+            print(f"{kind:<6} {size:>10} {old:>13.3f} {new:>10.4f} {improve:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Statistics of `Aggregate` must not depend on how a table is split into chunks."""
+
+import math
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from agents.sub_agents.Data_Analysis import analytics
+from agents.sub_agents.Data_Analysis.analytics import MAX_TRACKED_VALUES, Aggregate, read_chunks
+from agents.sub_agents.Data_Analysis.approx import approximate_query
+
+
+def aggregate(path, chunk_rows):
+    result = Aggregate()
+    for frame in read_chunks(str(path), "csv", chunk_rows):
+        result.update(frame)
+    return result
+
+
+def assert_same(a, b):
+    assert a.keys() == b.keys()
+    for key in a:
+        if isinstance(a[key], dict):
+            assert_same(a[key], b[key])
+        elif isinstance(a[key], float):
+            assert math.isclose(a[key], b[key], rel_tol=1e-9, abs_tol=1e-9), key
+        elif key == "top_values":  # ties may come in either order
+            assert sorted(a[key]) == sorted(b[key])
+        else:
+            assert a[key] == b[key], key
+
+
+@pytest.fixture
+def mixed_csv(tmp_path):
+    rows = ["code,x,y,label"]
+    for i in range(200):
+        # `code` is numeric until row 150, then text; `label` is text throughout.
+        code = f"c{i % 7}" if i >= 150 else str(i % 11)
+        rows.append(f"{code},{i * 0.5},{(i * 37) % 101},{'ab'[i % 2]}")
+    path = tmp_path / "mixed.csv"
+    path.write_text("\n".join(rows) + "\n")
+    return path
+
+
+def test_summary_is_independent_of_chunk_size(mixed_csv):
+    whole = aggregate(mixed_csv, 1000).summary()
+    assert whole["columns"]["code"]["type"] == "text"
+    for chunk_rows in (1, 2, 7, 64):
+        assert_same(aggregate(mixed_csv, chunk_rows).summary(), whole)
+
+
+def test_merge_is_independent_of_which_side_saw_text(mixed_csv):
+    whole = aggregate(mixed_csv, 1000).summary()
+    frame = pd.read_csv(mixed_csv)
+    head, tail = Aggregate(), Aggregate()
+    head.update(frame.iloc[:150])
+    tail.update(frame.iloc[150:])
+    assert_same(head.merge(tail).summary(), whole)
+
+
+def test_example_from_a_numeric_then_text_column(tmp_path):
+    path = tmp_path / "t.csv"
+    path.write_text("a,b\n1,2\n3,4\nhello,5\n")
+    column = aggregate(path, 2).summary()["columns"]["a"]
+    assert column["distinct"] == 3 and not column["distinct_is_lower_bound"]
+    assert column["count"] == 3
+    result = approximate_query("SELECT COUNT(DISTINCT a) FROM t", {"t": aggregate(path, 2)}, 10)
+    assert result["rows"] == [[3]]
+    assert result["error_bounds"]["estimators"] == ["exact"]
+
+
+def test_untracked_numeric_history_is_a_lower_bound(tmp_path):
+    count = MAX_TRACKED_VALUES + 10
+    path = tmp_path / "wide.csv"
+    path.write_text("a\n" + "\n".join(str(i) for i in range(count)) + "\nhello\n")
+    column = aggregate(path, 1000).summary()["columns"]["a"]
+    assert column["type"] == "text"
+    assert column["count"] == count + 1
+    assert column["distinct_is_lower_bound"]
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    # Sources are resolved under the default data root, `data` in the working directory.
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    return tmp_path / "data"
+
+
+def test_appended_rows_are_scanned_alone(data_dir, monkeypatch):
+    path = data_dir / "log.csv"
+    path.write_text("a,b\n1,x\n2,y\n")
+    seen = []
+    scan = analytics.analyze_source
+    monkeypatch.setattr(analytics, "analyze_source", lambda *args: seen.append(args[2]) or scan(*args))
+    engine = analytics.AnalyticsEngine(max_workers=1)
+    engine.analyze(["log.csv"])
+    with open(path, "a") as f:
+        f.write("3,z\n4\n")
+    [result] = engine.analyze(["log.csv"])
+    assert result["mode"] == "append" and result["rows_scanned"] == 2
+    assert_same(result["aggregate"].summary(), aggregate(path, 1000).summary())
+    # Only what identifies the earlier scan goes to the scan, not the cached aggregate.
+    assert set(seen[1]) == {"format", "fingerprint", "header"}
+
+
+def test_appended_rows_with_extra_fields_fail_like_a_full_scan(data_dir):
+    path = data_dir / "log.csv"
+    path.write_text("a,b\n1,2\n3,4\n")
+    engine = analytics.AnalyticsEngine(max_workers=1)
+    engine.analyze(["log.csv"])
+    with open(path, "a") as f:
+        f.write("5,6,7\n8,9\n")
+    [appended] = engine.analyze(["log.csv"])
+    [full] = analytics.AnalyticsEngine(max_workers=1).analyze(["log.csv"])
+    assert full["status"] == "error" and "ParserError" in full["error_message"]
+    assert appended["status"] == "error" and appended["error_message"] == full["error_message"]
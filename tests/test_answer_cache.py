@@ -0,0 +1,76 @@
+"""Reuse of customer answers across near-duplicate inquiries and knowledge-base changes."""
+
+import json
+import pathlib
+import shutil
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from agents.sub_agents.Customer_Service.answer_cache import AnswerCache, jaccard, shingles
+from agents.sub_agents.Customer_Service.Customer_Service_Engagement import CustomerServiceEngagementAgent
+from agents.sub_agents.Customer_Service.knowledge_base import KnowledgeBase
+
+INQUIRY = "How long does standard shipping take to Canada?"
+NEAR = "How long does standard shipping take to Canada usually?"  # Jaccard 0.82
+FAR = "how long does shipping take to Canada"  # Jaccard 0.6
+
+
+def test_near_duplicates_hit_and_others_miss():
+    assert jaccard(shingles(INQUIRY), shingles(NEAR)) >= 0.7 > jaccard(shingles(INQUIRY), shingles(FAR))
+    cache = AnswerCache(threshold=0.7)
+    cache.store("handle_inquiry", INQUIRY, "5-7 days", compute_ms=12.0)
+    value, info = cache.lookup("handle_inquiry", NEAR)
+    assert value == "5-7 days" and info["match"] == "near" and info["matched_inquiry"] == INQUIRY
+    assert cache.lookup("handle_inquiry", FAR) is None
+    assert cache.lookup("provide_info", INQUIRY) is None
+
+
+def test_user_specific_answers_stay_with_their_tenant():
+    cache = AnswerCache()
+    cache.store("order_status", INQUIRY, "shipped", tenant="alice")
+    assert cache.lookup("order_status", INQUIRY, tenant="alice")[0] == "shipped"
+    assert cache.lookup("order_status", INQUIRY, tenant="bob") is None
+    assert cache.lookup("order_status", INQUIRY) is None
+
+
+def test_a_new_version_drops_every_answer():
+    version = {"kb": 1}
+    cache = AnswerCache(version=lambda: version["kb"])
+    cache.store("handle_inquiry", INQUIRY, "5-7 days")
+    assert cache.lookup("handle_inquiry", INQUIRY) is not None
+    version["kb"] = 2
+    assert cache.lookup("handle_inquiry", INQUIRY) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+@pytest.fixture
+def kb(tmp_path):
+    shutil.copytree(pathlib.Path(__file__).parent / "data" / "kb", tmp_path / "kb")
+    return KnowledgeBase(str(tmp_path / "kb"), refresh_seconds=0)
+
+
+def agent(kb, answers):
+    session = CustomerServiceEngagementAgent()
+    session.knowledge_base, session.answers = kb, answers
+    return session
+
+
+def test_customers_share_knowledge_base_answers(kb):
+    answers = AnswerCache(version=kb.current_version)
+    first = agent(kb, answers).handle_inquiry("c1", "How do I reset my password?")
+    assert first["status"] == "resolved" and not first["cache"]["hit"]
+    # Another customer, in another session, asking the same thing in other words.
+    second = agent(kb, answers).handle_inquiry("c2", "how can I reset my password")
+    assert second["cache"]["hit"] and second["customer_id"] == "c2"
+    assert second["response"] == first["response"]
+
+
+def test_changing_the_knowledge_base_invalidates_answers(kb, tmp_path):
+    answers = AnswerCache(version=kb.current_version)
+    agent(kb, answers).handle_inquiry("c1", "How do I reset my password?")
+    with open(tmp_path / "kb" / "faq.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps({"question": "Do you ship to Mars?", "answer": "Not yet."}) + "\n")
+    again = agent(kb, answers).handle_inquiry("c2", "How do I reset my password?")
+    assert not again["cache"]["hit"]
@@ -0,0 +1,80 @@
+"""Error bounds of `approximate_query` answered from the row sample and from kept top values."""
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("duckdb")
+
+from agents.sub_agents.Data_Analysis.analytics import MAX_TRACKED_VALUES, Aggregate
+from agents.sub_agents.Data_Analysis.approx import Unsupported, approximate_query
+from agents.sub_agents.Data_Analysis.sketches import SAMPLE_ROWS
+
+ROWS = 3 * SAMPLE_ROWS
+
+
+def aggregate(frame, chunk_rows=5000):
+    result = Aggregate()
+    for start in range(0, len(frame), chunk_rows):
+        result.update(frame.iloc[start:start + chunk_rows])
+    return result
+
+
+@pytest.fixture(scope="module")
+def table():
+    # More rows than the sample keeps, so filtered aggregates are estimated.
+    frame = pd.DataFrame({
+        "c": [f"k{i % 50}" if i % 1000 else "k17" for i in range(ROWS)],
+        "v": [float(i % 97) for i in range(ROWS)],
+    })
+    return frame, aggregate(frame)
+
+
+def test_filtered_counts_sums_and_means_are_sampled_with_bounds(table):
+    frame, agg = table
+    result = approximate_query("SELECT COUNT(*), SUM(v), AVG(v) FROM t WHERE v < 40", {"t": agg}, 10)
+    assert result["error_bounds"]["estimators"] == ["sample"] * 3
+    exact = frame[frame.v < 40].v
+    for (low, high), value in zip(result["error_bounds"]["intervals"][0], [len(exact), exact.sum(), exact.mean()]):
+        assert low <= value <= high
+
+
+def test_count_intervals_stay_above_the_rows_sampled(table):
+    _, agg = table
+    # Only a couple of matching rows are sampled, so the normal interval reaches below zero.
+    result = approximate_query("SELECT COUNT(*) FROM t WHERE c = 'k3' AND v = 3", {"t": agg}, 10)
+    low, high = result["error_bounds"]["intervals"][0][0]
+    assert 0 < low <= result["rows"][0][0] <= high
+
+    result = approximate_query("SELECT COUNT(*) FROM t WHERE c = 'missing'", {"t": agg}, 10)
+    assert result["rows"] == [[0]]
+    assert result["error_bounds"]["intervals"][0][0][0] == 0
+
+
+@pytest.mark.parametrize("item", ["MIN(v)", "MAX(v)", "STDDEV(v)", "MEDIAN(v)", "QUANTILE(v, 0.9)"])
+def test_order_statistics_with_a_filter_run_exactly(table, item):
+    _, agg = table
+    with pytest.raises(Unsupported):
+        approximate_query(f"SELECT {item} FROM t WHERE v < 40", {"t": agg}, 10)
+    with pytest.raises(Unsupported):
+        approximate_query(f"SELECT c, {item} FROM t GROUP BY c", {"t": agg}, 10)
+
+
+def test_top_values_of_a_column_with_few_values_are_exact(table):
+    frame, agg = table
+    result = approximate_query("SELECT c, COUNT(*) FROM t GROUP BY c ORDER BY COUNT(*) DESC LIMIT 3", {"t": agg}, 10)
+    expected = frame.c.value_counts()
+    assert result["rows"][0] == ["k17", int(expected["k17"])]
+    assert [count for _, count in result["rows"]] == expected.iloc[:3].tolist()
+    assert result["error_bounds"]["estimators"] == ["exact", "exact"]
+    assert result["error_bounds"]["intervals"] == [[None, None]] * 3
+
+
+def test_top_values_of_a_truncated_column_are_bounded():
+    rows = 3 * MAX_TRACKED_VALUES
+    frame = pd.DataFrame({"c": ["hot" if i % 10 == 0 else f"u{i}" for i in range(rows)]})
+    agg = aggregate(frame)
+    result = approximate_query("SELECT c, COUNT(*) FROM t GROUP BY c ORDER BY COUNT(*) DESC LIMIT 1", {"t": agg}, 10)
+    assert result["rows"][0][0] == "hot"
+    assert result["error_bounds"]["estimators"][1] == "count_min"
+    low, high = result["error_bounds"]["intervals"][0][1]
+    assert low <= rows // 10 <= high
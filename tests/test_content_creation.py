@@ -0,0 +1,71 @@
+"""Linked code and descriptions fetched by the content tools, with the sync and async clients."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("google.adk")
+pytest.importorskip("httpx")
+
+from agents.sub_agents.Content_Creation_Generation.Content_Creation_Generation import ContentCreationGenerationAgent
+from agents.tools.http_client import close_async_http_client
+
+CODE = b"def greet(name)\n    return 'hi ' + name\n"
+
+
+@pytest.fixture(scope="module")
+def server():
+    import http.server
+    import threading
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(CODE)))
+            self.end_headers()
+            self.wfile.write(CODE)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+
+def run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await close_async_http_client()
+
+    return asyncio.run(main())
+
+
+def test_linked_code_is_fetched_alike_by_both_variants(server):
+    agent = ContentCreationGenerationAgent()
+    url = f"{server}/greet.py"
+    sync = agent.improve_code(url)
+    async_ = run(agent.improve_code_async(url))
+    # The second run finds the fixed block in the improver's cache.
+    assert {**async_, "pipeline": None} == {**sync, "pipeline": None}
+    assert "def greet(name):" in async_["improved_code"]
+    assert async_["fetch"]["bytes_read"] == len(CODE) and not async_["fetch"]["truncated"]
+
+
+def test_linked_descriptions_are_fetched_alike_by_both_variants(server):
+    agent = ContentCreationGenerationAgent()
+    url = f"{server}/ui.txt"
+    result = run(agent.generate_code_from_text_async(url, "python"))
+    assert result == agent.generate_code_from_text(url, "python")
+    assert result["status"] == "success" and result["fetch"]["url"] == url
+
+
+def test_plain_input_needs_no_fetch():
+    agent = ContentCreationGenerationAgent()
+    result = run(agent.improve_code_async("class A\n    pass\n"))
+    assert "fetch" not in result and "class A:" in result["improved_code"]
+    assert run(agent.generate_code_from_text_async("   "))["status"] == "error"
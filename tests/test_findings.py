@@ -0,0 +1,51 @@
+"""Findings shared between sessions through the cache."""
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from agents.sub_agents.Data_Analysis.analytics import Aggregate
+from agents.sub_agents.Data_Analysis.findings import FindingsPresenter
+
+
+def datasets(source):
+    aggregate = Aggregate()
+    aggregate.update(pd.DataFrame({"x": range(50), "y": [i % 3 for i in range(50)]}))
+    return {source: {"table": "sales", "analysis_id": "abc", "source": source, "aggregate": aggregate}}
+
+
+def test_each_session_sees_its_own_source():
+    presenter = FindingsPresenter()
+    first, cache = presenter.present(datasets("sales.csv"), "summary")
+    assert cache["findings"] == "built" and first["datasets"][0]["source"] == "sales.csv"
+    second, cache = presenter.present(datasets("file:///srv/data/sales.csv"), "summary")
+    assert cache["findings"] == "cached" and second["datasets"][0]["source"] == "file:///srv/data/sales.csv"
+    assert first["datasets"][0]["source"] == "sales.csv"
+
+
+def test_unknown_formats_are_rejected():
+    with pytest.raises(ValueError):
+        FindingsPresenter().present(datasets("sales.csv"), "slides")
+
+
+def test_present_findings_falls_back_to_summary():
+    pytest.importorskip("duckdb")
+    from agents.sub_agents.Data_Analysis.Data_Analysis_Insights_agent import DataAnalysisInsightsAgent
+
+    agent = DataAnalysisInsightsAgent()
+    agent.datasets = datasets("sales.csv")
+    findings = agent.present_findings("board", format="slides")
+    assert findings["format"] == "summary" and findings["content"]["datasets"][0]["table"] == "sales"
+
+
+def test_most_frequent_values_of_identifier_columns_are_not_highlighted():
+    from agents.sub_agents.Data_Analysis.findings import highlights
+
+    aggregate = Aggregate()
+    aggregate.update(pd.DataFrame({
+        "id": [f"order-{i}" for i in range(50)],
+        "ref": [f"r{i}" for i in range(48)] + ["r0", "r1"],
+        "region": ["north", "south", "north", "east", "north"] * 10,
+    }))
+    notes = highlights("sales", aggregate.summary(), aggregate.rows)
+    assert notes == ["sales.region: most frequent value is 'north' (60.0% of rows)"]
@@ -0,0 +1,85 @@
+"""The shared HTTP clients: lifetime of the per-loop async clients, and `fetch_text` limits."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from agents.tools.http_client import AsyncHttpClient, HttpClient, close_async_http_client, get_async_http_client
+
+
+def test_client_is_closed_with_its_loop():
+    async def main():
+        client = get_async_http_client()
+        assert get_async_http_client() is client
+        return client
+
+    client = asyncio.run(main())
+    assert client.client.is_closed
+
+
+def test_client_can_be_closed_explicitly():
+    async def main():
+        client = get_async_http_client()
+        await close_async_http_client()
+        assert client.client.is_closed
+        assert get_async_http_client() is not client
+
+    asyncio.run(main())
+
+
+@pytest.fixture(scope="module")
+def server():
+    import http.server
+    import threading
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = b"a" * int(self.path.strip("/"))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+
+def fetch_async(url, **kwargs):
+    async def main():
+        client = AsyncHttpClient()
+        try:
+            return await client.fetch_text(url, **kwargs)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(main())
+
+
+# The async client must report the same results as the sync one.
+FETCHERS = [lambda url, **kwargs: HttpClient().fetch_text(url, **kwargs), fetch_async]
+
+
+@pytest.mark.parametrize("fetch", FETCHERS, ids=["sync", "async"])
+@pytest.mark.parametrize("size, truncated", [(99, False), (100, False), (101, True), (20000, True)])
+def test_fetch_text_truncates_only_past_max_bytes(server, fetch, size, truncated):
+    result = fetch(f"{server}/{size}", max_bytes=100)
+    assert result.truncated == truncated
+    assert result.text == "a" * min(size, 100)
+    assert result.bytes_read == min(size, 100)
+
+
+@pytest.mark.parametrize("fetch", FETCHERS, ids=["sync", "async"])
+@pytest.mark.parametrize("size, truncated", [(99, False), (100, False), (101, True), (20000, True)])
+def test_fetch_text_truncates_only_past_max_chars(server, fetch, size, truncated):
+    result = fetch(f"{server}/{size}", max_chars=100)
+    assert result.truncated == truncated
+    assert result.text == "a" * min(size, 100)
+    assert result.encoding == "utf-8" and not result.binary
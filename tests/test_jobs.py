@@ -0,0 +1,123 @@
+"""Owners, submit-time checks and resumes of `JobEngine` jobs."""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from agents.sub_agents.Automation import processes as builtin_processes
+from agents.sub_agents.Automation.jobs import FAILED, RUN_LOCK, SUCCEEDED, JobEngine, JobError, ProcessRegistry
+
+registry = ProcessRegistry()
+
+
+# Steps run in spawned pool workers, which import them from this module.
+@registry.step("flaky")
+def first(params, inputs):
+    with open(params["log"], "a", encoding="utf-8") as f:
+        f.write("first\n")
+    return 1
+
+
+@registry.step("flaky", requires=("first",))
+def second(params, inputs):
+    if not os.path.exists(params["marker"]):
+        open(params["marker"], "w").close()
+        raise RuntimeError("first attempt fails")
+    return inputs["first"] + 1
+
+
+def wait(engine, job_id, owner=""):
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        job = engine.status(job_id, owner)
+        if job["status"] in (SUCCEEDED, FAILED):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = JobEngine(registry, job_dir=str(tmp_path / "jobs"), max_workers=1)
+    yield engine
+    engine.shutdown()
+
+
+@pytest.fixture
+def flaky(engine, tmp_path):
+    params = {"log": str(tmp_path / "log"), "marker": str(tmp_path / "marker")}
+    job = engine.submit("flaky", params, owner="alice")
+    assert wait(engine, job["job_id"], "alice")["status"] == FAILED
+    return job["job_id"], params
+
+
+def test_resume_reruns_only_unfinished_steps(engine, flaky):
+    job_id, params = flaky
+    engine.resume(job_id, "alice")
+    job = wait(engine, job_id, "alice")
+    assert job["status"] == SUCCEEDED
+    assert job["steps"]["second"]["output"] == 2
+    with open(params["log"], encoding="utf-8") as f:
+        assert f.read() == "first\n"
+    assert not os.path.exists(os.path.join(engine.job_dir, job_id, RUN_LOCK))
+    with pytest.raises(JobError, match="already succeeded"):
+        engine.resume(job_id, "alice")
+
+
+def test_jobs_are_unknown_to_other_owners(engine, flaky):
+    job_id, _ = flaky
+    with pytest.raises(JobError, match="Unknown job"):
+        engine.status(job_id, "bob")
+    with pytest.raises(JobError, match="Unknown job"):
+        engine.resume(job_id, "bob")
+    assert engine.status(job_id, "alice")["owner"] == "alice"
+
+
+def test_resume_waits_for_the_process_holding_the_lock(engine, flaky):
+    job_id, _ = flaky
+    lock = os.path.join(engine.job_dir, job_id, RUN_LOCK)
+    with open(lock, "w", encoding="utf-8") as f:
+        f.write(str(os.getppid()))
+    with pytest.raises(JobError, match="still running"):
+        engine.resume(job_id, "alice")
+
+    # A lock left by a process that has exited is taken over.
+    gone = subprocess.Popen([sys.executable, "-c", "pass"])
+    gone.wait()
+    with open(lock, "w", encoding="utf-8") as f:
+        f.write(str(gone.pid))
+    engine.resume(job_id, "alice")
+    assert wait(engine, job_id, "alice")["status"] == SUCCEEDED
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    # Sources are resolved under the default data root, `data` in the working directory.
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "outside.csv").write_text("a\n1\n")
+    return tmp_path / "data"
+
+
+@pytest.mark.parametrize("path", ["../outside.csv", "missing.csv"])
+def test_csv_profile_paths_are_checked_on_submit(data_dir, tmp_path, path):
+    engine = JobEngine(builtin_processes.processes, job_dir=str(tmp_path / "jobs"))
+    with pytest.raises(JobError, match=repr(path)):
+        engine.submit(builtin_processes.CSV_PROFILE, {"path": path})
+    assert not os.path.exists(engine.job_dir)
+
+
+def test_csv_profile_runs(data_dir, tmp_path):
+    (data_dir / "t.csv").write_text("a,b\n1,x\n3,y\n")
+    engine = JobEngine(builtin_processes.processes, job_dir=str(tmp_path / "jobs"), max_workers=1)
+    try:
+        job = wait(engine, engine.submit(builtin_processes.CSV_PROFILE, {"path": "t.csv"})["job_id"])
+    finally:
+        engine.shutdown()
+    assert job["status"] == SUCCEEDED
+    assert job["steps"]["row_count"]["output"] == 2
+    assert job["steps"]["columns"]["output"] == {"a": "number", "b": "string"}
+    assert job["steps"]["numeric_summary"]["output"]["a"]["max"] == 3
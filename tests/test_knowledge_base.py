@@ -0,0 +1,55 @@
+"""Which inquiries the knowledge base answers, against labelled questions (data/kb_queries.json)
+on a sample FAQ (data/kb)."""
+
+import json
+import pathlib
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from agents.sub_agents.Customer_Service.knowledge_base import KnowledgeBase
+
+DATA = pathlib.Path(__file__).parent / "data" / "kb"
+QUERIES = json.loads((DATA.parent / "kb_queries.json").read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="module")
+def kb():
+    return KnowledgeBase(str(DATA))
+
+
+@pytest.mark.parametrize("query, title", QUERIES["answered"])
+def test_answers_with_the_right_passage(kb, query, title):
+    result = kb.search(query)
+    assert result["answered"]
+    assert result["passages"][0]["title"] == title
+
+
+def test_specific_details_do_not_sink_a_match(kb):
+    # The order number is not in the index and must not count against the match.
+    result = kb.search("my order #48213 hasn't arrived, how long does shipping take?")
+    assert result["answered"]
+    assert result["passages"][0]["title"] == "How long does shipping take?"
+
+
+def test_a_shared_topic_word_is_not_an_answer(kb):
+    result = kb.search("How do I cancel my order?")
+    assert result["passages"][0]["title"] == "How do I cancel my subscription?"
+    assert not result["answered"]
+
+
+# Questions sharing two words with an unrelated entry, which word matching cannot tell apart.
+KNOWN_FALSE_POSITIVES = {
+    "how do I merge two accounts": "shares two words with the two-factor authentication entry",
+    "how do I print a receipt for my tax return": "a tax 'return' matches returning an item",
+}
+
+
+@pytest.mark.parametrize("query", [
+    pytest.param(query, marks=pytest.mark.xfail(strict=True, reason=KNOWN_FALSE_POSITIVES[query]))
+    if query in KNOWN_FALSE_POSITIVES else query
+    for query in QUERIES["escalated"]
+])
+def test_unanswerable_questions_are_escalated(kb, query):
+    assert not kb.search(query)["answered"]
@@ -0,0 +1,48 @@
+"""How long `LinkProbe` reuses what a probe found."""
+
+import http.server
+import threading
+
+import pytest
+
+pytest.importorskip("requests")
+
+from agents.tools.links import LinkProbe
+
+
+@pytest.fixture
+def server():
+    state = {"status": 404, "requests": 0}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            state["requests"] += 1
+            self.send_response(state["status"])
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}/page", state
+    httpd.shutdown()
+
+
+def test_error_statuses_are_probed_again_once_their_ttl_passes(server):
+    url, state = server
+    probe = LinkProbe(error_ttl=0)
+    assert probe.probe(url)["status"] == 404
+    state["status"] = 200
+    assert probe.probe(url)["status"] == 200
+    assert probe.probe(url)["status"] == 200
+    assert state["requests"] == 2
+
+
+def test_error_statuses_are_reused_within_their_ttl(server):
+    url, state = server
+    probe = LinkProbe(error_ttl=60)
+    probe.probe(url)
+    assert probe.probe(url)["status"] == 404 and state["requests"] == 1
@@ -0,0 +1,82 @@
+"""Decoding and schema validation of the JSON arguments of the Automation tools."""
+
+import pytest
+
+from agents.sub_agents.Automation import params
+from agents.sub_agents.Automation.params import ParamError, ParamSchemas, compile_schema, normalize_name, param_schemas
+
+
+def errors(schema, value):
+    found = []
+    compile_schema(schema)(value, None, found)
+    return found
+
+
+def test_blank_parameters_decode_to_an_empty_object():
+    assert param_schemas.decode("task", "anything", "  ") == {}
+    assert param_schemas.decode("task", "anything", b'{"a": [1]}') == {"a": [1]}
+    assert param_schemas.decode("task", "anything", {"already": "decoded"}) == {"already": "decoded"}
+
+
+def test_invalid_json_and_oversized_parameters_are_rejected():
+    with pytest.raises(ParamError, match="not valid JSON") as info:
+        param_schemas.decode("task", "anything", "{nope")
+    assert info.value.to_dict()["errors"][0]["path"] == "$"
+    # Three bytes per character: the byte size counts, not the length.
+    with pytest.raises(ParamError, match="9 bytes; the limit is 8"):
+        param_schemas.decode("task", "anything", "€€€", max_bytes=8)
+
+
+def test_errors_name_the_path_of_each_bad_value():
+    with pytest.raises(ParamError) as info:
+        param_schemas.decode("stage", "Testing", '{"test_suites": ["unit", 3], "coverage_target": 120}')
+    assert info.value.errors == [
+        {"path": "$.test_suites[1]", "message": "expected string, got integer"},
+        {"path": "$.coverage_target", "message": "must be <= 100"},
+    ]
+    with pytest.raises(ParamError, match="'deployment'") as info:
+        param_schemas.decode("stage", "deployment", "{}")
+    assert info.value.errors == [{"path": "$", "message": "missing required property 'environment'"}]
+
+
+def test_booleans_are_not_numbers():
+    assert errors({"type": "integer"}, True) == [{"path": "$", "message": "expected integer, got boolean"}]
+    assert errors({"type": ["integer", "boolean"]}, True) == []
+    assert errors({"type": "array", "items": {"type": "number"}}, [1, 2.5, False]) == [
+        {"path": "$[2]", "message": "expected number, got boolean"}
+    ]
+
+
+def test_closed_objects_enums_and_lengths():
+    schema = {
+        "type": "object",
+        "additionalProperties": False,
+        "properties": {"mode": {"enum": ["a", "b"]}, "name": {"type": "string", "minLength": 2}},
+    }
+    assert errors(schema, {"mode": "c", "name": "x", "extra": 1}) == [
+        {"path": "$.mode", "message": "must be one of ['a', 'b']"},
+        {"path": "$.name", "message": "expected at least 2 characters"},
+        {"path": "$", "message": "unexpected property 'extra'"},
+    ]
+
+
+def test_error_reports_are_capped(monkeypatch):
+    monkeypatch.setattr(params, "MAX_REPORTED_ERRORS", 3)
+    assert len(errors({"type": "array", "items": {"type": "string"}}, list(range(10)))) == 3
+
+
+def test_names_fall_back_to_the_default_schema():
+    schemas = ParamSchemas({"process": {"*": {"type": "object"}, "code_review": {"required": ["pr"]}}})
+    assert normalize_name(" Code-Review ") == "code_review"
+    with pytest.raises(ParamError):
+        schemas.decode("process", "Code Review", "{}")
+    with pytest.raises(ParamError, match="Invalid process parameters"):
+        schemas.decode("process", "other", "[]")
+    assert schemas.decode("task", "other", "[]") == []
+
+
+def test_bad_schemas_fail_on_register():
+    with pytest.raises(ValueError, match="pattern"):
+        ParamSchemas().register("task", "t", {"pattern": "x"})
+    with pytest.raises(ValueError, match="decimal"):
+        ParamSchemas().register("task", "t", {"type": "decimal"})
@@ -0,0 +1,89 @@
+"""What the Places geocoding cache keeps, and what each caller gets back."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from agents.tools.cache import TTLCache
+from agents.tools.places import PlacesService
+
+CANDIDATE = {
+    "place_id": "p1",
+    "name": "Louvre",
+    "formatted_address": "Paris",
+    "photos": [{"photo_reference": "ref-1"}, {"photo_reference": "ref-2"}],
+    "geometry": {"location": {"lat": 48.86, "lng": 2.33}},
+}
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setenv("GOOGLE_PLACES_API_KEY", "secret-key")
+    service = PlacesService(TTLCache(maxsize=10, path=str(tmp_path / "places.db"), table="places"))
+    monkeypatch.setattr(service, "_fetch_place", lambda query: service._parse_place({"candidates": [CANDIDATE]}))
+    return service
+
+
+def test_the_api_key_is_not_cached(service, tmp_path):
+    result = service.find_place_from_text("Louvre Paris")
+    assert result["photos"] == [
+        f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=400&photoreference=ref-{i}&key=secret-key"
+        for i in (1, 2)
+    ]
+    assert "secret-key" not in repr(service.cache.get("louvre paris"))
+    assert b"secret-key" not in (tmp_path / "places.db").read_bytes()
+
+
+def test_callers_get_copies(service):
+    first = service.find_place_from_text("Louvre Paris")
+    first["photos"].clear()
+    first["place_name"] = "changed"
+    [second] = service.find_places_from_text(["Louvre Paris"])
+    assert second["place_name"] == "Louvre" and len(second["photos"]) == 2
+
+
+def test_a_body_that_is_not_json_is_an_error(service, monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    from agents.tools import places
+    from agents.tools.http_client import AsyncHttpClient
+
+    client = AsyncHttpClient()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, text="<html>")))
+    monkeypatch.setattr(places, "get_async_http_client", lambda: client)
+    result = asyncio.run(service.find_place_from_text_async("Louvre Paris"))
+    assert result["error"].startswith("Error fetching place data")
+
+
+def test_map_tool_geocodes_each_place_once_without_blocking(service, monkeypatch):
+    pytest.importorskip("httpx")
+    from types import SimpleNamespace
+
+    from agents.tools import places
+
+    queries, running = [], []
+
+    async def fetch(query):
+        queries.append(query)
+        running.append(1)
+        assert len(running) <= 2  # max_workers below
+        await asyncio.sleep(0.01)
+        running.pop()
+        return service._parse_place({"candidates": [dict(CANDIDATE, place_id=query)]})
+
+    monkeypatch.setattr(service, "_fetch_place_async", fetch)
+    monkeypatch.setattr(places, "places_service", service)
+    monkeypatch.setattr(places, "PLACES_BATCH_CONCURRENCY", 2)
+    pois = [{"place_name": name, "address": "Paris"} for name in ("Louvre", "Orsay", "louvre", "Pompidou")]
+    context = SimpleNamespace(state={"trip": {"places": pois}})
+
+    result = asyncio.run(places.map_tool("trip", context))
+    assert sorted(queries) == ["Louvre, Paris", "Orsay, Paris", "Pompidou, Paris"]
+    assert [poi["place_id"] for poi in result["places"]] == [
+        "Louvre, Paris", "Orsay, Paris", "Louvre, Paris", "Pompidou, Paris"
+    ]
+    assert result["places"][1]["lat"] == "48.86"
+    # A second run is served from the cache.
+    asyncio.run(places.map_tool("trip", context))
+    assert len(queries) == 3
@@ -0,0 +1,73 @@
+"""Errors reported by `PythonImprover.improve` against `compile()` on the whole returned code."""
+
+import pathlib
+import random
+
+import pytest
+
+from agents.sub_agents.Content_Creation_Generation.python_improver import PythonImprover
+
+SOURCES = sorted((pathlib.Path(__file__).parents[1] / "agents").rglob("*.py"))
+INSERTS = ["(", ")", "[", "]", "{", "}", ":", "'", '"', '"""', "\n", "    ", "\\", "return ", "yield ", "else:"]
+
+
+def compile_error(code: str):
+    try:
+        compile(code, "<string>", "exec")
+    except SyntaxError as e:
+        return str(e)
+    return None
+
+
+def mutate(rng: random.Random, source: str) -> str:
+    lines = source.split("\n")
+    kind = rng.randrange(4)
+    if kind == 0:  # delete a character
+        i = rng.randrange(len(source))
+        return source[:i] + source[i + 1:]
+    if kind == 1:  # insert a token
+        i = rng.randrange(len(source))
+        return source[:i] + rng.choice(INSERTS) + source[i:]
+    i = rng.randrange(len(lines))
+    if kind == 2:  # drop a line
+        return "\n".join(lines[:i] + lines[i + 1:])
+    return "\n".join(lines[:i] + [lines[i].lstrip()] + lines[i + 1:])  # dedent a line
+
+
+def cases(count: int):
+    rng = random.Random(0)
+    sources = [path.read_text(encoding="utf-8") for path in SOURCES]
+    sources = [source for source in sources if source.strip()]
+    for _ in range(count):
+        yield mutate(rng, rng.choice(sources))
+
+
+@pytest.mark.parametrize("source", list(cases(700)), ids=range(700))
+def test_error_matches_whole_file_compile(source):
+    # A shared cache, as in the service: later cases reuse blocks checked by earlier ones.
+    report = IMPROVER.improve(source)
+    expected = compile_error(report["code"])
+    assert report["error"] == expected
+    if expected is not None:
+        first = report["errors"][0]
+        assert f"{first['message']} (<string>, line {first['line']})" == expected
+
+
+IMPROVER = PythonImprover()
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "import os\n\nfrom __future__ import annotations\n",
+        "x = 1\n\nglobal x\n",
+        "print(x)\n\nif True:\n    global x\n",
+        "def f():\n# comment\n\nx = 1\n",
+        "try:\n    pass\n\nx = 1\n",
+        "x = 1\n\n\ndef f():\n    return (1,\n\n\ny = [2)\n",
+    ],
+)
+def test_errors_spanning_blocks(source):
+    report = PythonImprover().improve(source)
+    assert report["error"] is not None
+    assert report["error"] == compile_error(report["code"])
@@ -0,0 +1,53 @@
+"""Lazy sub-agent stand-ins: building, swapping in and session routing."""
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from google.adk.agents import Agent, LlmAgent
+from google.adk.agents import _agent_router
+from google.adk.events import Event
+from google.adk.sessions import Session
+
+from agents.sub_agents import registry
+from agents.sub_agents.registry import SUB_AGENTS, LazySubAgent, build_sub_agents
+
+
+def root():
+    return Agent(model="gemini-2.0-flash-001", name="root_agent", instruction="route", sub_agents=build_sub_agents())
+
+
+def test_sub_agents_are_stand_ins_until_used():
+    agent = root()
+    assert [sub.name for sub in agent.sub_agents] == list(SUB_AGENTS)
+    assert all(isinstance(sub, LazySubAgent) for sub in agent.sub_agents)
+
+
+def test_eager_sub_agents_are_built_up_front(monkeypatch):
+    monkeypatch.setattr(registry, "EAGER_SUB_AGENTS", True)
+    agents = build_sub_agents()
+    assert [agent.name for agent in agents] == list(SUB_AGENTS)
+    assert not any(isinstance(agent, LazySubAgent) for agent in agents)
+
+
+def test_resolving_swaps_the_real_agent_into_the_parent():
+    agent = root()
+    stand_in = agent.sub_agents[3]
+    real = stand_in.resolve()
+    assert isinstance(real, LlmAgent) and real.name == stand_in.name
+    assert agent.sub_agents[3] is real and real.parent_agent is agent
+    assert stand_in.resolve() is real
+    assert agent.find_agent(real.name) is real
+
+
+def test_cold_start_routes_back_to_the_sub_agent_that_replied():
+    # A persisted session in which the customer service agent replied last, loaded by a fresh process.
+    agent = root()
+    session = Session(id="s", app_name="mybot", user_id="u", events=[
+        Event(author="user", invocation_id="i1"),
+        Event(author="customer_service_agent", invocation_id="i1"),
+        Event(author="user", invocation_id="i2"),
+    ])
+    routed = _agent_router.find_agent_to_run(session, agent)
+    assert routed.name == "customer_service_agent" and isinstance(routed, LlmAgent)
+    assert routed in agent.sub_agents
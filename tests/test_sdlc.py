@@ -0,0 +1,64 @@
+"""Stage ordering, artifact caching and staleness of `SDLCPipeline`."""
+
+import pytest
+
+from agents.sub_agents.Automation.sdlc import PipelineError, SDLCPipeline
+from agents.tools.cache import TTLCache
+
+PLANNING = {"requirements": "login\nsignup"}
+DEPLOYMENT = {"environment": "staging"}
+
+
+@pytest.fixture
+def pipeline():
+    return SDLCPipeline(cache=TTLCache(maxsize=100))
+
+
+def run_all(pipeline, project="p", tenant=""):
+    for stage, details in [("planning", PLANNING), ("development", {}), ("testing", {}), ("deployment", DEPLOYMENT)]:
+        result = pipeline.run(project, stage, details, tenant=tenant)
+    return result
+
+
+def test_stages_build_on_the_previous_artifact(pipeline):
+    result = run_all(pipeline)
+    assert result["artifact"]["gated_by"] == {"test_suites": 2, "coverage_target": 80}
+    assert result["artifact"]["version"] == "main"
+    assert [entry["stage"] for entry in result["pipeline"]] == ["planning", "development", "testing", "deployment"]
+
+
+def test_unchanged_stages_come_from_the_cache(pipeline):
+    run_all(pipeline)
+    result = pipeline.run("p", "deployment", DEPLOYMENT)
+    assert (result["stages_run"], result["stages_skipped"]) == (0, 4)
+    # The cache is keyed by content, so another project with the same details reuses it.
+    assert run_all(pipeline, project="q")["stages_skipped"] == 4
+
+
+def test_a_stage_needs_its_earlier_stages(pipeline):
+    with pytest.raises(PipelineError, match="run planning, development first"):
+        pipeline.run("p", "testing", {})
+    with pytest.raises(PipelineError, match="Unknown SDLC stage"):
+        pipeline.run("p", "review", {})
+
+
+def test_changing_an_earlier_stage_marks_later_ones_stale(pipeline):
+    run_all(pipeline)
+    result = pipeline.run("p", "planning", {"requirements": ["login"]})
+    # Development was built from the old plan; the stages after it still match their input.
+    assert result["stale_stages"] == ["development"]
+    assert pipeline.status("p")["stages"]["development"]["stale"]
+
+    # Rerunning the last stage rebuilds the stale ones from the new plan.
+    result = pipeline.run("p", "deployment", DEPLOYMENT)
+    assert result["stages_run"] == 3
+    assert result["artifact"]["gated_by"]["test_suites"] == 1
+    assert not any(stage["stale"] for stage in pipeline.status("p")["stages"].values())
+
+
+def test_projects_are_kept_per_tenant(pipeline):
+    pipeline.run("p", "planning", PLANNING, tenant="alice")
+    with pytest.raises(PipelineError):
+        pipeline.run("p", "development", {}, tenant="bob")
+    assert pipeline.status("p", tenant="bob")["stages"] == {}
+    assert list(pipeline.status("p", tenant="alice")["stages"]) == ["planning"]
@@ -0,0 +1,39 @@
+"""Single-flight runs of `CachedAgentTool` when the call running the agent is cancelled."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from google.adk.tools.agent_tool import AgentTool
+
+from agents.tools.search import CachedAgentTool, _search_agent
+
+
+def test_followers_take_over_a_cancelled_run(monkeypatch):
+    runs = []
+
+    async def run_async(self, *, args, tool_context):
+        runs.append(args["request"])
+        await asyncio.sleep(0.05)
+        return f"answer {len(runs)}"
+
+    monkeypatch.setattr(AgentTool, "run_async", run_async)
+    tool = CachedAgentTool(agent=_search_agent)
+
+    async def main():
+        args = {"request": "Museums in Lisbon"}
+        leader = asyncio.create_task(tool.run_async(args=args, tool_context=None))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(tool.run_async(args=args, tool_context=None)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    # One follower runs the agent again and the others share its answer.
+    assert asyncio.run(main()) == ["answer 2"] * 3
+    assert len(runs) == 2
+    assert tool.stats()["inflight"] == 0
@@ -0,0 +1,70 @@
+"""Eviction and idle expiry of `SessionTable`."""
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from agents.tools import session_state
+from agents.tools.log_store import SESSION_LOG_CAPACITY
+from agents.tools.session_state import SessionTable
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_state.time, "monotonic", clock)
+    return clock
+
+
+def test_least_recently_used_sessions_are_evicted(clock):
+    evicted = []
+    table = SessionTable(list, max_sessions=2, idle_timeout=None, on_evict=evicted.append)
+    a = table.get("a")
+    table.get("b")
+    assert table.get("a") is a  # "b" is now the least recently used
+    table.get("c")
+    assert "b" not in table and "a" in table and "c" in table
+    assert evicted == [[]]
+    assert table.stats()["evicted"] == 1
+
+
+def test_idle_sessions_expire_on_the_next_access(clock):
+    evicted = []
+    table = SessionTable(object, idle_timeout=60, on_evict=evicted.append)
+    a, b = table.get("a"), table.get("b")
+    clock.now += 30
+    table.get("b")
+    clock.now += 45  # "a" idle for 75 s, "b" for 45 s
+    table.get("c")
+    assert evicted == [a]
+    assert table.get("b") is b
+    assert table.stats()["expired"] == 1
+
+
+def test_popped_sessions_are_not_passed_to_on_evict(clock):
+    evicted = []
+    table = SessionTable(object, max_sessions=1, on_evict=evicted.append)
+    a = table.get("a")
+    assert table.pop("a") is a and table.pop("a") is None
+    table.get("b")
+    assert evicted == [] and len(table) == 1
+
+
+def test_evicted_data_analysis_sessions_close_their_connection(clock):
+    pytest.importorskip("duckdb")
+    from agents.sub_agents.Data_Analysis.Data_Analysis_Insights_agent import DataAnalysisInsightsAgent
+
+    table = SessionTable(DataAnalysisInsightsAgent, max_sessions=1, on_evict=DataAnalysisInsightsAgent.close)
+    agent = table.get("a")
+    agent.sql._connect()
+    table.get("b")
+    assert agent.sql._conn is None
+    assert agent.insights.capacity == agent.analysis_log.capacity == SESSION_LOG_CAPACITY
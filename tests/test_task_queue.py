@@ -0,0 +1,106 @@
+"""Fairness, cancellation and timeouts of the background task queue."""
+
+import threading
+import time
+
+from agents.sub_agents.Automation.task_queue import (
+    CANCELLED, FINISHED, MAX_PRIORITY, SUCCEEDED, TIMED_OUT, TaskQueue,
+)
+
+
+def wait(queue, task_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        state = queue.get(task_id)
+        if state["status"] in FINISHED:
+            return state
+        time.sleep(0.005)
+    raise AssertionError(f"task {task_id} did not finish: {queue.get(task_id)}")
+
+
+def blocker(queue, tenant="other"):
+    """Occupies the only worker until the returned event is set."""
+    release, started = threading.Event(), threading.Event()
+
+    def block(token):
+        started.set()
+        release.wait(5)
+
+    task_id = queue.submit(block, tenant=tenant)
+    assert started.wait(5)
+    return release, task_id
+
+
+def test_tenants_take_turns_whatever_their_priorities():
+    queue = TaskQueue(workers=1, tenant_concurrency=1)
+    release, first = blocker(queue)
+    ran = []
+    record = lambda token, name: ran.append(name)
+    ids = [queue.submit(record, f"a{i}", tenant="a", priority=MAX_PRIORITY) for i in range(4)]
+    ids += [queue.submit(record, f"b{i}", tenant="b") for i in range(2)]
+    release.set()
+    for task_id in ids:
+        assert wait(queue, task_id)["status"] == SUCCEEDED
+    assert ran == ["a0", "b0", "a1", "b1", "a2", "a3"]
+
+
+def test_priority_orders_a_tenants_own_tasks_and_is_clamped():
+    queue = TaskQueue(workers=1, tenant_concurrency=1)
+    release, _ = blocker(queue, tenant="a")
+    ran = []
+    record = lambda token, name: ran.append(name)
+    low = queue.submit(record, "low", tenant="a", priority=-5)
+    high = queue.submit(record, "high", tenant="a", priority=1000)
+    assert queue.get(high)["priority"] == MAX_PRIORITY and queue.get(low)["priority"] == 0
+    assert queue.get(high)["queue_position"] == 0 and queue.get(low)["queue_position"] == 1
+    release.set()
+    wait(queue, low)
+    assert ran == ["high", "low"]
+
+
+def test_cancelling_a_queued_task():
+    queue = TaskQueue(workers=1, tenant_concurrency=1)
+    release, _ = blocker(queue)
+    ran = []
+    task_id = queue.submit(lambda token: ran.append(1), tenant="a")
+    assert queue.cancel(task_id, tenant="b") is None  # other tenants cannot see it
+    assert queue.cancel(task_id, tenant="a")["status"] == CANCELLED
+    assert queue.stats()["queued"] == 0 and "a" not in queue._queues and "a" not in queue._rotation
+    release.set()
+    after = queue.submit(lambda token: None, tenant="a")
+    wait(queue, after)
+    assert ran == [] and queue.get(task_id)["status"] == CANCELLED
+
+
+def test_cancelling_a_running_task_signals_its_token():
+    queue = TaskQueue(workers=1)
+    started = threading.Event()
+
+    def work(token):
+        started.set()
+        while not token.cancelled:
+            time.sleep(0.005)
+        token.raise_if_cancelled()
+
+    task_id = queue.submit(work, tenant="a")
+    assert started.wait(5)
+    queue.cancel(task_id)
+    assert wait(queue, task_id)["status"] == CANCELLED
+    assert queue.stats()["cancelled"] == 1
+
+
+def test_a_task_past_its_timeout_is_reported_timed_out():
+    queue = TaskQueue(workers=1)
+    stopped = threading.Event()
+
+    def work(token):
+        while not token.cancelled:
+            time.sleep(0.005)
+        stopped.set()
+
+    task_id = queue.submit(work, tenant="a", timeout=0.05)
+    state = wait(queue, task_id)
+    assert state["status"] == TIMED_OUT and state["error"] == "Timed out after 0.05s"
+    assert stopped.wait(5)
+    # The worker slot is free again once the function returned.
+    assert wait(queue, queue.submit(lambda token: "ok", tenant="a"))["result"] == "ok"